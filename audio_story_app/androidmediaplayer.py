@@ -4,6 +4,8 @@ from kivy.event import EventDispatcher
 from kivy.clock import Clock
 import os
 
+from metadata_cache import metadata_cache
+
 # Android Java classes
 MediaPlayer = autoclass('android.media.MediaPlayer')
 Uri = autoclass('android.net.Uri')
@@ -19,6 +21,7 @@ class AudioPlayer(EventDispatcher):
     duration = NumericProperty(100)
     is_playing = BooleanProperty(False)
     current_file = StringProperty("")
+    current_title = StringProperty("")  # Recording title; stored files are named by hash
     volume = NumericProperty(1.0)
 
     def __init__(self, **kwargs):
@@ -26,7 +29,6 @@ class AudioPlayer(EventDispatcher):
         super(AudioPlayer, self).__init__(**kwargs)
         self.player = MediaPlayer()
         self.sound = True  # For compatibility
-        self.update_event = None
 
         # Set up completion listener
         self.player.setOnCompletionListener(MediaPlayer.OnCompletionListener({
@@ -39,8 +41,8 @@ class AudioPlayer(EventDispatcher):
         self.current_pos = 0
         Clock.schedule_once(lambda dt: self.dispatch('on_track_finished'), 0)
 
-    def load(self, filepath):
-        """Load an audio file."""
+    def load(self, filepath, title=""):
+        """Load an audio file; `title` is shown for it instead of the file name."""
         print(f"Loading file: {filepath}")
 
         if not os.path.exists(filepath):
@@ -62,15 +64,17 @@ class AudioPlayer(EventDispatcher):
             self.player.prepare()
 
             # Get duration in milliseconds and convert to seconds
-            self.duration = self.player.getDuration() / 1000.0
+            duration_ms = self.player.getDuration()
+            if duration_ms > 0:
+                self.duration = duration_ms / 1000.0
+                metadata_cache.put(filepath, self.duration)
+            else:
+                # MediaPlayer reports -1 when it can't tell; use the known duration
+                self.duration = metadata_cache.lookup_duration(filepath) or 100
             self.current_file = filepath
+            self.current_title = title
             self.current_pos = 0
 
-            # Start position updates
-            if self.update_event:
-                self.update_event.cancel()
-            self.update_event = Clock.schedule_interval(self.update_position, 0.1)
-
             print(f"File loaded successfully. Duration: {self.duration}s")
             return True
         except Exception as e:
@@ -142,7 +146,11 @@ class AudioPlayer(EventDispatcher):
             print(f"Error setting volume: {e}")
 
     def update_position(self, dt):
-        """Update current position from the player."""
+        """Update current position from the player.
+
+        Called by PlayerStatePublisher once per tick while playing; MediaPlayer
+        has no time-changed callback, so this is its only position source.
+        """
         if not self.player:
             return
 
@@ -0,0 +1,102 @@
+from kivy.clock import Clock
+
+
+class GovernedTimer:
+    """A repeating callback whose Clock event is managed by the governor.
+
+    Returned by AnimationGovernor.schedule; cancel() it like a Clock event.
+    """
+
+    def __init__(self, governor, callback, interval, background_interval):
+        self.governor = governor
+        self.callback = callback
+        self.interval = interval
+        self.background_interval = background_interval  # None to stop while hidden
+        self.event = None
+        self.running_interval = None  # Interval the Clock event runs at, None if suspended
+
+    def apply(self, visible, playing):
+        """Start, stop or re-time the Clock event for the app's current state."""
+        if visible:
+            wanted = self.interval
+        elif playing:
+            wanted = self.background_interval
+        else:
+            wanted = None
+
+        if wanted == self.running_interval:
+            return
+
+        if self.event:
+            self.event.cancel()
+            self.event = None
+        if wanted is not None:
+            self.event = Clock.schedule_interval(self.callback, wanted)
+        self.running_interval = wanted
+
+    def cancel(self):
+        """Stop the timer for good."""
+        self.governor.timers.discard(self)
+        if self.event:
+            self.event.cancel()
+            self.event = None
+        self.running_interval = None
+
+
+class AnimationGovernor:
+    """Runs the app's periodic UI and decorative timers, and only while they matter.
+
+    Timers registered with schedule() run at their normal rate while the
+    window is visible. When the app is paused, minimized or hidden (on
+    Android that includes the screen turning off) they stop, except
+    that a timer with a background_interval keeps running at that slower
+    rate while audio is playing.
+    """
+
+    def __init__(self):
+        self.timers = set()
+        self.visible = True
+        self.playing = False
+
+    def schedule(self, callback, interval, background_interval=None):
+        """Call `callback(dt)` every `interval` seconds while the app is visible.
+
+        Returns a GovernedTimer; call its cancel() to stop it.
+        """
+        timer = GovernedTimer(self, callback, interval, background_interval)
+        self.timers.add(timer)
+        timer.apply(self.visible, self.playing)
+        return timer
+
+    def attach(self, window, player):
+        """Follow the window's visibility and the player's playing state."""
+        window.bind(on_minimize=lambda *args: self.set_visible(False),
+                    on_hide=lambda *args: self.set_visible(False),
+                    on_restore=lambda *args: self.set_visible(True),
+                    on_show=lambda *args: self.set_visible(True))
+
+        if player:
+            player.bind(is_playing=lambda instance, value: self.set_playing(value))
+            self.set_playing(player.is_playing)
+
+    def set_visible(self, visible):
+        """Record whether anyone can see the app (see AudioStoryApp.on_pause)."""
+        if visible != self.visible:
+            self.visible = visible
+            print(f"Animations {'resumed' if visible else 'suspended'}")
+            self.apply()
+
+    def set_playing(self, playing):
+        """Record whether audio is playing, which keeps background timers going."""
+        playing = bool(playing)
+        if playing != self.playing:
+            self.playing = playing
+            self.apply()
+
+    def apply(self):
+        """Bring every timer in line with the current state."""
+        for timer in list(self.timers):
+            timer.apply(self.visible, self.playing)
+
+
+governor = AnimationGovernor()
@@ -0,0 +1,86 @@
+from concurrent.futures import Future
+from kivy.clock import Clock
+import queue
+import threading
+
+from database import Database
+
+
+class AsyncDatabase:
+    """Run Database queries on a dedicated worker thread.
+
+    The worker opens its own connection to the same file, so sqlite's
+    same-thread check holds. The database should be in WAL mode (see
+    Database.enable_wal) so these reads don't wait on writes from the UI
+    thread's connection. call() returns a concurrent.futures.Future;
+    callbacks are delivered on the main thread via Clock, so they can
+    touch widgets.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.requests = queue.Queue()
+        self.database = None  # Owned by the worker thread
+
+        self.thread = threading.Thread(target=self.run, name='database', daemon=True)
+        self.thread.start()
+
+    def call(self, method, *args, callback=None, error_callback=None, **kwargs):
+        """Queue Database.<method>(*args, **kwargs) and return a Future for its result.
+
+        `callback(result)` or `error_callback(exception)` is called on the
+        main thread when it finishes, unless the future was cancelled.
+        """
+        future = Future()
+        if callback or error_callback:
+            future.add_done_callback(
+                lambda done: Clock.schedule_once(
+                    lambda dt: self.deliver(done, callback, error_callback)))
+
+        self.requests.put((future, method, args, kwargs))
+        return future
+
+    def deliver(self, future, callback, error_callback):
+        """Hand a finished future's result to its callbacks (main thread)."""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            if callback:
+                callback(future.result())
+        elif error_callback:
+            error_callback(error)
+        else:
+            print(f"Error in background database call: {error}")
+
+    def run(self):
+        """Worker loop: open the connection, then serve requests until closed."""
+        try:
+            self.database = Database(self.db_path)
+        except Exception as e:
+            print(f"Error opening background database: {e}")
+
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            future, method, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if self.database is None:
+                    raise RuntimeError("Background database is not available")
+                future.set_result(getattr(self.database, method)(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        if self.database:
+            self.database.close()
+
+    def close(self):
+        """Finish queued requests and close the worker's connection."""
+        self.requests.put(None)
+        self.thread.join(timeout=2)
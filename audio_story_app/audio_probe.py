@@ -0,0 +1,398 @@
+import os
+import struct
+
+
+# How much of a file the probers are willing to read in one go
+PROBE_CHUNK = 64 * 1024
+
+# MPEG audio bitrates in kbps, indexed by [version_is_mpeg1][layer][bitrate_index]
+MPEG_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates indexed by the two version bits of the frame header
+MPEG_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+# Frames scanned to decide whether an MP3 without a VBR header is constant bitrate
+CBR_SAMPLE_FRAMES = 32
+
+
+def probe(filepath):
+    """Read audio metadata from file headers without decoding any audio.
+
+    Returns a dict with duration (seconds), codec, bitrate (bits per
+    second), channels and sample_rate, or None if the format is not
+    recognised. Values that a format doesn't record are None.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(12)
+            file_size = os.fstat(f.fileno()).st_size
+
+            if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+                info = probe_wav(f, file_size)
+            elif head[:4] == b'OggS':
+                info = probe_ogg(f, file_size)
+            elif head[4:8] == b'ftyp':
+                info = probe_mp4(f, file_size)
+            else:
+                info = probe_mp3(f, file_size)
+
+        if info and info.get('duration') and not info.get('bitrate'):
+            info['bitrate'] = int(file_size * 8 / info['duration'])
+        return info
+    except Exception as e:
+        print(f"Error probing audio file {filepath}: {e}")
+        return None
+
+
+def probe_duration(filepath):
+    """Return the duration of an audio file in seconds, or 0 if unknown."""
+    info = probe(filepath)
+    if info and info.get('duration'):
+        return info['duration']
+    return 0
+
+
+def make_info(duration, codec, bitrate=None, channels=None, sample_rate=None):
+    """Build the metadata dict returned by the probers."""
+    return {
+        'duration': float(duration) if duration and duration > 0 else 0,
+        'codec': codec,
+        'bitrate': int(bitrate) if bitrate else None,
+        'channels': channels,
+        'sample_rate': sample_rate,
+    }
+
+
+# WAV
+
+def probe_wav(f, file_size):
+    """Read the fmt and data chunks of a RIFF/WAVE file."""
+    f.seek(12)
+    fmt = None
+
+    # Walk the chunk headers; only fmt is read, everything else is skipped
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack('<4sI', header)
+
+        if chunk_id == b'fmt ':
+            fmt = struct.unpack('<HHIIHH', f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), 1)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            # Streamed or truncated files often carry a bogus data size
+            data_start = f.tell()
+            if chunk_size == 0 or chunk_size == 0xFFFFFFFF or data_start + chunk_size > file_size:
+                chunk_size = file_size - data_start
+            break
+        else:
+            f.seek(chunk_size + (chunk_size & 1), 1)
+
+    audio_format, channels, sample_rate, byte_rate, block_align, bits = fmt
+    if not byte_rate:
+        return None
+
+    codec = 'pcm' if audio_format in (1, 0xFFFE) else f'wav-0x{audio_format:04x}'
+    return make_info(chunk_size / byte_rate, codec, byte_rate * 8, channels, sample_rate)
+
+
+# MP3
+
+def skip_id3v2(f):
+    """Return the offset of the first byte after any ID3v2 tag."""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return 0
+
+    # Tag size is a 28 bit "syncsafe" integer, 7 bits per byte
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_mpeg_header(data, offset):
+    """Decode a 4 byte MPEG audio frame header, or return None if invalid."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = MPEG_BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = MPEG_SAMPLE_RATES[version_bits][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    return {
+        'mpeg1': mpeg1,
+        'layer': layer,
+        'bitrate': bitrate,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'samples': samples,
+        'length': frame_length,
+    }
+
+
+def find_mpeg_frame(data, start=0):
+    """Find the first frame header in data that is followed by another one."""
+    offset = data.find(b'\xFF', start)
+    while offset != -1 and offset + 4 <= len(data):
+        frame = parse_mpeg_header(data, offset)
+        if frame:
+            # Require a second header right after to avoid false syncs in tag data
+            following = offset + frame['length']
+            if following + 4 > len(data) or parse_mpeg_header(data, following):
+                return offset, frame
+        offset = data.find(b'\xFF', offset + 1)
+    return None, None
+
+
+def probe_mp3(f, file_size):
+    """Read the duration of an MPEG audio stream from its VBR header or frames."""
+    audio_start = skip_id3v2(f)
+    f.seek(audio_start)
+    data = f.read(PROBE_CHUNK)
+    offset, frame = find_mpeg_frame(data)
+    if frame is None:
+        return None
+
+    audio_start += offset
+    audio_end = file_size
+    f.seek(max(file_size - 128, 0))
+    if f.read(3) == b'TAG':
+        audio_end -= 128
+
+    codec = f"mp{frame['layer']}"
+    sample_rate = frame['sample_rate']
+    channels = frame['channels']
+
+    # Xing/Info header sits after the side information of the first frame
+    if frame['mpeg1']:
+        side_info = 17 if channels == 1 else 32
+    else:
+        side_info = 9 if channels == 1 else 17
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info') and len(data) >= xing + 16:
+        flags = struct.unpack('>I', data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack('>I', data[xing + 8:xing + 12])[0]
+            stream_bytes = None
+            if flags & 0x02:
+                stream_bytes = struct.unpack('>I', data[xing + 12:xing + 16])[0]
+            duration = frames * frame['samples'] / sample_rate
+            bitrate = stream_bytes * 8 / duration if stream_bytes and duration else None
+            return make_info(duration, codec, bitrate, channels, sample_rate)
+
+    # VBRI header (Fraunhofer encoders) sits at a fixed offset after the header
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b'VBRI' and len(data) >= vbri + 18:
+        stream_bytes, frames = struct.unpack('>II', data[vbri + 10:vbri + 18])
+        duration = frames * frame['samples'] / sample_rate
+        bitrate = stream_bytes * 8 / duration if duration else None
+        return make_info(duration, codec, bitrate, channels, sample_rate)
+
+    # No VBR header: sample a few frames, and only walk the whole file if
+    # the bitrate actually varies
+    bitrates = set()
+    position = offset
+    for _ in range(CBR_SAMPLE_FRAMES):
+        sampled = parse_mpeg_header(data, position)
+        if sampled is None:
+            break
+        bitrates.add(sampled['bitrate'])
+        position += sampled['length']
+
+    if len(bitrates) <= 1:
+        duration = (audio_end - audio_start) * 8 / frame['bitrate']
+        return make_info(duration, codec, frame['bitrate'], channels, sample_rate)
+
+    frames = scan_mpeg_frames(f, audio_start, audio_end)
+    duration = frames * frame['samples'] / sample_rate
+    return make_info(duration, codec, None, channels, sample_rate)
+
+
+def scan_mpeg_frames(f, start, end):
+    """Count the MPEG frames between start and end, reading in large blocks."""
+    frames = 0
+    position = start
+    buffer = b''
+    buffer_start = start
+
+    while position < end:
+        # Keep enough buffered to parse the next header
+        if position + 4 > buffer_start + len(buffer):
+            f.seek(position)
+            buffer = f.read(min(PROBE_CHUNK, end - position))
+            buffer_start = position
+            if len(buffer) < 4:
+                break
+
+        frame = parse_mpeg_header(buffer, position - buffer_start)
+        if frame is None or frame['length'] <= 0:
+            # Lost sync (junk or a trailing tag); resync within the buffer
+            offset, frame = find_mpeg_frame(buffer, position - buffer_start + 1)
+            if frame is None:
+                break
+            position = buffer_start + offset
+            continue
+
+        frames += 1
+        position += frame['length']
+
+    return frames
+
+
+# OGG
+
+def probe_ogg(f, file_size):
+    """Read the codec header of the first Ogg page and the last granule position."""
+    f.seek(0)
+    first_page = f.read(PROBE_CHUNK)
+    segments = first_page[26]
+    packet = first_page[27 + segments:]
+    serial = struct.unpack('<I', first_page[14:18])[0]
+
+    if packet[:7] == b'\x01vorbis':
+        codec = 'vorbis'
+        channels = packet[11]
+        sample_rate, _, nominal_bitrate = struct.unpack('<Iii', packet[12:24])
+        bitrate = nominal_bitrate if nominal_bitrate > 0 else None
+        granule_rate, pre_skip = sample_rate, 0
+    elif packet[:8] == b'OpusHead':
+        codec = 'opus'
+        channels = packet[9]
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+        sample_rate = struct.unpack('<I', packet[12:16])[0] or 48000
+        bitrate = None
+        # Opus granule positions always count 48 kHz samples
+        granule_rate = 48000
+    else:
+        return None
+
+    granule = last_ogg_granule(f, file_size, serial)
+    if granule is None:
+        return make_info(0, codec, bitrate, channels, sample_rate)
+    return make_info((granule - pre_skip) / granule_rate, codec, bitrate, channels, sample_rate)
+
+
+def last_ogg_granule(f, file_size, serial):
+    """Find the granule position of the last page of a logical stream."""
+    # Pages are at most ~64 KB, so the final page starts within the last chunk
+    read_size = min(file_size, PROBE_CHUNK + 27 + 255)
+    f.seek(file_size - read_size)
+    tail = f.read(read_size)
+
+    offset = tail.rfind(b'OggS')
+    while offset != -1:
+        if offset + 27 <= len(tail) and tail[offset + 4] == 0:
+            granule, page_serial = struct.unpack('<qI', tail[offset + 6:offset + 18])
+            if page_serial == serial and granule >= 0:
+                return granule
+        offset = tail.rfind(b'OggS', 0, offset)
+    return None
+
+
+# MP4 / M4A
+
+def iter_atoms(f, start, end):
+    """Yield (type, payload_start, payload_end) for the atoms in [start, end)."""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, atom_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size:
+            return
+
+        yield atom_type, position + header_size, min(position + size, end)
+        position += size
+
+
+def find_atom(f, start, end, path):
+    """Follow a list of atom types down the box tree, returning (start, end)."""
+    for atom_type in path:
+        for found_type, payload_start, payload_end in iter_atoms(f, start, end):
+            if found_type == atom_type:
+                start, end = payload_start, payload_end
+                break
+        else:
+            return None
+    return start, end
+
+
+def probe_mp4(f, file_size):
+    """Read the duration from the mvhd atom and the codec from the first stsd entry."""
+    moov = find_atom(f, 0, file_size, [b'moov'])
+    if moov is None:
+        return None
+
+    mvhd = find_atom(f, moov[0], moov[1], [b'mvhd'])
+    if mvhd is None:
+        return None
+    f.seek(mvhd[0])
+    version = f.read(4)[0]
+    if version == 1:
+        timescale, duration = struct.unpack('>IQ', f.read(28)[16:28])
+    else:
+        timescale, duration = struct.unpack('>II', f.read(16)[8:16])
+    if not timescale:
+        return None
+
+    codec, channels, sample_rate = None, None, None
+    stsd = find_atom(f, moov[0], moov[1], [b'trak', b'mdia', b'minf', b'stbl', b'stsd'])
+    if stsd is not None:
+        # Full box header and entry count, then the first sample entry
+        f.seek(stsd[0] + 8)
+        entry = f.read(36)
+        if len(entry) == 36:
+            codec = {b'mp4a': 'aac', b'alac': 'alac'}.get(entry[4:8], entry[4:8].decode('latin-1').strip())
+            channels = struct.unpack('>H', entry[24:26])[0]
+            sample_rate = struct.unpack('>I', entry[32:36])[0] >> 16
+
+    return make_info(duration / timescale, codec, None, channels, sample_rate)
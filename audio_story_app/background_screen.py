@@ -2,8 +2,12 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, Rectangle, Ellipse
 from kivy.clock import Clock
 from kivy.app import App
+import math
 import random
 
+from animation_governor import governor
+from starfield_mesh import create_star_mesh
+
 
 class BackgroundScreen(FloatLayout):
     """A fullscreen background with stars and gradient."""
@@ -24,7 +28,8 @@ class BackgroundScreen(FloatLayout):
         self._add_stars()
 
         # Schedule twinkling effect
-        Clock.schedule_interval(self._twinkle_stars, 1 / 3)  # Update 3 times per second for gentle twinkling
+        # Update 3 times per second for gentle twinkling, only while the app is visible
+        self.twinkle_event = governor.schedule(self._twinkle_stars, 1 / 3)
 
     def _update_rect(self, *args):
         """Update the background rectangle."""
@@ -37,40 +42,21 @@ class BackgroundScreen(FloatLayout):
         self.canvas.clear()
 
         # Create 3 layers of stars with different sizes and opacities
-        # for a parallax-like depth effect
-
-        # Background tiny stars (many, dim)
-        for _ in range(100):
-            x = random.random() * self.width
-            y = random.random() * self.height
-            size = random.uniform(1, 2)  # Tiny stars
-            opacity = random.uniform(0.1, 0.4)  # Dim
-
-            with self.canvas:
-                Color(1, 1, 1, opacity)
-                Ellipse(pos=(x, y), size=(size, size))
-
-        # Mid-layer stars (medium number, medium brightness)
-        for _ in range(50):
-            x = random.random() * self.width
-            y = random.random() * self.height
-            size = random.uniform(1.5, 3)  # Medium stars
-            opacity = random.uniform(0.3, 0.6)  # Medium brightness
-
-            with self.canvas:
-                Color(1, 1, 1, opacity)
-                Ellipse(pos=(x, y), size=(size, size))
-
-        # Foreground stars (few, bright)
-        for _ in range(20):
-            x = random.random() * self.width
-            y = random.random() * self.height
-            size = random.uniform(2, 4)  # Larger stars
-            opacity = random.uniform(0.5, 0.9)  # Brighter
-
-            with self.canvas:
-                Color(1, 1, 1, opacity)
-                Ellipse(pos=(x, y), size=(size, size))
+        # for a parallax-like depth effect: (count, size range, opacity range)
+        layers = [
+            (100, (1, 2), (0.1, 0.4)),  # Background tiny stars (many, dim)
+            (50, (1.5, 3), (0.3, 0.6)),  # Mid-layer stars (medium number, medium brightness)
+            (20, (2, 4), (0.5, 0.9)),  # Foreground stars (few, bright)
+        ]
+
+        static_stars = []
+        for count, size_range, opacity_range in layers:
+            for _ in range(count):
+                x = random.random() * self.width
+                y = random.random() * self.height
+                size = random.uniform(*size_range)
+                opacity = random.uniform(*opacity_range)
+                static_stars.append({'x': x, 'y': y, 'size': size, 'opacity': opacity})
 
         # Add a few special brighter stars that will twinkle
         self.twinkling_stars = []
@@ -88,35 +74,46 @@ class BackgroundScreen(FloatLayout):
                 'base_opacity': base_opacity,
                 'opacity': base_opacity,
                 'speed': twinkle_speed,
-                'phase': random.random() * 6.28  # Random starting phase
+                'phase': random.random() * 6.28,  # Random starting phase
+                'color': None
             })
 
-            with self.canvas:
-                Color(1, 1, 1, base_opacity)
-                Ellipse(pos=(x, y), size=(size, size))
-
-    def _twinkle_stars(self, dt):
-        """Animate only the twinkling stars."""
-        # Only redraw the twinkling stars, not all stars
-        for i, star in enumerate(self.twinkling_stars):
-            # Calculate new opacity based on gentle sine wave
-            time = Clock.get_boottime() * star['speed'] + star['phase']
-            new_opacity = star['base_opacity'] * (0.7 + 0.3 * (
-                        0.5 + 0.5 * (0.5 + 0.5 * (0.5 + 0.5 * (0.5 + 0.5 * (0.5 + 0.5 * (0.5 + 0.5 * (0.5 + 0.5))))))))
-
-            # Update the star's properties
-            star['opacity'] = new_opacity
-            self.twinkling_stars[i] = star
-
-        # Now redraw just the twinkling stars
-        # First get their canvas indices to avoid redrawing everything
+        # Draw every star in one mesh, twinkling ones last so they are one run of it
+        stars = static_stars + self.twinkling_stars
+        self.first_twinkling = len(static_stars)
+        self.star_mesh = create_star_mesh(self.canvas, [
+            (star['x'] + star['size'] / 2, star['y'] + star['size'] / 2, star['size'],
+             (1, 1, 1), star['opacity'])
+            for star in stars
+        ])
+        if self.star_mesh:
+            return
+
+        # Without the mesh, keep the twinkling stars' Colors so _twinkle_stars
+        # can change the opacity in place
         with self.canvas:
-            # Clear previous twinkling stars
-            # This is inefficient but works for our purpose
-            for star in self.twinkling_stars:
-                Color(1, 1, 1, star['opacity'])
+            for star in stars:
+                star['color'] = Color(1, 1, 1, star['opacity'])
                 Ellipse(pos=(star['x'], star['y']), size=(star['size'], star['size']))
 
+    def _twinkle_stars(self, dt):
+        """Animate only the twinkling stars.
+
+        Only their opacity changes, in the mesh or their existing Colors, so
+        the canvas keeps the same instructions however long it is shown.
+        """
+        now = Clock.get_boottime()
+        for star in self.twinkling_stars:
+            # Gentle sine wave between 70% and 100% of the star's base opacity
+            time = now * star['speed'] + star['phase']
+            star['opacity'] = star['base_opacity'] * (0.7 + 0.3 * (0.5 + 0.5 * math.sin(time)))
+            if star['color']:
+                star['color'].a = star['opacity']
+
+        if self.star_mesh:
+            self.star_mesh.set_alphas([star['opacity'] for star in self.twinkling_stars],
+                                      first=self.first_twinkling)
+
     def on_size(self, *args):
         """Regenerate stars when window is resized."""
         # Only regenerate if we have a valid size
@@ -0,0 +1,164 @@
+"""Throughput and memory of the import copy engine in file_copy.py ([user-009]).
+
+Run from the audio_story_app directory:
+
+    python benchmarks/bench_file_copy.py [size_mb] [directory]
+
+Copies a file of random bytes (64 MB by default) with the old
+`dest_file.write(src_file.read())` and with each of the copy engine's
+methods in turn, in `directory` (a temporary one by default; pass a path
+on another filesystem, e.g. btrfs, to see reflinks work). Methods the
+filesystem doesn't support are reported as such. Each copy is fsynced,
+as copy_file does; the source stays in the page cache between runs.
+
+Results on the development container (Python 3.11, overlayfs, 64 MB,
+best of 3):
+
+    read whole file (before)       102.9 ms      622 MB/s    64.0 MB peak memory
+    link                             0.0 ms        -          0.0 MB peak memory
+    reflink                       not supported here
+    copy_file_range                 62.2 ms     1028 MB/s     0.0 MB peak memory
+    sendfile                        59.7 ms     1071 MB/s     0.0 MB peak memory
+    chunked                         60.0 ms     1066 MB/s     1.0 MB peak memory
+    chunked + blake2b              195.7 ms      327 MB/s     1.0 MB peak memory
+
+Peak memory is Python's, from tracemalloc: the old copy holds the whole
+file, the chunked copy one COPY_CHUNK buffer, and the kernel methods none.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# These need the path set up above
+import file_copy  # noqa: E402
+import recording_store  # noqa: E402
+
+RUNS = 3
+
+
+def read_whole_file(src, dest):
+    """The import copy from before [user-009]."""
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        dest_file.write(src_file.read())
+        dest_file.flush()
+        os.fsync(dest_file.fileno())
+    return True
+
+
+def with_files(copy):
+    """Run copy(src_file, dest_file, total) on open files; it returns whether it worked."""
+    def run(src, dest):
+        total = os.path.getsize(src)
+        with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+            if not copy(src_file, dest_file, total):
+                return False
+            dest_file.flush()
+            os.fsync(dest_file.fileno())
+        return True
+    return run
+
+
+def copy_file_range(src_file, dest_file, total):
+    """file_copy.kernel_copy, but only if it used copy_file_range."""
+    return file_copy.kernel_copy(src_file, dest_file, total) == 'copy_file_range'
+
+
+def sendfile(src_file, dest_file, total):
+    """file_copy.kernel_copy restricted to sendfile."""
+    if not hasattr(os, 'sendfile'):
+        return False
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    if copy_file_range is not None:
+        del os.copy_file_range
+    try:
+        return file_copy.kernel_copy(src_file, dest_file, total) == 'sendfile'
+    finally:
+        if copy_file_range is not None:
+            os.copy_file_range = copy_file_range
+
+
+def reflink(src_file, dest_file, total):
+    """file_copy.clone_file; needs btrfs, xfs or similar."""
+    return file_copy.clone_file(src_file, dest_file)
+
+
+def chunked(src_file, dest_file, total):
+    """file_copy.chunked_copy; always works."""
+    file_copy.chunked_copy(src_file, dest_file, total)
+    return True
+
+
+def chunked_hashed(src_file, dest_file, total):
+    """The chunked copy with hashing, as copy_file does when given a hasher."""
+    hasher = hashlib.blake2b(digest_size=recording_store.DIGEST_SIZE)
+    file_copy.chunked_copy(src_file, dest_file, total, hasher=hasher)
+    return True
+
+
+def hard_link(src, dest):
+    """file_copy.link_file; shares the data instead of copying it."""
+    return file_copy.link_file(src, dest)
+
+
+METHODS = [
+    ("read whole file (before)", read_whole_file),
+    ("link", hard_link),
+    ("reflink", with_files(reflink)),
+    ("copy_file_range", with_files(copy_file_range)),
+    ("sendfile", with_files(sendfile)),
+    ("chunked", with_files(chunked)),
+    ("chunked + blake2b", with_files(chunked_hashed)),
+]
+
+
+def measure(copy, src, dest):
+    """Best time of RUNS copies and the peak Python memory of one, or None if unsupported."""
+    best = None
+    peak = 0
+    for run in range(RUNS):
+        if os.path.exists(dest):
+            os.remove(dest)
+
+        if run == 0:
+            tracemalloc.start()
+        started = time.perf_counter()
+        worked = copy(src, dest)
+        elapsed = time.perf_counter() - started
+        if run == 0:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        if not worked:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best, peak
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    directory = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory(dir=directory) as work_dir:
+        src = os.path.join(work_dir, 'source.mp3')
+        dest = os.path.join(work_dir, 'copy.mp3')
+        with open(src, 'wb') as src_file:
+            for _ in range(size_mb):
+                src_file.write(os.urandom(1024 * 1024))
+
+        for label, copy in METHODS:
+            result = measure(copy, src, dest)
+            if result is None:
+                print(f"{label:<30}not supported here")
+                continue
+            elapsed, peak = result
+            print(f"{label:<28}{elapsed * 1000:8.1f} ms{size_mb / elapsed:9.0f} MB/s"
+                  f"{peak / 1024 / 1024:8.1f} MB peak memory")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""Query plans and timings of the playlist and recency queries, before and after [user-012].
+
+Run from the audio_story_app directory:
+
+    python benchmarks/bench_playlist_indexes.py [runs]
+
+Builds a library with the original schema (no indexes besides the
+primary keys and settings.key): 20,000 recordings and 200 playlists of
+100 items each, inserted in random order. The queries the original
+Database methods ran are planned and timed on it. The same file is
+then opened with Database, which runs the migrations, and the queries
+the methods run now are planned and timed again. Writes are rolled back
+after each workload, so every run sees the same data.
+
+Results on the development container (Python 3.11, SQLite 3.40, 200 runs):
+
+    before:
+      get_playlist_recordings        1.472 ms
+          SCAN pi; SEARCH r USING INTEGER PRIMARY KEY (rowid=?); USE TEMP B-TREE FOR ORDER BY
+      add_recording_to_playlist      2.286 ms
+          SEARCH playlist_items; SCAN playlist_items
+      delete_recording               1.156 ms
+          SCAN playlist_items; SEARCH recordings USING INTEGER PRIMARY KEY (rowid=?)
+      get_all_recordings            44.991 ms
+          SCAN recordings; USE TEMP B-TREE FOR ORDER BY
+    after:
+      get_playlist_recordings        0.334 ms
+          SEARCH pi USING INDEX idx_playlist_items_playlist_position (playlist_id=?); SEARCH r USING INTEGER PRIMARY KEY (rowid=?)
+      add_recording_to_playlist      0.021 ms
+          SEARCH playlist_items USING COVERING INDEX idx_playlist_items_playlist_position (playlist_id=?)
+      delete_recording               0.138 ms
+          SEARCH recordings USING INTEGER PRIMARY KEY (rowid=?); SEARCH recordings USING COVERING INDEX idx_recordings_filepath (filepath=?); SEARCH playlist_items USING COVERING INDEX idx_playlist_items_recording (recording_id=?); SEARCH recordings USING INTEGER PRIMARY KEY (rowid=?)
+      get_all_recordings            42.460 ms
+          SCAN recordings USING INDEX idx_recordings_date_created
+
+Times are per call of the whole method's SQL, fetching every row.
+get_all_recordings barely changes: reading all 20,000 rows costs more
+than the sort the index saves. The list screen pages through
+get_recordings_page instead, which the index lets stop after a page.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database  # noqa: E402 (needs the path set up above)
+
+RECORDINGS = 20000
+PLAYLISTS = 200
+ITEMS_PER_PLAYLIST = 100
+
+# The tables as the app created them before migrations existed
+ORIGINAL_SCHEMA = '''
+CREATE TABLE recordings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    filepath TEXT NOT NULL,
+    duration REAL,
+    date_created TEXT,
+    cover_art TEXT
+);
+CREATE TABLE playlists (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    date_created TEXT
+);
+CREATE TABLE playlist_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    playlist_id INTEGER,
+    recording_id INTEGER,
+    position INTEGER,
+    FOREIGN KEY (playlist_id) REFERENCES playlists (id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (recording_id) REFERENCES recordings (id)
+        ON DELETE CASCADE
+);
+CREATE TABLE settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    value TEXT
+);
+'''
+
+# Each workload's statements as (sql, parameters(playlist_id, recording_id)), before and after
+
+GET_PLAYLIST_RECORDINGS_BEFORE = [('''
+    SELECT r.id, r.title, r.description, r.filepath, r.duration, r.date_created, r.cover_art, pi.position
+    FROM recordings r
+    JOIN playlist_items pi ON r.id = pi.recording_id
+    WHERE pi.playlist_id = ?
+    ORDER BY pi.position
+    ''', lambda playlist_id, recording_id: (playlist_id,))]
+
+GET_PLAYLIST_RECORDINGS_AFTER = [('''
+    SELECT r.id, r.title, r.description, r.filepath, r.duration, r.date_created, r.cover_art
+    FROM recordings r
+    JOIN playlist_items pi ON r.id = pi.recording_id
+    WHERE pi.playlist_id = ?
+    ORDER BY pi.position, pi.id
+    ''', lambda playlist_id, recording_id: (playlist_id,))]
+
+ADD_RECORDING_TO_PLAYLIST_BEFORE = [
+    ('''
+    SELECT COALESCE(MAX(position) + 1, 0)
+    FROM playlist_items
+    WHERE playlist_id = ?
+    ''', lambda playlist_id, recording_id: (playlist_id,)),
+    ('''
+    SELECT id FROM playlist_items
+    WHERE playlist_id = ? AND recording_id = ?
+    ''', lambda playlist_id, recording_id: (playlist_id, recording_id)),
+    ('''
+    INSERT INTO playlist_items (playlist_id, recording_id, position)
+    VALUES (?, ?, 1000000)
+    ''', lambda playlist_id, recording_id: (playlist_id, recording_id)),
+]
+
+ADD_RECORDING_TO_PLAYLIST_AFTER = [
+    ('''
+    SELECT MAX(position)
+    FROM playlist_items
+    WHERE playlist_id = ?
+    ''', lambda playlist_id, recording_id: (playlist_id,)),
+    ('''
+    INSERT INTO playlist_items (playlist_id, recording_id, position)
+    VALUES (?, ?, 1000000)
+    ON CONFLICT (playlist_id, recording_id) DO UPDATE SET position = excluded.position
+    ''', lambda playlist_id, recording_id: (playlist_id, recording_id)),
+]
+
+DELETE_RECORDING_BEFORE = [
+    ('''
+    DELETE FROM playlist_items
+    WHERE recording_id = ?
+    ''', lambda playlist_id, recording_id: (recording_id,)),
+    ('''
+    DELETE FROM recordings
+    WHERE id = ?
+    ''', lambda playlist_id, recording_id: (recording_id,)),
+]
+
+# Without a content hash the recording's file is shared by path, as for pre-store imports
+DELETE_RECORDING_AFTER = [
+    ('''
+    SELECT filepath, content_hash FROM recordings
+    WHERE id = ?
+    ''', lambda playlist_id, recording_id: (recording_id,)),
+    ('''
+    SELECT COUNT(*) FROM recordings
+    WHERE filepath = ? AND id != ?
+    ''', lambda playlist_id, recording_id: (f"/audio/{recording_id}.mp3", recording_id)),
+] + DELETE_RECORDING_BEFORE
+
+GET_ALL_RECORDINGS = [('''
+    SELECT id, title, description, filepath, duration, date_created, cover_art
+    FROM recordings
+    ORDER BY date_created DESC
+    ''', lambda playlist_id, recording_id: ())]
+
+WORKLOADS = [
+    ('get_playlist_recordings', GET_PLAYLIST_RECORDINGS_BEFORE, GET_PLAYLIST_RECORDINGS_AFTER),
+    ('add_recording_to_playlist', ADD_RECORDING_TO_PLAYLIST_BEFORE, ADD_RECORDING_TO_PLAYLIST_AFTER),
+    ('delete_recording', DELETE_RECORDING_BEFORE, DELETE_RECORDING_AFTER),
+    ('get_all_recordings', GET_ALL_RECORDINGS, GET_ALL_RECORDINGS),
+]
+
+
+def populate(path):
+    """Create the original schema at path and fill it with a library."""
+    rng = random.Random(12)
+    conn = sqlite3.connect(path)
+    conn.executescript(ORIGINAL_SCHEMA)
+
+    # Imports happen in any order, so dates aren't in id order
+    conn.executemany('''
+    INSERT INTO recordings (title, description, filepath, duration, date_created)
+    VALUES (?, ?, ?, ?, ?)
+    ''', [(f"Story {index}", "A bedtime story", f"/audio/{index}.mp3", rng.uniform(60, 3600),
+           f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00.{index:06d}")
+          for index in range(1, RECORDINGS + 1)])
+
+    conn.executemany('''
+    INSERT INTO playlists (name, description, date_created)
+    VALUES (?, '', '2024-01-01T00:00:00')
+    ''', [(f"Playlist {index}",) for index in range(PLAYLISTS)])
+
+    # Playlists are built up over time, so their items are interleaved in the table
+    items = [(playlist_id, recording_id, position)
+             for playlist_id in range(1, PLAYLISTS + 1)
+             for position, recording_id in enumerate(rng.sample(range(1, RECORDINGS + 1), ITEMS_PER_PLAYLIST))]
+    rng.shuffle(items)
+    conn.executemany('''
+    INSERT INTO playlist_items (playlist_id, recording_id, position)
+    VALUES (?, ?, ?)
+    ''', items)
+
+    conn.commit()
+    conn.close()
+
+
+def query_plan(conn, statements):
+    """EXPLAIN QUERY PLAN details of each statement, joined with '; '.
+
+    Plain INSERTs have no plan; the upsert's conflict check uses the unique index.
+    """
+    details = []
+    for sql, parameters in statements:
+        rows = conn.execute('EXPLAIN QUERY PLAN ' + sql, parameters(1, 1)).fetchall()
+        details.extend(row[-1] for row in rows)
+    return '; '.join(details)
+
+
+def time_workload(conn, statements, runs):
+    """Mean milliseconds to run the statements for random playlists and recordings."""
+    rng = random.Random(34)
+    arguments = [(rng.randint(1, PLAYLISTS), rng.randint(1, RECORDINGS)) for _ in range(runs)]
+
+    conn.execute('BEGIN')
+    started = time.perf_counter()
+    for playlist_id, recording_id in arguments:
+        for sql, parameters in statements:
+            try:
+                conn.execute(sql, parameters(playlist_id, recording_id)).fetchall()
+            except sqlite3.IntegrityError:
+                pass
+    elapsed = time.perf_counter() - started
+    conn.rollback()
+    return elapsed * 1000 / runs
+
+
+def report(title, conn, which, runs):
+    """Print the plan and time of every workload, using its before or after statements."""
+    print(title)
+    for name, before, after in WORKLOADS:
+        statements = before if which == 'before' else after
+        milliseconds = time_workload(conn, statements, runs)
+        print(f"  {name:<28}{milliseconds:8.3f} ms")
+        print(f"      {query_plan(conn, statements)}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'audio_story.db')
+        populate(path)
+
+        conn = sqlite3.connect(path, isolation_level=None)
+        report("before:", conn, 'before', runs)
+        conn.close()
+
+        database = Database(path)
+        database.conn.isolation_level = None
+        report("after:", database.conn, 'after', runs)
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
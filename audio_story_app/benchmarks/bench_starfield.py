@@ -0,0 +1,144 @@
+"""Per-frame cost of StarField's twinkling, before and after [user-021].
+
+Run from the audio_story_app directory (it opens a Kivy window):
+
+    python benchmarks/bench_starfield.py [frames]
+
+Before, every frame cleared the canvas and created a new Color and
+Ellipse per star. Now the canvas is built once: frames either set the
+alpha of the retained Color instructions, or, when the GL driver can
+compile the star shader, rewrite the alphas of one StarMesh. The
+twinkle maths runs in TwinkleKernel, with NumPy when it's installed.
+
+Results on the development container (Python 3.11, Kivy 2.3.1, Mesa
+llvmpipe, no NumPy, 80 stars, 2000 frames):
+
+    rebuild canvas every frame (before)        643.0 us/frame   243 instructions/frame    2.7 KiB/frame
+    retained Colors, pure Python kernel         43.7 us/frame     0 instructions/frame    1.0 KiB/frame
+    StarMesh, pure Python kernel                49.2 us/frame     0 instructions/frame    1.0 KiB/frame
+
+Instructions are canvas instructions created per frame. KiB/frame is the
+peak Python memory allocated during a frame, from tracemalloc; the
+graphics instructions' own C allocations don't show up in it. The mesh
+costs about the same CPU time as the retained Colors, but draws every
+star in one call instead of a Color and Ellipse each.
+"""
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# These need the environment and path set up above
+from kivy.clock import Clock  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.graphics import Color, Ellipse, Rectangle  # noqa: E402
+
+import theme  # noqa: E402
+from theme import BACKGROUND_COLOR, StarField, TwinkleKernel  # noqa: E402
+
+
+def rebuild_canvas(star_field, dt):
+    """The update_stars from before [user-021]: redraw the whole canvas."""
+    star_field.canvas.clear()
+    with star_field.canvas:
+        Color(*BACKGROUND_COLOR)
+        Rectangle(pos=(0, 0), size=(Window.width, Window.height))
+
+        for star in star_field.stars:
+            time_factor = Clock.get_boottime() * star['twinkle_speed']
+            twinkle = 0.5 * (1 + math.sin(time_factor + star['twinkle_offset']))
+            alpha = star['base_alpha'] * (0.7 + 0.3 * twinkle)
+
+            r, g, b = star['color'][:3]
+            Color(r, g, b, alpha)
+            Ellipse(
+                pos=(star['x'] - star['size'] / 2, star['y'] - star['size'] / 2),
+                size=(star['size'], star['size'])
+            )
+
+
+def make_star_field(use_mesh, use_numpy):
+    """A StarField drawn with or without the mesh, twinkling with or without NumPy."""
+    create_star_mesh = theme.create_star_mesh
+    numpy = theme.numpy
+    if not use_mesh:
+        theme.create_star_mesh = lambda canvas, stars: None
+    if not use_numpy:
+        theme.numpy = None
+    try:
+        star_field = StarField()
+        star_field.twinkle = TwinkleKernel(star_field.stars)
+    finally:
+        theme.create_star_mesh = create_star_mesh
+        theme.numpy = numpy
+
+    star_field.update_event.cancel()
+    if use_mesh and star_field.star_mesh is None:
+        return None
+    return star_field
+
+
+def measure(label, star_field, update, frames):
+    """Print the time, instructions created and memory kept per frame."""
+    update(star_field, 0)  # Warm up
+    instructions_before = len(star_field.canvas.children)
+
+    started = time.perf_counter()
+    created = 0
+    for _ in range(frames):
+        update(star_field, 0)
+        created += len(star_field.canvas.children)
+    elapsed = time.perf_counter() - started
+
+    # A rebuild replaces every instruction; retained frames create none
+    if update is rebuild_canvas:
+        per_frame = created / frames
+    else:
+        per_frame = len(star_field.canvas.children) - instructions_before
+
+    # Peak memory within each frame, including what the frame frees again
+    tracemalloc.start()
+    traced_frames = min(frames, 200)
+    allocated = 0
+    for _ in range(traced_frames):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        update(star_field, 0)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    print(f"{label:<40}{elapsed * 1e6 / frames:8.1f} us/frame"
+          f"{per_frame:6.0f} instructions/frame"
+          f"{allocated / 1024 / traced_frames:7.1f} KiB/frame")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    update_stars = StarField.update_stars
+
+    cases = [
+        ("rebuild canvas every frame (before)", False, False, rebuild_canvas),
+        ("retained Colors, numpy kernel", False, True, update_stars),
+        ("retained Colors, pure Python kernel", False, False, update_stars),
+        ("StarMesh, numpy kernel", True, True, update_stars),
+        ("StarMesh, pure Python kernel", True, False, update_stars),
+    ]
+    for label, use_mesh, use_numpy, update in cases:
+        if use_numpy and theme.numpy is None:
+            print(f"{label:<40}skipped, NumPy isn't installed")
+            continue
+
+        star_field = make_star_field(use_mesh, use_numpy)
+        if star_field is None:
+            print(f"{label:<40}skipped, the star shader didn't compile")
+            continue
+        measure(label, star_field, update, frames)
+
+
+if __name__ == '__main__':
+    main()
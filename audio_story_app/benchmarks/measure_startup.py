@@ -0,0 +1,88 @@
+"""Measure the startup work that [user-020] took off the first frame.
+
+Run from the audio_story_app directory:
+
+    python benchmarks/measure_startup.py [runs]
+
+Before, importing player.py created libVLC straight away, and found its
+plugin directory by forking `which vlc`. Now libVLC starts on the first
+load(), and the plugin path is found with shutil.which once and then
+read back from the settings. This times each of those steps; the
+libVLC figures are skipped where python-vlc isn't installed.
+
+Results on the development container (Python 3.11, no libVLC, 50 runs):
+
+    plugin lookup, before: subprocess `which vlc`     1.17 ms
+    plugin lookup, after:  shutil.which('vlc')        0.09 ms
+    plugin lookup, after:  cached setting             0.00 ms
+
+The end-to-end figure is printed by the app itself as "Startup took N ms".
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Same as player.PLUGIN_PATH_SETTING; player.py itself needs python-vlc to import
+PLUGIN_PATH_SETTING = 'vlc_plugin_path'
+
+
+def time_ms(function, runs):
+    """Average milliseconds per call of function()."""
+    started = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - started) * 1000 / runs
+
+
+def which_subprocess():
+    """The old plugin lookup: fork `which`."""
+    subprocess.run(['which', 'vlc'], capture_output=True, text=True)
+
+
+def which_shutil():
+    """The new plugin lookup on a first launch."""
+    shutil.which('vlc')
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    from database import Database
+    from settings_store import SettingsStore
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(os.path.join(directory, 'audio_story.db'))
+        settings_store = SettingsStore(database)
+        settings_store.set(PLUGIN_PATH_SETTING, '')
+        settings_store.flush()
+
+        results = [
+            ("plugin lookup, before: subprocess `which vlc`", time_ms(which_subprocess, runs)),
+            ("plugin lookup, after:  shutil.which('vlc')", time_ms(which_shutil, runs)),
+            ("plugin lookup, after:  cached setting",
+             time_ms(lambda: settings_store.get(PLUGIN_PATH_SETTING), runs)),
+        ]
+        database.conn.close()
+
+    try:
+        import vlc
+    except Exception as e:
+        print(f"python-vlc unavailable, skipping libVLC timings: {e}")
+        vlc = None
+
+    if vlc is not None:
+        # Created at import before, so on the path to the first frame; now on first load()
+        results.append(("libVLC instance + player (now deferred)",
+                        time_ms(lambda: vlc.Instance().media_player_new(), min(runs, 5))))
+
+    for label, milliseconds in results:
+        print(f"{label:<48}{milliseconds:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,33 @@
 import sqlite3
 import os
+import re
+from contextlib import contextmanager
 from datetime import datetime
 
 
+# Spacing between playlist_items.position keys, leaving room to insert between neighbours
+POSITION_GAP = 1024
+
+
 class Database:
     """Handle database operations for the Audio Story App."""
 
     def __init__(self, db_path='data/audio_story.db'):
         """Initialize the database connection and create tables if needed."""
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Ensure the directory exists (there is none for ':memory:')
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
         self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
+        self.transaction_depth = 0  # Open transaction() blocks; commits wait until it's 0
+
+        # WAL only needs the log synced at checkpoints, so NORMAL is still crash-safe
+        self.enable_wal()
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+
+        self.fts_enabled = False
+        self.settings_cache = None  # key -> value, loaded on first read
         self.create_tables()
 
     def create_tables(self):
@@ -26,10 +41,24 @@ class Database:
             filepath TEXT NOT NULL,
             duration REAL,
             date_created TEXT,
-            cover_art TEXT
+            cover_art TEXT,
+            content_hash TEXT
+        )
+        ''')
+        self.add_column_if_missing('recordings', 'content_hash', 'TEXT')
+
+        # Stored audio files, shared by every recording with identical content
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0
         )
         ''')
 
+        # Full-text index over recordings (only if SQLite was built with FTS5)
+        self.fts_enabled = self.create_search_index()
+
         # Create playlists table
         self.cursor.execute('''
         CREATE TABLE IF NOT EXISTS playlists (
@@ -65,6 +94,277 @@ class Database:
 
         self.conn.commit()
 
+        # Bring older databases up to the current schema
+        self.migrate()
+
+    def enable_wal(self):
+        """Switch to write-ahead logging so readers on other connections don't block writers.
+
+        The mode is stored in the database file, so this only has to succeed
+        once, before other connections are opened; returns True on success.
+        """
+        self.cursor.execute('PRAGMA journal_mode=WAL')
+        return self.cursor.fetchone()[0].lower() == 'wal'
+
+    @contextmanager
+    def transaction(self):
+        """Group several mutating calls into one commit.
+
+            with database.transaction():
+                database.add_recording(...)
+                database.add_recording_to_playlist(...)
+
+        Blocks can be nested; only the outermost one commits. If the block
+        raises, everything since it began is rolled back.
+        """
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.conn.rollback()
+                # Settings written in the block are no longer true; reload on next read
+                self.settings_cache = None
+            raise
+        else:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.conn.commit()
+
+    def _commit(self):
+        """Commit, unless a transaction() block will commit later."""
+        if self.transaction_depth == 0:
+            self.conn.commit()
+
+    def migrations(self):
+        """Schema migrations in order; step N upgrades user_version N to N + 1."""
+        return [
+            self.migrate_add_indexes,
+            self.migrate_sparse_positions,
+            self.migrate_playlist_aggregates,
+            self.migrate_filepath_index,
+            self.migrate_media_metadata,
+        ]
+
+    def migrate(self):
+        """Run any migrations newer than the database's PRAGMA user_version."""
+        self.cursor.execute('PRAGMA user_version')
+        version = self.cursor.fetchone()[0]
+
+        for target, step in enumerate(self.migrations()[version:], start=version + 1):
+            print(f"Migrating database schema to version {target}")
+            try:
+                # Each step and its version bump commit or roll back together
+                self.cursor.execute('BEGIN')
+                step()
+                self.cursor.execute(f'PRAGMA user_version = {target}')
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def migrate_add_indexes(self):
+        """Index the playlist and recency lookups, and make playlist entries unique."""
+        # Older versions could add a recording to a playlist twice; keep the first entry
+        self.cursor.execute('''
+        DELETE FROM playlist_items
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM playlist_items
+            GROUP BY playlist_id, recording_id
+        )
+        ''')
+
+        # Playlist contents in order, and MAX(position) when appending
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_playlist_items_playlist_position
+        ON playlist_items (playlist_id, position)
+        ''')
+
+        # Removing a deleted recording from every playlist
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_playlist_items_recording
+        ON playlist_items (recording_id)
+        ''')
+
+        # A recording appears at most once per playlist
+        self.cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_playlist_items_unique
+        ON playlist_items (playlist_id, recording_id)
+        ''')
+
+        # Newest-first listing and keyset pagination (the rowid rides along as a tiebreaker)
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_recordings_date_created
+        ON recordings (date_created)
+        ''')
+
+    def add_column_if_missing(self, table, column, definition):
+        """Add a column to a table created by an older version of the app."""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def create_search_index(self):
+        """Create the FTS5 index and its sync triggers, returning False if FTS5 is unavailable."""
+        self.cursor.execute('''
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'recordings_fts'
+        ''')
+        index_exists = self.cursor.fetchone() is not None
+
+        try:
+            # External-content table: the text lives in recordings, FTS5 only keeps the index
+            self.cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS recordings_fts USING fts5(
+                title,
+                description,
+                content='recordings',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 not available, search will use LIKE: {e}")
+            return False
+
+        # Keep the index in sync with the recordings table
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS recordings_fts_insert AFTER INSERT ON recordings BEGIN
+            INSERT INTO recordings_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        ''')
+
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS recordings_fts_delete AFTER DELETE ON recordings BEGIN
+            INSERT INTO recordings_fts (recordings_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        ''')
+
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS recordings_fts_update AFTER UPDATE OF title, description ON recordings BEGIN
+            INSERT INTO recordings_fts (recordings_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO recordings_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        ''')
+
+        # Index any recordings that existed before the index was created
+        if not index_exists:
+            self.cursor.execute('''
+            INSERT INTO recordings_fts (recordings_fts) VALUES ('rebuild')
+            ''')
+
+        return True
+
+    def migrate_sparse_positions(self):
+        """Spread existing playlist positions POSITION_GAP apart."""
+        self.cursor.execute('SELECT id FROM playlists')
+        for (playlist_id,) in self.cursor.fetchall():
+            self.rebalance_playlist(playlist_id, commit=False)
+
+    def migrate_playlist_aggregates(self):
+        """Keep each playlist's item count and total duration on the playlist row."""
+        self.add_column_if_missing('playlists', 'item_count', 'INTEGER NOT NULL DEFAULT 0')
+        self.add_column_if_missing('playlists', 'total_duration', 'REAL NOT NULL DEFAULT 0')
+
+        self.cursor.execute('''
+        UPDATE playlists SET
+            item_count = (
+                SELECT COUNT(*) FROM playlist_items pi
+                WHERE pi.playlist_id = playlists.id
+            ),
+            total_duration = (
+                SELECT COALESCE(SUM(r.duration), 0)
+                FROM playlist_items pi
+                JOIN recordings r ON r.id = pi.recording_id
+                WHERE pi.playlist_id = playlists.id
+            )
+        ''')
+
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS playlist_items_aggregate_insert
+        AFTER INSERT ON playlist_items BEGIN
+            UPDATE playlists SET
+                item_count = item_count + 1,
+                total_duration = total_duration + COALESCE(
+                    (SELECT duration FROM recordings WHERE id = new.recording_id), 0)
+            WHERE id = new.playlist_id;
+        END
+        ''')
+
+        # delete_recording removes playlist items before the recording, so its duration is still there
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS playlist_items_aggregate_delete
+        AFTER DELETE ON playlist_items BEGIN
+            UPDATE playlists SET
+                item_count = item_count - 1,
+                total_duration = total_duration - COALESCE(
+                    (SELECT duration FROM recordings WHERE id = old.recording_id), 0)
+            WHERE id = old.playlist_id;
+        END
+        ''')
+
+        # Position changes don't affect the aggregates, so only these columns fire
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS playlist_items_aggregate_update
+        AFTER UPDATE OF playlist_id, recording_id ON playlist_items BEGIN
+            UPDATE playlists SET
+                item_count = item_count - 1,
+                total_duration = total_duration - COALESCE(
+                    (SELECT duration FROM recordings WHERE id = old.recording_id), 0)
+            WHERE id = old.playlist_id;
+            UPDATE playlists SET
+                item_count = item_count + 1,
+                total_duration = total_duration + COALESCE(
+                    (SELECT duration FROM recordings WHERE id = new.recording_id), 0)
+            WHERE id = new.playlist_id;
+        END
+        ''')
+
+        # The overview lists playlists newest first straight off this index
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_playlists_date_created
+        ON playlists (date_created)
+        ''')
+
+        # A recording is in each playlist at most once (see migrate_add_indexes)
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS recordings_duration_aggregate_update
+        AFTER UPDATE OF duration ON recordings BEGIN
+            UPDATE playlists SET
+                total_duration = total_duration + COALESCE(new.duration, 0) - COALESCE(old.duration, 0)
+            WHERE id IN (SELECT playlist_id FROM playlist_items WHERE recording_id = new.id);
+        END
+        ''')
+
+    def migrate_filepath_index(self):
+        """Index recordings by file path for lookups from the player."""
+        # Not unique: recordings with identical content share one stored blob
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_recordings_filepath
+        ON recordings (filepath)
+        ''')
+
+    def migrate_media_metadata(self):
+        """Cache probed audio metadata per file, so players can skip parsing."""
+        # size and mtime_ns identify the version of the file the metadata was read from
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS media_metadata (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            duration REAL,
+            codec TEXT,
+            bitrate INTEGER,
+            channels INTEGER,
+            sample_rate INTEGER
+        )
+        ''')
+
     def add_recording(self, title, filepath, description="", duration=0, cover_art=None):
         """Add a new recording to the database."""
         date_created = datetime.now().isoformat()
@@ -74,9 +374,35 @@ class Database:
         VALUES (?, ?, ?, ?, ?, ?)
         ''', (title, description, filepath, duration, date_created, cover_art))
 
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
+    def add_recordings_bulk(self, recordings):
+        """Add many recordings in a single transaction.
+
+        Each item is a (title, description, filepath, duration, content_hash)
+        tuple; content_hash may be None for files outside the recording store.
+        Returns the number of rows inserted.
+        """
+        date_created = datetime.now().isoformat()
+        rows = [(title, description, filepath, duration, date_created, content_hash)
+                for title, description, filepath, duration, content_hash in recordings]
+
+        self.cursor.executemany('''
+        INSERT INTO recordings (title, description, filepath, duration, date_created, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+        # Count a reference on each stored blob
+        self.cursor.executemany('''
+        INSERT INTO blobs (hash, path, refcount) VALUES (?, ?, 1)
+        ON CONFLICT (hash) DO UPDATE SET refcount = refcount + 1
+        ''', [(content_hash, filepath) for _, _, filepath, _, content_hash in recordings
+              if content_hash])
+
+        self._commit()
+        return len(rows)
+
     def get_all_recordings(self):
         """Retrieve all recordings from the database."""
         self.cursor.execute('''
@@ -87,6 +413,49 @@ class Database:
 
         return self.cursor.fetchall()
 
+    def get_recordings_page(self, limit=50, after=None, newest_first=True):
+        """Get one page of recordings using keyset pagination.
+
+        Rows are ordered by (date_created, id). Pass the cursor returned with
+        the previous page as `after` to continue from where it stopped.
+        Returns a (rows, next_cursor) tuple; next_cursor is None on the last page.
+        """
+        direction = 'DESC' if newest_first else 'ASC'
+        params = []
+        where = ''
+
+        if after is not None:
+            after_date, after_id = after
+            comparison = '<' if newest_first else '>'
+            where = f'WHERE date_created {comparison} ? OR (date_created = ? AND id {comparison} ?)'
+            params.extend([after_date, after_date, after_id])
+
+        params.append(limit)
+
+        self.cursor.execute(f'''
+        SELECT id, title, description, filepath, duration, date_created, cover_art
+        FROM recordings
+        {where}
+        ORDER BY date_created {direction}, id {direction}
+        LIMIT ?
+        ''', params)
+
+        rows = self.cursor.fetchall()
+        if len(rows) < limit:
+            return rows, None
+
+        last = rows[-1]
+        return rows, (last[5], last[0])  # date_created, id
+
+    def iter_recordings(self, page_size=200, newest_first=True):
+        """Yield all recordings one page at a time instead of loading them at once."""
+        cursor = None
+        while True:
+            rows, cursor = self.get_recordings_page(page_size, cursor, newest_first)
+            yield from rows
+            if cursor is None:
+                break
+
     def get_recording(self, recording_id):
         """Get a specific recording by ID."""
         self.cursor.execute('''
@@ -97,6 +466,18 @@ class Database:
 
         return self.cursor.fetchone()
 
+    def get_recording_by_filepath(self, filepath):
+        """Get the first recording stored at a file path, or None."""
+        self.cursor.execute('''
+        SELECT id, title, description, filepath, duration, date_created, cover_art
+        FROM recordings
+        WHERE filepath = ?
+        ORDER BY id
+        LIMIT 1
+        ''', (filepath,))
+
+        return self.cursor.fetchone()
+
     def update_recording(self, recording_id, title=None, description=None, filepath=None,
                          duration=None, cover_art=None):
         """Update an existing recording's details."""
@@ -118,11 +499,46 @@ class Database:
         WHERE id = ?
         ''', (title, description, filepath, duration, cover_art, recording_id))
 
-        self.conn.commit()
+        self._commit()
         return True
 
     def delete_recording(self, recording_id):
-        """Delete a recording from the database."""
+        """Delete a recording from the database.
+
+        Returns the path of the recording's file if nothing else uses it any
+        more and it can be deleted, otherwise None.
+        """
+        self.cursor.execute('''
+        SELECT filepath, content_hash FROM recordings
+        WHERE id = ?
+        ''', (recording_id,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        filepath, content_hash = row
+        unused_path = None
+
+        if content_hash:
+            # Drop this recording's reference to the stored blob
+            self.cursor.execute('''
+            UPDATE blobs SET refcount = refcount - 1
+            WHERE hash = ?
+            ''', (content_hash,))
+            self.cursor.execute('''
+            DELETE FROM blobs
+            WHERE hash = ? AND refcount <= 0
+            ''', (content_hash,))
+            if self.cursor.rowcount:
+                unused_path = filepath
+        else:
+            # Files imported before the store existed belong to one recording each
+            self.cursor.execute('''
+            SELECT COUNT(*) FROM recordings
+            WHERE filepath = ? AND id != ?
+            ''', (filepath, recording_id))
+            if self.cursor.fetchone()[0] == 0:
+                unused_path = filepath
+
         # First, remove from any playlists
         self.cursor.execute('''
         DELETE FROM playlist_items
@@ -135,8 +551,78 @@ class Database:
         WHERE id = ?
         ''', (recording_id,))
 
-        self.conn.commit()
-        return True
+        if unused_path:
+            self.cursor.execute('''
+            DELETE FROM media_metadata
+            WHERE path = ?
+            ''', (unused_path,))
+
+        self._commit()
+        return unused_path
+
+    def delete_recordings_bulk(self, recording_ids):
+        """Delete several recordings in one transaction.
+
+        Returns the paths of files no longer used by any recording, which
+        the caller can delete (see delete_recording).
+        """
+        ids = [(recording_id,) for recording_id in set(recording_ids)]
+        if not ids:
+            return []
+
+        placeholders = ', '.join('?' * len(ids))
+        self.cursor.execute(f'''
+        SELECT filepath, content_hash FROM recordings
+        WHERE id IN ({placeholders})
+        ''', [recording_id for recording_id, in ids])
+        rows = self.cursor.fetchall()
+
+        # Playlist items first, so the aggregate triggers still see the durations
+        self.cursor.executemany('''
+        DELETE FROM playlist_items
+        WHERE recording_id = ?
+        ''', ids)
+
+        self.cursor.executemany('''
+        DELETE FROM recordings
+        WHERE id = ?
+        ''', ids)
+
+        # One reference per deleted recording; blobs left at zero can go
+        hashes = [(content_hash,) for _, content_hash in rows if content_hash]
+        self.cursor.executemany('''
+        UPDATE blobs SET refcount = refcount - 1
+        WHERE hash = ?
+        ''', hashes)
+        self.cursor.execute('''
+        SELECT path FROM blobs
+        WHERE refcount <= 0
+        ''')
+        unused_paths = [path for path, in self.cursor.fetchall()]
+        self.cursor.execute('''
+        DELETE FROM blobs
+        WHERE refcount <= 0
+        ''')
+
+        # Files imported before the store existed go once no remaining recording uses them
+        for filepath, content_hash in rows:
+            if content_hash or filepath in unused_paths:
+                continue
+            self.cursor.execute('''
+            SELECT 1 FROM recordings
+            WHERE filepath = ?
+            LIMIT 1
+            ''', (filepath,))
+            if self.cursor.fetchone() is None:
+                unused_paths.append(filepath)
+
+        self.cursor.executemany('''
+        DELETE FROM media_metadata
+        WHERE path = ?
+        ''', [(path,) for path in unused_paths])
+
+        self._commit()
+        return unused_paths
 
     def create_playlist(self, name, description=""):
         """Create a new playlist."""
@@ -147,16 +633,15 @@ class Database:
         VALUES (?, ?, ?)
         ''', (name, description, date_created))
 
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def get_all_playlists(self):
-        """Retrieve all playlists with count of recordings."""
+        """Retrieve all playlists with their recording count and total duration."""
         self.cursor.execute('''
-        SELECT p.id, p.name, p.description, p.date_created,
-            (SELECT COUNT(*) FROM playlist_items WHERE playlist_id = p.id) as recording_count
-        FROM playlists p
-        ORDER BY p.date_created DESC
+        SELECT id, name, description, date_created, item_count, total_duration
+        FROM playlists
+        ORDER BY date_created DESC
         ''')
 
         return self.cursor.fetchall()
@@ -172,73 +657,131 @@ class Database:
         return self.cursor.fetchone()
 
     def get_playlist_recordings(self, playlist_id):
-        """Get all recordings in a playlist, ordered by position."""
+        """Get all recordings in a playlist, ordered by position.
+
+        The last column is the item's index in the playlist (0, 1, 2, ...),
+        not the sparse position key stored in the database.
+        """
         self.cursor.execute('''
-        SELECT r.id, r.title, r.description, r.filepath, r.duration, r.date_created, r.cover_art, pi.position
+        SELECT r.id, r.title, r.description, r.filepath, r.duration, r.date_created, r.cover_art
         FROM recordings r
         JOIN playlist_items pi ON r.id = pi.recording_id
         WHERE pi.playlist_id = ?
-        ORDER BY pi.position
+        ORDER BY pi.position, pi.id
         ''', (playlist_id,))
 
-        return self.cursor.fetchall()
+        return [row + (index,) for index, row in enumerate(self.cursor.fetchall())]
 
     def add_recording_to_playlist(self, playlist_id, recording_id, position=None):
-        """Add a recording to a playlist."""
-        # If position is not specified, add to the end
+        """Add a recording to a playlist.
+
+        `position` is the index to insert at; by default the recording goes
+        to the end. A recording already in the playlist is moved instead.
+        """
         if position is None:
-            self.cursor.execute('''
-            SELECT COALESCE(MAX(position) + 1, 0)
-            FROM playlist_items
-            WHERE playlist_id = ?
-            ''', (playlist_id,))
-            position = self.cursor.fetchone()[0]
+            key = self.position_key_at_end(playlist_id)
+        else:
+            key = self.position_key_before(playlist_id, position, exclude_recording=recording_id)
 
-        # Check if the recording is already in the playlist
+        # The unique (playlist_id, recording_id) index turns a repeat add into a move
         self.cursor.execute('''
-        SELECT id FROM playlist_items
-        WHERE playlist_id = ? AND recording_id = ?
-        ''', (playlist_id, recording_id))
-
-        if self.cursor.fetchone():
-            # If already exists, just update the position
-            self.cursor.execute('''
-            UPDATE playlist_items
-            SET position = ?
-            WHERE playlist_id = ? AND recording_id = ?
-            ''', (position, playlist_id, recording_id))
-        else:
-            # Otherwise, insert a new entry
-            self.cursor.execute('''
-            INSERT INTO playlist_items (playlist_id, recording_id, position)
-            VALUES (?, ?, ?)
-            ''', (playlist_id, recording_id, position))
+        INSERT INTO playlist_items (playlist_id, recording_id, position)
+        VALUES (?, ?, ?)
+        ON CONFLICT (playlist_id, recording_id) DO UPDATE SET position = excluded.position
+        ''', (playlist_id, recording_id, key))
 
-        self.conn.commit()
+        self._commit()
         return True
 
+    def add_recordings_to_playlist_bulk(self, playlist_id, recording_ids):
+        """Append several recordings to a playlist in one transaction.
+
+        Recordings already in the playlist are moved to the end, in the
+        order given. Returns the number of recordings added or moved.
+        """
+        recording_ids = list(dict.fromkeys(recording_ids))
+        first_key = self.position_key_at_end(playlist_id)
+
+        self.cursor.executemany('''
+        INSERT INTO playlist_items (playlist_id, recording_id, position)
+        VALUES (?, ?, ?)
+        ON CONFLICT (playlist_id, recording_id) DO UPDATE SET position = excluded.position
+        ''', [(playlist_id, recording_id, first_key + index * POSITION_GAP)
+              for index, recording_id in enumerate(recording_ids)])
+
+        self._commit()
+        return len(recording_ids)
+
     def remove_recording_from_playlist(self, playlist_id, recording_id):
         """Remove a recording from a playlist."""
+        # Sparse positions keep their order without renumbering the other items
         self.cursor.execute('''
         DELETE FROM playlist_items
         WHERE playlist_id = ? AND recording_id = ?
         ''', (playlist_id, recording_id))
 
-        # Reorder positions to maintain sequence
+        self._commit()
+        return True
+
+    def position_key_at_end(self, playlist_id):
+        """Position key for a new last item."""
         self.cursor.execute('''
-        UPDATE playlist_items
-        SET position = (
-            SELECT COUNT(*)
-            FROM playlist_items pi2
-            WHERE pi2.playlist_id = playlist_items.playlist_id
-            AND pi2.id <= playlist_items.id
-            AND pi2.id != playlist_items.id
-        )
+        SELECT MAX(position)
+        FROM playlist_items
         WHERE playlist_id = ?
         ''', (playlist_id,))
+        last = self.cursor.fetchone()[0]
+        return POSITION_GAP if last is None else last + POSITION_GAP
 
-        self.conn.commit()
-        return True
+    def position_key_before(self, playlist_id, index, exclude_recording=None):
+        """Position key that places an item at `index`, between its new neighbours.
+
+        The playlist is rebalanced first if the neighbours have no room left
+        between them.
+        """
+        for _ in range(2):
+            # The item currently at index - 1 and at index, ignoring the one being moved
+            self.cursor.execute('''
+            SELECT position FROM playlist_items
+            WHERE playlist_id = ? AND recording_id IS NOT ?
+            ORDER BY position, id
+            LIMIT 2 OFFSET ?
+            ''', (playlist_id, exclude_recording, max(index - 1, 0)))
+            keys = [row[0] for row in self.cursor.fetchall()]
+
+            if index <= 0:
+                after = keys[0] if keys else None
+                before = (after - 2 * POSITION_GAP) if after is not None else 0
+            else:
+                if not keys:
+                    return self.position_key_at_end(playlist_id)
+                before = keys[0]
+                after = keys[1] if len(keys) > 1 else None
+
+            if after is None:
+                return before + POSITION_GAP
+            if after - before > 1:
+                return (before + after) // 2
+
+            self.rebalance_playlist(playlist_id, commit=False)
+
+        return self.position_key_at_end(playlist_id)
+
+    def rebalance_playlist(self, playlist_id, commit=True):
+        """Respace a playlist's position keys POSITION_GAP apart, keeping their order."""
+        self.cursor.execute('''
+        SELECT id FROM playlist_items
+        WHERE playlist_id = ?
+        ORDER BY position, id
+        ''', (playlist_id,))
+        item_ids = [row[0] for row in self.cursor.fetchall()]
+
+        self.cursor.executemany('''
+        UPDATE playlist_items SET position = ? WHERE id = ?
+        ''', [((index + 1) * POSITION_GAP, item_id) for index, item_id in enumerate(item_ids)])
+
+        if commit:
+            self._commit()
 
     def update_playlist(self, playlist_id, name=None, description=None):
         """Update a playlist's details."""
@@ -255,7 +798,7 @@ class Database:
         WHERE id = ?
         ''', (name, description, playlist_id))
 
-        self.conn.commit()
+        self._commit()
         return True
 
     def delete_playlist(self, playlist_id):
@@ -266,14 +809,13 @@ class Database:
         WHERE id = ?
         ''', (playlist_id,))
 
-        self.conn.commit()
+        self._commit()
         return True
 
     def reorder_playlist(self, playlist_id, recording_id, new_position):
-        """Change the position of a recording within a playlist."""
-        # Get the current position
+        """Move a recording to index `new_position` within a playlist."""
         self.cursor.execute('''
-        SELECT position FROM playlist_items
+        SELECT id FROM playlist_items
         WHERE playlist_id = ? AND recording_id = ?
         ''', (playlist_id, recording_id))
 
@@ -281,55 +823,114 @@ class Database:
         if not result:
             return False
 
-        current_position = result[0]
-
-        # Update positions of other items
-        if new_position > current_position:
-            # Moving down, shift items up
-            self.cursor.execute('''
-            UPDATE playlist_items
-            SET position = position - 1
-            WHERE playlist_id = ? AND position > ? AND position <= ?
-            ''', (playlist_id, current_position, new_position))
-        else:
-            # Moving up, shift items down
-            self.cursor.execute('''
-            UPDATE playlist_items
-            SET position = position + 1
-            WHERE playlist_id = ? AND position >= ? AND position < ?
-            ''', (playlist_id, new_position, current_position))
-
-        # Update the position of the target item
+        # Only the moved item gets a new key, between its new neighbours
+        key = self.position_key_before(playlist_id, new_position, exclude_recording=recording_id)
         self.cursor.execute('''
         UPDATE playlist_items
         SET position = ?
-        WHERE playlist_id = ? AND recording_id = ?
-        ''', (new_position, playlist_id, recording_id))
+        WHERE id = ?
+        ''', (key, result[0]))
 
-        self.conn.commit()
+        self._commit()
         return True
 
+    def get_media_metadata(self, path, size, mtime_ns):
+        """Get cached metadata for a file, if it was recorded for this size and mtime.
+
+        Returns a dict like audio_probe.probe, or None.
+        """
+        self.cursor.execute('''
+        SELECT duration, codec, bitrate, channels, sample_rate
+        FROM media_metadata
+        WHERE path = ? AND size = ? AND mtime_ns = ?
+        ''', (path, size, mtime_ns))
+
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return dict(zip(('duration', 'codec', 'bitrate', 'channels', 'sample_rate'), row))
+
+    def set_media_metadata_bulk(self, entries):
+        """Store metadata for several files.
+
+        Each entry is a (path, size, mtime_ns, info) tuple, where info is a
+        dict like audio_probe.probe returns.
+        """
+        self.cursor.executemany('''
+        INSERT OR REPLACE INTO media_metadata
+            (path, size, mtime_ns, duration, codec, bitrate, channels, sample_rate)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(path, size, mtime_ns, info.get('duration'), info.get('codec'), info.get('bitrate'),
+               info.get('channels'), info.get('sample_rate'))
+              for path, size, mtime_ns, info in entries])
+
+        self._commit()
+
     def set_setting(self, key, value):
         """Set or update a setting."""
-        self.cursor.execute('''
+        self.set_settings({key: value})
+
+    def set_settings(self, values):
+        """Set or update several settings in one transaction."""
+        self.cursor.executemany('''
         INSERT OR REPLACE INTO settings (key, value)
         VALUES (?, ?)
-        ''', (key, value))
+        ''', list(values.items()))
 
-        self.conn.commit()
+        self._commit()
+
+        # Write through to the in-memory copy
+        if self.settings_cache is not None:
+            self.settings_cache.update(values)
 
     def get_setting(self, key, default=None):
         """Get a setting value by key."""
-        self.cursor.execute('''
-        SELECT value FROM settings
-        WHERE key = ?
-        ''', (key,))
+        if self.settings_cache is None:
+            self.load_settings()
 
-        result = self.cursor.fetchone()
-        return result[0] if result else default
+        return self.settings_cache.get(key, default)
+
+    def load_settings(self):
+        """Read the whole settings table into memory."""
+        self.cursor.execute('''
+        SELECT key, value FROM settings
+        ''')
 
-    def search_recordings(self, search_term):
-        """Search recordings by title or description."""
+        self.settings_cache = dict(self.cursor.fetchall())
+
+    def search_recordings(self, search_term, ranked=True):
+        """Search recordings by title or description.
+
+        Uses the FTS5 index when available: every word in the search term is
+        matched as a prefix, and results are ordered by bm25 relevance (title
+        hits weigh more than description hits) unless ranked is False.
+        """
+        match_query = self._build_match_query(search_term)
+
+        if self.fts_enabled and match_query:
+            order_by = 'bm25(recordings_fts, 10.0, 1.0)' if ranked else 'r.date_created DESC'
+            try:
+                self.cursor.execute(f'''
+                SELECT r.id, r.title, r.description, r.filepath, r.duration, r.date_created, r.cover_art
+                FROM recordings_fts
+                JOIN recordings r ON r.id = recordings_fts.rowid
+                WHERE recordings_fts MATCH ?
+                ORDER BY {order_by}
+                ''', (match_query,))
+
+                return self.cursor.fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"FTS search failed, falling back to LIKE: {e}")
+
+        return self._search_recordings_like(search_term)
+
+    def _build_match_query(self, search_term):
+        """Turn free text into an FTS5 query of quoted prefix terms."""
+        words = re.findall(r'\w+', search_term or '')
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def _search_recordings_like(self, search_term):
+        """Search recordings with a LIKE scan (used when FTS5 is unavailable)."""
         search_term = f"%{search_term}%"
 
         self.cursor.execute('''
@@ -0,0 +1,164 @@
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# ioctl request for a copy-on-write clone of a whole file (Linux, btrfs/xfs/f2fs)
+FICLONE = 0x40049409
+
+# Buffer size for the chunked fallback; memory use stays bounded by this
+COPY_CHUNK = 1024 * 1024
+
+
+def copy_file(src, dest, progress=None, hasher=None):
+    """Copy src to dest without reading the whole file into memory.
+
+    Tries, cheapest first: a hard link, a reflink clone, an in-kernel copy
+    (copy_file_range or sendfile), then a chunked copy. The data is written
+    to a temporary file next to dest and renamed into place, so dest never
+    exists half-written. `progress(copied, total)` is called as bytes land.
+
+    If a hashlib `hasher` is given it is updated with the file's bytes. That
+    needs the data to pass through Python, so only the chunked copy is used.
+    Returns the name of the method that did the copy.
+    """
+    total = os.path.getsize(src)
+    dest_dir = os.path.dirname(os.path.abspath(dest))
+
+    # Hard links share the data outright when both paths are on one filesystem
+    if hasher is None and link_file(src, dest):
+        report(progress, total, total)
+        return 'link'
+
+    fd, temp_path = tempfile.mkstemp(prefix='.import-', suffix='.part', dir=dest_dir)
+    try:
+        with open(src, 'rb') as src_file, os.fdopen(fd, 'wb') as dest_file:
+            if hasher is not None:
+                method = 'chunked'
+                chunked_copy(src_file, dest_file, total, progress, hasher)
+            elif clone_file(src_file, dest_file):
+                method = 'reflink'
+                report(progress, total, total)
+            else:
+                method = kernel_copy(src_file, dest_file, total, progress)
+                if method is None:
+                    method = 'chunked'
+                    chunked_copy(src_file, dest_file, total, progress)
+
+            dest_file.flush()
+            os.fsync(dest_file.fileno())
+
+        os.replace(temp_path, dest)
+        return method
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def hash_file(path, hasher, progress=None):
+    """Feed a file's bytes to a hashlib `hasher` through a fixed-size buffer."""
+    total = os.path.getsize(path)
+    buffer = bytearray(COPY_CHUNK)
+    view = memoryview(buffer)
+    hashed = 0
+
+    with open(path, 'rb') as src_file:
+        while True:
+            read = src_file.readinto(buffer)
+            if not read:
+                break
+            hasher.update(view[:read])
+            hashed += read
+            report(progress, hashed, total)
+
+
+def report(progress, copied, total):
+    """Call the progress callback, if any."""
+    if progress:
+        progress(copied, total)
+
+
+def link_file(src, dest):
+    """Hard link src to dest, returning False if the filesystem won't allow it."""
+    if not hasattr(os, 'link'):
+        return False
+    try:
+        # Link under a temporary name first so dest only ever appears complete
+        temp_path = f"{dest}.link-{os.getpid()}"
+        os.link(src, temp_path)
+        os.replace(temp_path, dest)
+        return True
+    except OSError:
+        # Different filesystem (EXDEV), or links not permitted (e.g. Android shared storage)
+        return False
+
+
+def clone_file(src_file, dest_file):
+    """Make dest a copy-on-write clone of src, if the filesystem supports it."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def kernel_copy(src_file, dest_file, total, progress=None):
+    """Copy inside the kernel with copy_file_range or sendfile.
+
+    Returns the method used, or None if neither is available so the caller
+    can fall back to a chunked copy.
+    """
+    src_fd = src_file.fileno()
+    dest_fd = dest_file.fileno()
+
+    for method in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, method):
+            continue
+
+        copied = 0
+        try:
+            while copied < total:
+                if method == 'copy_file_range':
+                    sent = os.copy_file_range(src_fd, dest_fd, min(COPY_CHUNK * 8, total - copied))
+                else:
+                    sent = os.sendfile(dest_fd, src_fd, copied, min(COPY_CHUNK * 8, total - copied))
+                if sent == 0:
+                    break
+                copied += sent
+                report(progress, copied, total)
+            return method
+        except OSError:
+            if copied:
+                # Partially copied; let the next method start from a clean slate
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dest_fd, 0, os.SEEK_SET)
+                os.ftruncate(dest_fd, 0)
+
+    return None
+
+
+def chunked_copy(src_file, dest_file, total, progress=None, hasher=None):
+    """Copy through a fixed-size buffer, feeding each chunk to `hasher` if given."""
+    src_file.seek(0)
+    buffer = bytearray(COPY_CHUNK)
+    view = memoryview(buffer)
+    copied = 0
+
+    while True:
+        read = src_file.readinto(buffer)
+        if not read:
+            break
+        dest_file.write(view[:read])
+        if hasher is not None:
+            hasher.update(view[:read])
+        copied += read
+        report(progress, copied, total)
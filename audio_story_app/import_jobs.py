@@ -0,0 +1,228 @@
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+import os
+import threading
+
+from audio_probe import probe
+
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.m4a')
+
+# Files probed and copied at the same time; copying is I/O bound, so a few is enough
+DEFAULT_WORKERS = 3
+
+# Finished files committed to the database per transaction
+BATCH_SIZE = 25
+
+# How often results and progress are handed back to the UI thread
+FLUSH_INTERVAL = 0.1
+
+# Error reported for files that were stopped by cancel()
+CANCELLED = "Cancelled"
+
+
+class ImportCancelled(Exception):
+    """Raised inside a worker when the job has been cancelled."""
+
+
+def find_audio_files(folder):
+    """Recursively list the audio files under a folder, sorted by path."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.lower().endswith(AUDIO_EXTENSIONS) and not filename.startswith('.'):
+                found.append(os.path.join(dirpath, filename))
+    found.sort()
+    return found
+
+
+def make_import_items(paths):
+    """Turn files and folders into import items titled after their filenames."""
+    items = []
+    for path in paths:
+        files = find_audio_files(path) if os.path.isdir(path) else [path]
+        for filepath in files:
+            title = os.path.splitext(os.path.basename(filepath))[0]
+            items.append({'source': filepath, 'title': title, 'description': ""})
+    return items
+
+
+class ImportJob(EventDispatcher):
+    """Import many audio files in the background.
+
+    Workers from a bounded pool probe files and copy them into the
+    recording store in parallel. Every
+    result is handed back to the main thread by a Clock tick, which
+    commits finished files to the database in batches and dispatches
+    progress events, so handlers can update widgets directly.
+
+    Events:
+        on_file_progress(index, source, fraction)
+        on_progress(finished, total)
+        on_file_done(index, source, error)  # None on success, CANCELLED if stopped
+        on_complete(imported, failed, cancelled)
+    """
+
+    def __init__(self, database, items, store, max_workers=DEFAULT_WORKERS, **kwargs):
+        self.register_event_type('on_file_progress')
+        self.register_event_type('on_progress')
+        self.register_event_type('on_file_done')
+        self.register_event_type('on_complete')
+        super(ImportJob, self).__init__(**kwargs)
+
+        self.database = database
+        self.items = items
+        self.store = store
+        self.max_workers = max_workers
+
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+        # Shared with workers, guarded by self.lock
+        self.file_progress = {}  # index -> fraction copied
+        self.results = []  # (index, row or None, metadata or None, error or None)
+        self.outstanding = len(items)
+
+        # Main thread only
+        self.pending_rows = []
+        self.pending_metadata = []
+        self.finished = 0
+        self.imported = 0
+        self.failed = 0
+        self.executor = None
+        self.futures = []
+        self.flush_event = None
+
+    @property
+    def running(self):
+        """Whether the job has started and not yet completed."""
+        return self.flush_event is not None
+
+    def start(self):
+        """Start importing; returns immediately."""
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix='import')
+        self.futures = [self.executor.submit(self.run_item, index, item)
+                        for index, item in enumerate(self.items)]
+
+        self.flush_event = Clock.schedule_interval(self.flush, FLUSH_INTERVAL)
+        self.dispatch('on_progress', 0, len(self.items))
+
+    def cancel(self):
+        """Stop the job; files already copied are still added to the library."""
+        self.cancel_event.set()
+
+        # Queued items that never started are dropped outright; running ones
+        # notice the event in their progress callback
+        cancelled = sum(1 for future in self.futures if future.cancel())
+        with self.lock:
+            self.outstanding -= cancelled
+
+    # Worker side
+
+    def run_item(self, index, item):
+        """Probe and copy one file on a worker thread."""
+        source = item['source']
+        try:
+            if self.cancel_event.is_set():
+                raise ImportCancelled()
+
+            with self.lock:
+                self.file_progress[index] = 0.0
+
+            info = probe(source)
+            duration = info['duration'] if info else 0
+
+            def progress(copied, total):
+                with self.lock:
+                    self.file_progress[index] = copied / total if total else 1.0
+                if self.cancel_event.is_set():
+                    raise ImportCancelled()
+
+            # An identical file already in the store is reused instead of copied again
+            dest_path, content_hash, reused = self.store.ingest(source, progress)
+            if reused:
+                print(f"Reusing stored copy of {source}")
+
+            row = (item['title'], item.get('description', ""), dest_path, duration, content_hash)
+
+            # Keyed by the stored file's size and mtime, so players can trust it on load
+            metadata = None
+            if info:
+                stat = os.stat(dest_path)
+                metadata = (dest_path, stat.st_size, stat.st_mtime_ns, info)
+
+            self.finish_item(index, row, metadata, None)
+        except ImportCancelled:
+            self.finish_item(index, None, None, CANCELLED)
+        except Exception as e:
+            print(f"Error importing {source}: {e}")
+            self.finish_item(index, None, None, str(e))
+
+    def finish_item(self, index, row, metadata, error):
+        """Queue a worker's result for the next flush."""
+        with self.lock:
+            self.file_progress.pop(index, None)
+            self.results.append((index, row, metadata, error))
+
+    # Main thread side
+
+    def flush(self, dt):
+        """Collect worker results, commit a batch and report progress."""
+        with self.lock:
+            results, self.results = self.results, []
+            file_progress = dict(self.file_progress)
+            self.outstanding -= len(results)
+            done = self.outstanding <= 0
+
+        for index, fraction in file_progress.items():
+            self.dispatch('on_file_progress', index, self.items[index]['source'], fraction)
+
+        for index, row, metadata, error in results:
+            self.finished += 1
+            if row:
+                self.pending_rows.append(row)
+                if metadata:
+                    self.pending_metadata.append(metadata)
+            elif error != CANCELLED:
+                self.failed += 1
+            self.dispatch('on_file_done', index, self.items[index]['source'], error)
+
+        if self.pending_rows and (done or len(self.pending_rows) >= BATCH_SIZE):
+            self.commit_pending()
+
+        if results:
+            self.dispatch('on_progress', self.finished, len(self.items))
+
+        if done:
+            self.flush_event.cancel()
+            self.flush_event = None
+            self.executor.shutdown(wait=False)
+            self.dispatch('on_complete', self.imported, self.failed, self.cancel_event.is_set())
+
+    def commit_pending(self):
+        """Insert the finished files and their metadata in one transaction."""
+        try:
+            with self.database.transaction():
+                added = self.database.add_recordings_bulk(self.pending_rows)
+                self.database.set_media_metadata_bulk(self.pending_metadata)
+            self.imported += added
+        except Exception as e:
+            print(f"Error saving imported recordings: {e}")
+            self.failed += len(self.pending_rows)
+        self.pending_rows = []
+        self.pending_metadata = []
+
+    def on_file_progress(self, index, source, fraction):
+        pass
+
+    def on_progress(self, finished, total):
+        pass
+
+    def on_file_done(self, index, source, error):
+        pass
+
+    def on_complete(self, imported, failed, cancelled):
+        pass
@@ -1,12 +1,16 @@
+# Imported first: startup is measured from here to the first frame
+from startup_clock import STARTED as STARTUP_STARTED
 from kivy.app import App
 from kivy.graphics import Rectangle, Color, Ellipse
 from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.utils import platform
 from kivy.config import Config
 from kivy.lang import Builder
 from kivy.uix.floatlayout import FloatLayout
 import os
+import time
 import theme
 
 # Import KivyMD components
@@ -51,6 +55,12 @@ except Exception as e:
 from database import Database
 from player import player as global_player
 from mini_player import MiniPlayer
+from playback_queue import PlaybackQueue
+from recording_store import RecordingStore
+from settings_store import SettingsStore
+from async_database import AsyncDatabase
+from animation_governor import governor
+from player_state import PlayerStatePublisher
 
 # Import screens
 from screens.home_screen import HomeScreen
@@ -167,20 +177,46 @@ class AudioStoryApp(MDApp):
         # Initialize database
         db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'audio_story.db')
         self.database = Database(db_path)
+        self.settings_store = SettingsStore(self.database)
+
+        # Screens run their list queries on a background connection
+        self.async_database = AsyncDatabase(db_path)
         print("Initialized database")
 
+        # Imported audio lives in a content-addressed store
+        self.recording_store = RecordingStore(os.path.join(os.path.dirname(db_path), 'recordings'))
+
         # Set up audio player
         self.player = global_player
         print("Set up audio player")
 
         # Set default volume from settings
         try:
-            default_volume = float(self.database.get_setting('default_volume', '0.8'))
+            default_volume = self.settings_store.get_float('default_volume', 0.8)
             self.player.set_volume(default_volume)
             print(f"Set default volume: {default_volume}")
         except Exception as e:
             print(f"Error setting default volume: {e}")
 
+        # Configure gapless playback between playlist items
+        if hasattr(self.player, 'configure_gapless'):
+            try:
+                self.player.configure_gapless(
+                    lead=self.settings_store.get_float('gapless_lead_seconds', 5.0),
+                    crossfade=self.settings_store.get_float('crossfade_seconds', 0.0)
+                )
+            except Exception as e:
+                print(f"Error configuring gapless playback: {e}")
+
+        # Shared queue of tracks to play, used by every screen that starts playback
+        self.queue = PlaybackQueue()
+
+        # Pause animations and UI timers while the window is minimized or hidden
+        governor.attach(Window, self.player)
+
+        # Widgets follow the player through snapshots sampled once per tick
+        self.player_state = PlayerStatePublisher(self.player)
+
         # Create root layout
         try:
             self.root_layout = RootLayout()
@@ -285,19 +321,33 @@ class AudioStoryApp(MDApp):
         )
         dialog.open()
 
+    def on_start(self):
+        """Report how long startup took once the first frame is drawn."""
+        Clock.schedule_once(self.report_startup_time)
+
+    def report_startup_time(self, dt):
+        """Print the time from launch to the first frame."""
+        print(f"Startup took {(time.perf_counter() - STARTUP_STARTED) * 1000:.0f} ms")
+
     def on_pause(self):
         """Handle app pause (for Android)."""
         # Allow the app to continue in the background
-        background_playback = self.database.get_setting('background_playback', 'True') == 'True'
+        background_playback = self.settings_store.get_bool('background_playback', True)
+
+        # The app may be killed while paused, so save any pending setting changes
+        self.settings_store.flush()
 
         if not background_playback and self.player and self.player.is_playing:
             self.player.pause()
 
+        # Nothing is visible (app switched away or screen off)
+        governor.set_visible(False)
+
         return True
 
     def on_resume(self):
         """Handle app resume (for Android)."""
-        pass
+        governor.set_visible(True)
 
     def on_stop(self):
         """Clean up resources when the app stops."""
@@ -305,7 +355,11 @@ class AudioStoryApp(MDApp):
         if hasattr(self, 'player') and self.player and self.player.is_playing:
             self.player.stop()
 
-        # Close database connection
+        # Save pending settings and close database connection
+        if hasattr(self, 'settings_store'):
+            self.settings_store.flush()
+        if hasattr(self, 'async_database'):
+            self.async_database.close()
         if hasattr(self, 'database') and self.database:
             self.database.close()
 
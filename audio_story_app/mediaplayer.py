@@ -1,10 +1,66 @@
 import vlc
-from kivy.clock import Clock
+from kivy.app import App
+from kivy.clock import Clock, mainthread
 from kivy.properties import NumericProperty, StringProperty, BooleanProperty
 from kivy.event import EventDispatcher
 import os
 import platform as sys_platform
 
+from metadata_cache import metadata_cache
+
+
+# How long libVLC may spend parsing an unknown file in the background
+PARSE_TIMEOUT_MS = 5000
+
+# Setting caching the discovered plugin path; '' means use libVLC's default
+PLUGIN_PATH_SETTING = 'vlc_plugin_path'
+
+# Where VLC's plugins usually live on each platform
+PLUGIN_PATHS = {
+    'Darwin': [
+        '/Applications/VLC.app/Contents/MacOS/lib',
+        '/Applications/VLC.app/Contents/MacOS/plugins'
+    ],
+    'Windows': [
+        r"C:\Program Files\VideoLAN\VLC\plugins",
+        r"C:\Program Files (x86)\VideoLAN\VLC\plugins"
+    ],
+    'Linux': [
+        '/usr/lib/vlc/plugins',
+        '/usr/lib/x86_64-linux-gnu/vlc/plugins',
+        '/usr/local/lib/vlc/plugins'
+    ],
+}
+
+
+def find_plugin_path():
+    """Find VLC's plugin directory, remembering the answer in the settings.
+
+    Returns None to let libVLC use its default search.
+    """
+    app = App.get_running_app()
+    settings_store = getattr(app, 'settings_store', None) if app else None
+
+    if settings_store:
+        cached = settings_store.get(PLUGIN_PATH_SETTING)
+        if cached == '':
+            return None
+        if cached and os.path.isdir(cached):
+            return cached
+
+    system = sys_platform.system()
+    print(f"Detected platform: {system}")
+
+    plugin_path = None
+    for path in PLUGIN_PATHS.get(system, []):
+        if os.path.exists(path):
+            plugin_path = path
+            break
+
+    if settings_store:
+        settings_store.set(PLUGIN_PATH_SETTING, plugin_path or '')
+    return plugin_path
+
 
 class AudioPlayer(EventDispatcher):
     """Audio player using VLC for reliable playback control."""
@@ -13,7 +69,9 @@ class AudioPlayer(EventDispatcher):
     duration = NumericProperty(100)
     is_playing = BooleanProperty(False)
     current_file = StringProperty("")
+    current_title = StringProperty("")  # Recording title; stored files are named by hash
     volume = NumericProperty(1.0)
+    position_anchor = (0.0, 0.0)  # (current_pos, boot time) when the position was last set
 
     def __init__(self, **kwargs):
         self.register_event_type('on_track_finished')
@@ -22,52 +80,22 @@ class AudioPlayer(EventDispatcher):
         # Initialize VLC instance with proper path
         self.vlc_instance = None
         self.player = None
+        self.vlc_events = None  # The player's event manager; libVLC calls back through it
+        self.parse_events = {}  # Event manager of each media being parsed, until it's done
         self.sound = None  # For compatibility
-        self.update_event = None
         self.end_reached = False
-        self.initialize_vlc()
+        # libVLC is started by ensure_vlc() when the first track is loaded
+
+    def ensure_vlc(self):
+        """Create the libVLC instance on first use; returns whether it's ready."""
+        if not self.vlc_instance or not self.player:
+            self.initialize_vlc()
+        return bool(self.vlc_instance and self.player)
 
     def initialize_vlc(self):
-        """Initialize VLC with better platform detection."""
+        """Initialize VLC, using the plugin path found on a previous run if there is one."""
         try:
-            # Platform-specific initialization
-            system = sys_platform.system()
-            plugin_path = None
-
-            print(f"Detected platform: {system}")
-
-            if system == "Darwin":  # macOS
-                possible_paths = [
-                    '/Applications/VLC.app/Contents/MacOS/lib',
-                    '/Applications/VLC.app/Contents/MacOS/plugins'
-                ]
-                for path in possible_paths:
-                    if os.path.exists(path):
-                        plugin_path = path
-                        break
-
-            elif system == "Windows":
-                # Windows paths
-                possible_paths = [
-                    r"C:\Program Files\VideoLAN\VLC\plugins",
-                    r"C:\Program Files (x86)\VideoLAN\VLC\plugins"
-                ]
-                for path in possible_paths:
-                    if os.path.exists(path):
-                        plugin_path = path
-                        break
-
-            elif system == "Linux":
-                # Linux paths
-                possible_paths = [
-                    '/usr/lib/vlc/plugins',
-                    '/usr/lib/x86_64-linux-gnu/vlc/plugins',
-                    '/usr/local/lib/vlc/plugins'
-                ]
-                for path in possible_paths:
-                    if os.path.exists(path):
-                        plugin_path = path
-                        break
+            plugin_path = find_plugin_path()
 
             # Create the VLC instance
             if plugin_path:
@@ -79,7 +107,10 @@ class AudioPlayer(EventDispatcher):
 
             # Create the media player
             self.player = self.vlc_instance.media_player_new()
+            self.attach_vlc_events()
 
+            # The volume may have been set before libVLC existed
+            self.player.audio_set_volume(int(self.volume * 100))
             print("VLC initialized successfully")
         except Exception as e:
             print(f"Error initializing VLC: {e}")
@@ -87,19 +118,96 @@ class AudioPlayer(EventDispatcher):
             try:
                 self.vlc_instance = vlc.Instance()
                 self.player = self.vlc_instance.media_player_new()
+                self.attach_vlc_events()
                 print("Fallback VLC initialization succeeded")
             except Exception as e2:
                 print(f"Fallback VLC initialization failed: {e2}")
 
-    def load(self, filepath):
-        """Load an audio file."""
+    def attach_vlc_events(self):
+        """Subscribe to libVLC player events instead of polling its state.
+
+        The event manager is kept in vlc_events: it owns the ctypes callback
+        libVLC calls, and would otherwise be garbage collected with it.
+        """
+        events = self.vlc_events = self.player.event_manager()
+        events.event_attach(vlc.EventType.MediaPlayerEndReached, self._vlc_end_reached)
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._vlc_time_changed)
+        events.event_attach(vlc.EventType.MediaPlayerLengthChanged, self._vlc_length_changed)
+
+    # libVLC calls the _vlc_* callbacks on its own thread: they only copy the
+    # event data out and hand it to the Kivy main thread, never calling back
+    # into libVLC themselves.
+
+    def _vlc_end_reached(self, event):
+        """libVLC callback for MediaPlayerEndReached."""
+        self.handle_end_reached()
+
+    def _vlc_time_changed(self, event):
+        """libVLC callback for MediaPlayerTimeChanged."""
+        self.handle_time_changed(event.u.new_time)
+
+    def _vlc_length_changed(self, event):
+        """libVLC callback for MediaPlayerLengthChanged."""
+        self.handle_length_changed(event.u.new_length)
+
+    def _vlc_media_parsed(self, event, media, filepath):
+        """libVLC callback for MediaParsedChanged; `media` is the parsed media."""
+        self.handle_media_parsed(media, filepath)
+
+    @mainthread
+    def handle_end_reached(self):
+        """Reset to the start of the track and notify listeners once."""
+        if self.end_reached:
+            return
+
+        print("Track ended (end reached event)")
+        self.end_reached = True
+        self.is_playing = False
+
+        # When end reached, reset position
+        self.current_pos = 0
+
+        # Dispatch the track finished event
+        self.dispatch('on_track_finished')
+
+    @mainthread
+    def handle_time_changed(self, time_ms):
+        """Update the position from libVLC's time-changed event."""
+        if time_ms >= 0 and not self.end_reached:
+            self.current_pos = time_ms / 1000.0
+
+    @mainthread
+    def handle_length_changed(self, length_ms):
+        """Update the duration once libVLC knows the real length."""
+        if length_ms > 0:
+            self.duration = length_ms / 1000.0
+            metadata_cache.put(self.current_file, self.duration)
+
+    @mainthread
+    def handle_media_parsed(self, media, filepath):
+        """Take the duration from a background parse and remember it."""
+        # Called on the main thread, after libVLC's callback has returned
+        self.release_parse_events(media)
+
+        duration_ms = media.get_duration()
+        if duration_ms <= 0:
+            return
+
+        duration = duration_ms / 1000.0
+        metadata_cache.put(filepath, duration)
+        if filepath == self.current_file:
+            self.duration = duration
+            print(f"Duration parsed: {self.duration} seconds")
+
+    def load(self, filepath, title=""):
+        """Load an audio file; `title` is shown for it instead of the file name."""
         print(f"Loading file: {filepath}")
 
         if not os.path.exists(filepath):
             print(f"File not found: {filepath}")
             return False
 
-        if not self.vlc_instance or not self.player:
+        if not self.ensure_vlc():
             print("VLC not initialized")
             return False
 
@@ -116,31 +224,19 @@ class AudioPlayer(EventDispatcher):
             # Set up the player
             self.player.set_media(media)
 
-            # Get media information
-            media.parse()
-
             # Set media properties
             self.current_file = filepath
+            self.current_title = title
 
-            # Get duration (in milliseconds) and convert to seconds
-            # Try to get duration after a small delay to ensure parsing is complete
-            def get_duration(dt):
-                duration_ms = self.player.get_length()
-                if duration_ms > 0:
-                    self.duration = duration_ms / 1000.0
-                    print(f"Duration updated to {self.duration} seconds")
-                else:
-                    # Try a direct query to the media itself
-                    media_duration = media.get_duration()
-                    if media_duration > 0:
-                        self.duration = media_duration / 1000.0
-                        print(f"Media duration: {self.duration} seconds")
-                    else:
-                        # If VLC can't determine length, use fallback
-                        self.duration = 100
-                        print("Using fallback duration of 100 seconds")
-
-            Clock.schedule_once(get_duration, 0.5)
+            # Metadata stored at import time is trusted, so known files skip parsing
+            info = metadata_cache.lookup(filepath)
+            if info and info.get('duration'):
+                self.duration = info['duration']
+                print(f"Using cached duration: {self.duration} seconds")
+            else:
+                # Show the database duration, if any, until libVLC reports the real one
+                self.duration = metadata_cache.lookup_duration(filepath) or 0
+                self.parse_in_background(media, filepath)
 
             # Reset position
             self.current_pos = 0
@@ -148,11 +244,6 @@ class AudioPlayer(EventDispatcher):
             # Set flag for compatibility
             self.sound = True
 
-            # Start position updates
-            if self.update_event:
-                self.update_event.cancel()
-            self.update_event = Clock.schedule_interval(self.update_position, 0.1)
-
             print(f"File loaded successfully.")
             return True
         except Exception as e:
@@ -160,6 +251,26 @@ class AudioPlayer(EventDispatcher):
             self.sound = None
             return False
 
+    def parse_in_background(self, media, filepath):
+        """Have libVLC parse an unknown file without blocking the UI thread."""
+        try:
+            # Held until handle_media_parsed, so its ctypes callback outlives the parse
+            events = self.parse_events[media] = media.event_manager()
+            events.event_attach(vlc.EventType.MediaParsedChanged, self._vlc_media_parsed, media, filepath)
+            media.parse_with_options(vlc.MediaParseFlag.local, PARSE_TIMEOUT_MS)
+        except Exception as e:
+            print(f"Error parsing media: {e}")
+            self.release_parse_events(media)
+
+    def release_parse_events(self, media):
+        """Stop listening for a media's parse events and let its event manager go."""
+        events = self.parse_events.pop(media, None)
+        if events is not None:
+            try:
+                events.event_detach(vlc.EventType.MediaParsedChanged)
+            except Exception as e:
+                print(f"Error detaching parse events: {e}")
+
     def play(self):
         """Play or resume audio."""
         if not self.vlc_instance or not self.player:
@@ -245,6 +356,8 @@ class AudioPlayer(EventDispatcher):
     def set_volume(self, volume):
         """Set playback volume (0.0 to 1.0)."""
         if not self.vlc_instance or not self.player:
+            # Applied when libVLC is created
+            self.volume = volume
             return
 
         try:
@@ -257,48 +370,30 @@ class AudioPlayer(EventDispatcher):
             print(f"Error setting volume: {e}")
 
     def update_position(self, dt):
-        """Update the current position property and check for end of track."""
-        if not self.vlc_instance or not self.player:
-            return
+        """Update the current position property.
 
-        try:
-            # Get current time in milliseconds and convert to seconds
-            time_ms = self.player.get_time()
-            if time_ms >= 0:
-                self.current_pos = time_ms / 1000.0
-
-            # Update duration if it wasn't available at load time
-            if self.duration <= 0 or self.duration == 100:  # If using the fallback duration
-                length_ms = self.player.get_length()
-                if length_ms > 0:
-                    self.duration = length_ms / 1000.0
-
-            # Check for end of playback - compare current position to duration
-            if (not self.end_reached and
-                    self.current_pos > 0 and
-                    self.duration > 0 and
-                    self.current_pos >= self.duration - 0.5):  # 0.5 second buffer
-
-                print("Track reached end - position:", self.current_pos, "duration:", self.duration)
-                self.end_reached = True
-                self.is_playing = False
-
-                # When end reached, reset position
-                self.current_pos = 0
-
-                # Dispatch the track finished event
-                self.dispatch('on_track_finished')
-
-            # Alternative end detection method - check state
-            if not self.end_reached and self.player.get_state() == vlc.State.Ended:
-                print("Track ended (state detection)")
-                self.end_reached = True
-                self.is_playing = False
-                self.current_pos = 0
-                self.dispatch('on_track_finished')
+        End of track and duration changes arrive as libVLC events; the
+        PlayerStatePublisher calls this once per tick while playing, only to
+        smooth the position between time-changed events.
+        """
+        if not self.vlc_instance or not self.player or self.end_reached or not self.is_playing:
+            return
 
-        except Exception as e:
-            print(f"Error updating position: {e}")
+        # Extrapolate from the last known position instead of asking libVLC;
+        # its next time-changed event corrects any drift
+        position, anchored_at = self.position_anchor
+        estimate = position + (Clock.get_boottime() - anchored_at)
+        if self.duration > 0:
+            estimate = min(estimate, self.duration)
+        self.current_pos = estimate
+
+    def on_current_pos(self, instance, value):
+        """Remember when the position was last set, for update_position."""
+        self.position_anchor = (value, Clock.get_boottime())
+
+    def on_is_playing(self, instance, value):
+        """Restart extrapolation from here when playback starts or stops."""
+        self.position_anchor = (self.current_pos, Clock.get_boottime())
 
     def on_track_finished(self, *args):
         """Event handler for track completion - to be overridden by subscribers."""
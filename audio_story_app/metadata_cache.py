@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from kivy.app import App
+import os
+import threading
+
+
+class MetadataCache:
+    """Small LRU cache of audio metadata, backed by the media_metadata table.
+
+    Entries are keyed by (path, size, mtime_ns), so a file that changed on
+    disk is never served stale metadata. Values are dicts like
+    audio_probe.probe returns. The import job fills the table, and the
+    player backends trust it on load instead of having VLC parse the file.
+    """
+
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def file_key(self, filepath):
+        """Cache key for a file as it is on disk now, or None if it's missing."""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return (filepath, stat.st_size, stat.st_mtime_ns)
+
+    def get_database(self):
+        """The app's main-thread database, or None outside the app."""
+        app = App.get_running_app()
+        if app and hasattr(app, 'database'):
+            return app.database
+        return None
+
+    def remember(self, key, info):
+        """Keep metadata in memory, evicting the least recently used entry if full."""
+        with self.lock:
+            self.entries[key] = info
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def lookup(self, filepath):
+        """Get known metadata for a file from memory or the database, or None.
+
+        Must be called on the main thread, which owns app.database.
+        """
+        key = self.file_key(filepath)
+        if key is None:
+            return None
+
+        with self.lock:
+            info = self.entries.get(key)
+            if info is not None:
+                self.entries.move_to_end(key)
+                return info
+
+        database = self.get_database()
+        if database is None:
+            return None
+
+        try:
+            info = database.get_media_metadata(*key)
+        except Exception as e:
+            print(f"Error reading cached metadata: {e}")
+            return None
+
+        if info:
+            self.remember(key, info)
+        return info
+
+    def put(self, filepath, duration):
+        """Record a duration a player backend found, saving it if it's new."""
+        if not duration or duration <= 0:
+            return
+
+        key = self.file_key(filepath)
+        if key is None:
+            return
+
+        with self.lock:
+            known = self.entries.get(key)
+        if known and known.get('duration') == duration:
+            return
+
+        info = dict(known or {}, duration=duration)
+        self.remember(key, info)
+
+        database = self.get_database()
+        if database is not None:
+            try:
+                database.set_media_metadata_bulk([key + (info,)])
+            except Exception as e:
+                print(f"Error saving cached metadata: {e}")
+
+    def invalidate(self, filepath=None):
+        """Forget one path, or everything, from memory."""
+        with self.lock:
+            if filepath is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == filepath]:
+                    del self.entries[key]
+
+    def lookup_duration(self, filepath):
+        """Get a known duration from the cache, falling back to the recordings table.
+
+        Returns None if neither knows the file. Must be called on the main
+        thread, which owns app.database.
+        """
+        info = self.lookup(filepath)
+        if info and info.get('duration'):
+            return info['duration']
+
+        database = self.get_database()
+        if database is not None:
+            try:
+                recording = database.get_recording_by_filepath(filepath)
+                if recording and recording[4]:  # duration is at index 4
+                    return recording[4]
+            except Exception as e:
+                print(f"Error getting duration from database: {e}")
+
+        return None
+
+
+metadata_cache = MetadataCache()
@@ -1,9 +1,7 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.properties import ObjectProperty, StringProperty, BooleanProperty, NumericProperty
 from kivy.app import App
-from kivy.clock import Clock
 from kivy.metrics import dp
-import os
 import theme
 
 from kivymd.uix.button import MDIconButton
@@ -66,6 +64,18 @@ class MiniPlayer(MDCard):
         )
         self.add_widget(self.play_pause_btn)
 
+        # Skip to the next queued track
+        self.next_btn = MDIconButton(
+            icon="skip-next",
+            size_hint_x=None,
+            width=dp(48),
+            icon_size=dp(24),
+            theme_text_color="Custom",
+            text_color=theme.ACCENT_COLOR,
+            on_release=self.play_next
+        )
+        self.add_widget(self.next_btn)
+
         # Go to playback screen button
         self.goto_btn = MDIconButton(
             icon="arrow-expand-up",
@@ -78,42 +88,39 @@ class MiniPlayer(MDCard):
         )
         self.add_widget(self.goto_btn)
 
-        # Schedule updates
-        self.update_event = Clock.schedule_interval(self.update_state, 0.5)
-
-    def update_state(self, dt):
-        """Update player state based on app's audio player."""
+        # Follow the player through the shared state publisher
+        self.update_event = None
         app = App.get_running_app()
-        if not hasattr(app, 'player') or not app.player:
-            return
+        if getattr(app, 'player_state', None):
+            self.update_event = app.player_state.subscribe(self.update_state, 0.5)
 
+    def update_state(self, state, changed):
+        """Update from a player_state.PlayerState snapshot; `changed` names the fields that differ."""
         try:
             # Update visibility based on whether anything is loaded
-            if app.player.sound:
+            if state.loaded:
                 if self.opacity < 1:
                     print("Mini player: Sound is loaded, showing mini player")
                 self.opacity = 1
 
                 # Update title from file path
-                if app.player.current_file:
-                    filename = os.path.basename(app.player.current_file)
-                    self.title = filename
+                if state.title and changed & {'loaded', 'title'}:
+                    self.title = state.title
                     # Set title_label text directly in case binding isn't working
-                    self.title_label.text = filename
+                    self.title_label.text = state.title
 
-                # Update is_playing state
-                self.is_playing = app.player.is_playing
-
-                # Update play/pause button icon
-                self.play_pause_btn.icon = "pause" if self.is_playing else "play"
+                # Update is_playing state and play/pause button icon
+                if changed & {'loaded', 'is_playing'}:
+                    self.is_playing = state.is_playing
+                    self.play_pause_btn.icon = "pause" if self.is_playing else "play"
 
                 # Update progress
-                if app.player.duration > 0:
-                    self.max_progress = app.player.duration
-                    self.progress = app.player.current_pos
-                    self.progress_bar.max = app.player.duration
-                    self.progress_bar.value = app.player.current_pos
-            else:
+                if state.duration > 0 and changed & {'loaded', 'position', 'duration'}:
+                    self.max_progress = state.duration
+                    self.progress = state.position
+                    self.progress_bar.max = state.duration
+                    self.progress_bar.value = state.position
+            elif 'loaded' in changed:
                 # Keep visible but show "Not Playing"
                 self.title = "Not Playing"
                 self.title_label.text = "Not Playing"
@@ -137,6 +144,17 @@ class MiniPlayer(MDCard):
         except Exception as e:
             print(f"Error toggling play/pause in mini player: {e}")
 
+    def play_next(self, instance):
+        """Skip to the next track in the shared queue."""
+        app = App.get_running_app()
+        if not hasattr(app, 'root_layout') or not hasattr(app, 'queue'):
+            return
+
+        try:
+            app.root_layout.get_screen('playback').play_next_in_playlist(auto=False)
+        except Exception as e:
+            print(f"Error skipping to next track in mini player: {e}")
+
     def goto_playback(self, instance):
         """Navigate to the full playback screen."""
         app = App.get_running_app()
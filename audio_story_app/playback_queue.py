@@ -0,0 +1,164 @@
+from array import array
+from kivy.event import EventDispatcher
+from kivy.properties import BooleanProperty, NumericProperty, OptionProperty, ObjectProperty
+import random
+
+
+class PlaybackQueue(EventDispatcher):
+    """The resolved list of tracks being played, shared across the app.
+
+    Items are stored as compact parallel arrays of recording ids, file
+    paths and titles. The play order is a precomputed permutation of item indices
+    (identity, or shuffled) plus its inverse, so next, previous and jump
+    are all O(1) lookups instead of rescanning the playlist.
+    """
+
+    current_index = NumericProperty(-1)  # Item index of the current track, -1 when empty
+    repeat_mode = OptionProperty('off', options=['off', 'one', 'all'])
+    shuffle = BooleanProperty(False)
+    playlist_id = ObjectProperty(None, allownone=True)  # Playlist the queue came from, if any
+
+    def __init__(self, **kwargs):
+        super(PlaybackQueue, self).__init__(**kwargs)
+        self.ids = array('q')
+        self.paths = []
+        self.titles = []
+        self.index_by_id = {}
+        self.order = array('l')  # Play position -> item index
+        self.order_pos = array('l')  # Item index -> play position
+        self.cursor = -1  # Current play position in self.order
+
+    def __len__(self):
+        return len(self.ids)
+
+    def load(self, recordings, start_index=0, playlist_id=None):
+        """Replace the queue with recording rows and make `start_index` current.
+
+        Rows only need the recording id at index 0, title at index 1 and
+        filepath at index 3, so both recordings and playlist rows can be
+        passed in.
+        """
+        self.ids = array('q', (rec[0] for rec in recordings))
+        self.paths = [rec[3] for rec in recordings]
+        self.titles = [rec[1] for rec in recordings]
+        self.index_by_id = {recording_id: i for i, recording_id in enumerate(self.ids)}
+        self.playlist_id = playlist_id
+
+        if not self.ids:
+            self.clear()
+            return
+
+        start_index = min(max(start_index, 0), len(self.ids) - 1)
+        self.build_order(start_index)
+        self.current_index = start_index
+
+    def clear(self):
+        """Empty the queue."""
+        self.ids = array('q')
+        self.paths = []
+        self.titles = []
+        self.index_by_id = {}
+        self.order = array('l')
+        self.order_pos = array('l')
+        self.cursor = -1
+        self.playlist_id = None
+        self.current_index = -1
+
+    def build_order(self, current):
+        """Precompute the play order, keeping `current` as the current item."""
+        count = len(self.ids)
+        if self.shuffle:
+            # Current item first, the rest in a random permutation
+            rest = [i for i in range(count) if i != current]
+            random.shuffle(rest)
+            self.order = array('l', [current] + rest)
+        else:
+            self.order = array('l', range(count))
+
+        self.order_pos = array('l', bytes(self.order.itemsize * count))
+        for position, index in enumerate(self.order):
+            self.order_pos[index] = position
+        self.cursor = self.order_pos[current]
+
+    def on_shuffle(self, instance, value):
+        """Rebuild the play order around the current track when shuffle toggles."""
+        if self.current_index >= 0:
+            self.build_order(self.current_index)
+
+    @property
+    def current_id(self):
+        """Recording id of the current track, or None."""
+        return self.ids[self.current_index] if self.current_index >= 0 else None
+
+    @property
+    def current_path(self):
+        """File path of the current track, or None."""
+        return self.paths[self.current_index] if self.current_index >= 0 else None
+
+    def index_of(self, recording_id):
+        """Item index of a recording in the queue, or None."""
+        return self.index_by_id.get(recording_id)
+
+    def peek_next(self, auto=True):
+        """Item index that follows the current one, or None at the end.
+
+        `auto` is for a track finishing on its own, where repeat-one
+        replays the current track; a user skip always moves on.
+        """
+        if self.cursor < 0:
+            return None
+        if auto and self.repeat_mode == 'one':
+            return self.current_index
+
+        position = self.cursor + 1
+        if position >= len(self.order):
+            if self.repeat_mode != 'all':
+                return None
+            position = 0
+        return self.order[position]
+
+    def peek_previous(self):
+        """Item index before the current one, or None at the start."""
+        if self.cursor < 0:
+            return None
+
+        position = self.cursor - 1
+        if position < 0:
+            if self.repeat_mode != 'all':
+                return None
+            position = len(self.order) - 1
+        return self.order[position]
+
+    def next(self, auto=True):
+        """Advance to the next track and return its item index, or None."""
+        index = self.peek_next(auto)
+        if index is not None:
+            self.jump(index)
+        return index
+
+    def previous(self):
+        """Go back to the previous track and return its item index, or None."""
+        index = self.peek_previous()
+        if index is not None:
+            self.jump(index)
+        return index
+
+    def jump(self, index):
+        """Make item `index` the current track."""
+        if not 0 <= index < len(self.ids):
+            return None
+        self.cursor = self.order_pos[index]
+        self.current_index = index
+        return index
+
+    def path_at(self, index):
+        """File path of item `index`, or None."""
+        return self.paths[index] if index is not None else None
+
+    def title_at(self, index):
+        """Title of item `index`, or None."""
+        return self.titles[index] if index is not None else None
+
+    def id_at(self, index):
+        """Recording id of item `index`, or None."""
+        return self.ids[index] if index is not None else None
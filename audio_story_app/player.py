@@ -1,9 +1,63 @@
 import vlc
-from kivy.clock import Clock
-from kivy.properties import NumericProperty, StringProperty, BooleanProperty
+from kivy.app import App
+from kivy.clock import Clock, mainthread
+from kivy.properties import NumericProperty, StringProperty, BooleanProperty, OptionProperty
 from kivy.event import EventDispatcher
 import os
-import time
+import shutil
+
+from metadata_cache import metadata_cache
+
+
+# How long libVLC may spend parsing an unknown file in the background
+PARSE_TIMEOUT_MS = 5000
+
+# Setting caching the discovered plugin path; '' means use libVLC's default
+PLUGIN_PATH_SETTING = 'vlc_plugin_path'
+
+
+def find_plugin_path():
+    """Find VLC's plugin directory, remembering the answer in the settings.
+
+    Returns None to let libVLC use its default search.
+    """
+    app = App.get_running_app()
+    settings_store = getattr(app, 'settings_store', None) if app else None
+
+    if settings_store:
+        cached = settings_store.get(PLUGIN_PATH_SETTING)
+        if cached == '':
+            return None
+        if cached and os.path.isdir(cached):
+            return cached
+
+    plugin_path = None
+    vlc_binary = shutil.which('vlc')
+    if vlc_binary:
+        # Get the directory containing VLC
+        vlc_dir = os.path.dirname(os.path.realpath(vlc_binary))
+        print(f"Found VLC binary at: {vlc_dir}")
+
+        if "/Applications/VLC.app" in vlc_dir:
+            # Mac app bundle
+            possible_lib_paths = ['/Applications/VLC.app/Contents/MacOS/lib']
+        else:
+            # Try common relative paths from the binary
+            possible_lib_paths = [
+                os.path.join(vlc_dir, '..', 'lib'),
+                os.path.join(vlc_dir, '..', 'lib', 'vlc'),
+                os.path.join(vlc_dir, 'lib'),
+                os.path.join(vlc_dir, 'lib', 'vlc')
+            ]
+
+        for path in possible_lib_paths:
+            if os.path.exists(path):
+                plugin_path = os.path.normpath(path)
+                break
+
+    if settings_store:
+        settings_store.set(PLUGIN_PATH_SETTING, plugin_path or '')
+    return plugin_path
 
 
 class AudioPlayer(EventDispatcher):
@@ -13,81 +67,187 @@ class AudioPlayer(EventDispatcher):
     duration = NumericProperty(100)
     is_playing = BooleanProperty(False)
     current_file = StringProperty("")
+    current_title = StringProperty("")  # Recording title; stored files are named by hash
     volume = NumericProperty(1.0)
+    # Playback state machine; 'loading' and 'seeking' wait on libVLC to catch up
+    state = OptionProperty('idle', options=['idle', 'loading', 'playing', 'paused', 'ended', 'seeking'])
     _track_finished = False  # Track whether we've already dispatched a finish event
+    position_anchor = (0.0, 0.0)  # (current_pos, boot time) when the position was last set
 
     def __init__(self, **kwargs):
         self.register_event_type('on_track_finished')
+        self.register_event_type('on_track_advanced')
         super(AudioPlayer, self).__init__(**kwargs)
 
         # Initialize VLC instance with proper path
         self.vlc_instance = None
         self.player = None
+        self.standby_player = None  # Second player that pre-arms the next track
+        self.vlc_events = []  # Both players' event managers; libVLC calls back through them
+        self.parse_events = {}  # Event manager of each media being parsed, until it's done
         self.sound = None  # For compatibility
-        self.update_event = None
-        self.initialize_vlc()
+
+        # Work queued until libVLC reports that a restarted track is playing
+        self.restart_pending = False
+        self.pending_seek_ms = None
+        self.resume_after_restart = True
+        self.restart_poll = None
+
+        # Gapless playback: the next track and how far it has been prepared
+        self.next_file = None
+        self.next_title = ""
+        self.next_state = None  # None, 'preparing' or 'ready'
+        self.gapless_lead = 5.0  # Seconds before the end to prepare the next track
+        self.crossfade = 0.0  # Seconds to fade between tracks, 0 for a hard cut
+        self.fading_player = None
+        self.fade_started = 0
+        self.fade_event = None
+
+        # libVLC is started by ensure_vlc() when the first track is loaded
+
+    def ensure_vlc(self):
+        """Create the libVLC instance on first use; returns whether it's ready.
+
+        Creating it loads libVLC's plugins, which is slow, so it waits until
+        the first track is loaded instead of delaying app startup.
+        """
+        if not self.vlc_instance or not self.player:
+            self.initialize_vlc()
+        return bool(self.vlc_instance and self.player)
 
     def initialize_vlc(self):
-        """Initialize VLC with more aggressive path finding."""
+        """Initialize VLC, using the plugin path found on a previous run if there is one."""
         try:
-            # Try to find the actual VLC binary path
-            import subprocess
-
-            try:
-                # Try to get VLC path from the system
-                result = subprocess.run(['which', 'vlc'], capture_output=True, text=True)
-                vlc_binary = result.stdout.strip()
-
-                if vlc_binary:
-                    # Get the directory containing VLC
-                    vlc_dir = os.path.dirname(vlc_binary)
-                    print(f"Found VLC binary at: {vlc_dir}")
-
-                    # Use this to find the lib directory
-                    if "/Applications/VLC.app" in vlc_dir:
-                        # Mac app bundle
-                        plugin_path = '/Applications/VLC.app/Contents/MacOS/lib'
-                    else:
-                        # Try common relative paths from the binary
-                        possible_lib_paths = [
-                            os.path.join(vlc_dir, '..', 'lib'),
-                            os.path.join(vlc_dir, '..', 'lib', 'vlc'),
-                            os.path.join(vlc_dir, 'lib'),
-                            os.path.join(vlc_dir, 'lib', 'vlc')
-                        ]
-
-                        for path in possible_lib_paths:
-                            if os.path.exists(path):
-                                plugin_path = path
-                                break
-
-                    if plugin_path:
-                        print(f"Using VLC plugin path: {plugin_path}")
-                        self.vlc_instance = vlc.Instance(f'--plugin-path={plugin_path}')
-                    else:
-                        # Fall back to default
-                        self.vlc_instance = vlc.Instance()
-                else:
-                    # Fall back to default
-                    self.vlc_instance = vlc.Instance()
-            except Exception as e:
-                print(f"Error finding VLC path: {e}")
+            plugin_path = find_plugin_path()
+            if plugin_path:
+                print(f"Using VLC plugin path: {plugin_path}")
+                self.vlc_instance = vlc.Instance(f'--plugin-path={plugin_path}')
+            else:
                 self.vlc_instance = vlc.Instance()
 
             self.player = self.vlc_instance.media_player_new()
+            self.standby_player = self.vlc_instance.media_player_new()
+            self.vlc_events = []
+            self.attach_vlc_events(self.player)
+            self.attach_vlc_events(self.standby_player)
+
+            # The volume may have been set before libVLC existed
+            self.player.audio_set_volume(int(self.volume * 100))
             print("VLC initialized successfully")
         except Exception as e:
             print(f"Error initializing VLC: {e}")
 
-    def load(self, filepath):
-        """Load an audio file."""
+    def attach_vlc_events(self, media_player):
+        """Subscribe to libVLC player events instead of polling its state.
+
+        The event manager is kept in vlc_events: it owns the ctypes callback
+        libVLC calls, and would otherwise be garbage collected with it.
+        """
+        events = media_player.event_manager()
+        self.vlc_events.append(events)
+        events.event_attach(vlc.EventType.MediaPlayerEndReached, self._vlc_end_reached, media_player)
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._vlc_time_changed, media_player)
+        events.event_attach(vlc.EventType.MediaPlayerLengthChanged, self._vlc_length_changed, media_player)
+        events.event_attach(vlc.EventType.MediaPlayerPlaying, self._vlc_playing, media_player)
+
+    # libVLC calls the _vlc_* callbacks on its own thread: they only copy the
+    # event data out and hand it to the Kivy main thread, never calling back
+    # into libVLC themselves. `source` is the media player that raised it.
+
+    def _vlc_end_reached(self, event, source):
+        """libVLC callback for MediaPlayerEndReached."""
+        self.handle_end_reached(source)
+
+    def _vlc_time_changed(self, event, source):
+        """libVLC callback for MediaPlayerTimeChanged."""
+        self.handle_time_changed(event.u.new_time, source)
+
+    def _vlc_length_changed(self, event, source):
+        """libVLC callback for MediaPlayerLengthChanged."""
+        self.handle_length_changed(event.u.new_length, source)
+
+    def _vlc_playing(self, event, source):
+        """libVLC callback for MediaPlayerPlaying."""
+        self.handle_playing(source)
+
+    def _vlc_media_parsed(self, event, media, filepath):
+        """libVLC callback for MediaParsedChanged; `media` is the parsed media."""
+        self.handle_media_parsed(media, filepath)
+
+    @mainthread
+    def handle_end_reached(self, source):
+        """Mark the track as finished and notify listeners once.
+
+        If a next track is queued, playback switches to it instead.
+        """
+        if source is not self.player or self._track_finished:
+            return
+
+        if self.next_file:
+            self.switch_to_next()
+            return
+
+        print("Track finished")
+        self.is_playing = False
+        self.state = 'ended'
+        # Do NOT reset current_pos here, keep at the end so we know
+        self._track_finished = True
+        self.dispatch('on_track_finished')
+
+    @mainthread
+    def handle_time_changed(self, time_ms, source):
+        """Update the position from libVLC's time-changed event."""
+        if source is not self.player:
+            return
+
+        if time_ms >= 0:
+            self.current_pos = time_ms / 1000.0
+            self.check_gapless()
+
+    @mainthread
+    def handle_length_changed(self, length_ms, source):
+        """Update the duration once libVLC knows the real length."""
+        if source is self.player and length_ms > 0:
+            self.duration = length_ms / 1000.0
+            metadata_cache.put(self.current_file, self.duration)
+
+    @mainthread
+    def handle_media_parsed(self, media, filepath):
+        """Take the duration from a background parse and remember it."""
+        # Called on the main thread, after libVLC's callback has returned
+        self.release_parse_events(media)
+
+        duration_ms = media.get_duration()
+        if duration_ms <= 0:
+            return
+
+        duration = duration_ms / 1000.0
+        metadata_cache.put(filepath, duration)
+        if filepath == self.current_file:
+            self.duration = duration
+            print(f"Duration parsed: {self.duration:.3f} seconds")
+
+    @mainthread
+    def handle_playing(self, source):
+        """Finish a queued restart, or park a pre-armed next track at its start."""
+        if source is self.player:
+            if self.restart_pending:
+                self.complete_restart()
+        elif source is self.standby_player and self.next_state == 'preparing':
+            # Output and decoder are open now; hold the track at 0 until it is needed
+            self.standby_player.set_pause(1)
+            self.standby_player.set_time(0)
+            self.next_state = 'ready'
+
+    def load(self, filepath, title=""):
+        """Load an audio file; `title` is shown for it instead of the file name."""
         print(f"Loading file: {filepath}")
 
         if not os.path.exists(filepath):
             print(f"File not found: {filepath}")
             return False
 
-        if not self.vlc_instance or not self.player:
+        if not self.ensure_vlc():
             print("VLC not initialized")
             return False
 
@@ -97,6 +257,7 @@ class AudioPlayer(EventDispatcher):
         try:
             # Reset track finished flag when loading new track
             self._track_finished = False
+            self.state = 'loading'
 
             # Create a new media
             media = self.vlc_instance.media_new(filepath)
@@ -104,81 +265,76 @@ class AudioPlayer(EventDispatcher):
             # Set up the player
             self.player.set_media(media)
 
-            # Get media information
-            media.parse()
-
             # Set media properties
             self.current_file = filepath
+            self.current_title = title
 
-            # Get duration from media directly first - more reliable
-            duration_ms = media.get_duration()
-            if duration_ms <= 0:
-                # Fall back to player if media doesn't have duration
-                duration_ms = self.player.get_length()
-
-            # Set duration based on what we found
-            if duration_ms > 0:
-                self.duration = duration_ms / 1000.0
-                print(f"Duration detected: {self.duration:.3f} seconds")
+            # Metadata stored at import time is trusted, so known files skip parsing
+            info = metadata_cache.lookup(filepath)
+            if info and info.get('duration'):
+                self.duration = info['duration']
+                print(f"Using cached duration: {self.duration:.3f}s")
             else:
-                # If we have a database with the file, get duration from there
-                app = App.get_running_app()
-                if hasattr(app, 'database'):
-                    try:
-                        # Try to find the file in the database
-                        all_recordings = app.database.get_all_recordings()
-                        for rec in all_recordings:
-                            if rec[3] == filepath:  # filepath is at index 3
-                                self.duration = rec[4]  # duration is at index 4
-                                print(f"Using database duration: {self.duration:.3f}s")
-                                break
-                    except Exception as e:
-                        print(f"Error getting duration from database: {e}")
-
-                # If still no duration, use fallback
-                if self.duration <= 0:
-                    self.duration = 100
-                    print("Could not determine duration, using default (100s)")
+                # Show the database duration, if any, until libVLC reports the real one
+                self.duration = metadata_cache.lookup_duration(filepath) or 0
+                self.parse_in_background(media, filepath)
 
             # Reset position
             self.current_pos = 0
 
             # Set flag for compatibility
             self.sound = True
-
-            # Start position updates
-            if self.update_event:
-                self.update_event.cancel()
-            self.update_event = Clock.schedule_interval(self.update_position, 0.1)
+            self.state = 'idle'
 
             print(f"File loaded successfully. Duration: {self.duration}s")
             return True
         except Exception as e:
             print(f"Error loading audio file: {e}")
             self.sound = None
+            self.state = 'idle'
             return False
 
+    def parse_in_background(self, media, filepath):
+        """Have libVLC parse an unknown file without blocking the UI thread.
+
+        handle_media_parsed picks up the duration; if playback starts first,
+        handle_length_changed does.
+        """
+        try:
+            # Held until handle_media_parsed, so its ctypes callback outlives the parse
+            events = self.parse_events[media] = media.event_manager()
+            events.event_attach(vlc.EventType.MediaParsedChanged, self._vlc_media_parsed, media, filepath)
+            media.parse_with_options(vlc.MediaParseFlag.local, PARSE_TIMEOUT_MS)
+        except Exception as e:
+            print(f"Error parsing media: {e}")
+            self.release_parse_events(media)
+
+    def release_parse_events(self, media):
+        """Stop listening for a media's parse events and let its event manager go."""
+        events = self.parse_events.pop(media, None)
+        if events is not None:
+            try:
+                events.event_detach(vlc.EventType.MediaParsedChanged)
+            except Exception as e:
+                print(f"Error detaching parse events: {e}")
+
     def play(self):
         """Play or resume audio."""
         if not self.vlc_instance or not self.player:
             return
 
         try:
-            # Get current state
-            state = self.player.get_state()
-
-            # If track has ended, we need to completely reset it
-            if state == vlc.State.Ended:
+            if self.restart_pending:
+                # A restart is already on its way; just make sure it keeps playing
+                self.resume_after_restart = True
+            elif self.has_ended():
+                # If track has ended, we need to completely reset it
                 print("Track ended, restarting from beginning")
-                # Stop first to reset the player state
-                self.player.stop()
-                # Slight delay to ensure internal VLC state is reset
-                time.sleep(0.1)
-                # Then play will start from the beginning
-                self.player.play()
+                self.restart_track(resume=True)
             else:
                 # Normal play for non-ended tracks
                 self.player.play()
+                self.state = 'playing'
 
             # Update state
             self._track_finished = False
@@ -193,7 +349,13 @@ class AudioPlayer(EventDispatcher):
             return
 
         try:
-            self.player.pause()
+            if self.restart_pending:
+                # Let the queued restart settle into the paused state
+                self.resume_after_restart = False
+            else:
+                self.finish_crossfade()
+                self.player.pause()
+                self.state = 'paused'
             self.is_playing = False
             print("Paused playback")
         except Exception as e:
@@ -205,8 +367,12 @@ class AudioPlayer(EventDispatcher):
             return
 
         try:
+            self.cancel_restart()
+            self.finish_crossfade()
+            self.clear_next()
             self.player.stop()
             self.is_playing = False
+            self.state = 'idle'
             self.current_pos = 0
             # Reset finished state
             self._track_finished = False
@@ -226,24 +392,15 @@ class AudioPlayer(EventDispatcher):
             # Convert to milliseconds for VLC
             ms_position = int(position * 1000)
 
-            # Get current state
-            state = self.player.get_state()
-
-            # If the track has ended, we need to reset it completely
-            if state == vlc.State.Ended:
+            if self.restart_pending:
+                # Replace the target of the restart that is already queued
+                self.pending_seek_ms = ms_position
+                self.state = 'seeking'
+            elif self.has_ended():
+                # If the track has ended, it has to restart before it can seek;
+                # stay paused afterwards unless we were meant to be playing
                 print(f"Track ended, seeking to {position}s requires restart")
-                # Stop and reset
-                self.player.stop()
-                time.sleep(0.1)  # Short delay to ensure VLC state is reset
-                self.player.play()  # Start playback
-                time.sleep(0.1)  # Allow playback to start
-
-                # Then seek to the desired position
-                self.player.set_time(ms_position)
-
-                # If we're not actually wanting to play, pause immediately
-                if not self.is_playing:
-                    self.player.pause()
+                self.restart_track(seek_ms=ms_position, resume=self.is_playing)
             else:
                 # Normal seek
                 self.player.set_time(ms_position)
@@ -254,9 +411,196 @@ class AudioPlayer(EventDispatcher):
         except Exception as e:
             print(f"Error seeking: {e}")
 
+    def has_ended(self):
+        """Return True if the loaded track has played to its end."""
+        return self.state == 'ended' or self.player.get_state() == vlc.State.Ended
+
+    def restart_track(self, seek_ms=None, resume=True):
+        """Restart an ended track without blocking the UI thread.
+
+        libVLC needs a stop/play cycle after the end of a track. The seek and
+        pause that follow it are queued and completed by the MediaPlayerPlaying
+        event, with a short Clock poll as a fallback in case the event is missed.
+        """
+        self.restart_pending = True
+        self.pending_seek_ms = seek_ms
+        self.resume_after_restart = resume
+        self.state = 'seeking' if seek_ms is not None else 'loading'
+
+        self.player.stop()
+        self.player.play()
+
+        if self.restart_poll:
+            self.restart_poll.cancel()
+        self.restart_poll = Clock.schedule_interval(self.poll_restart, 0.05)
+
+    def poll_restart(self, dt):
+        """Clock fallback that completes the restart once libVLC is playing."""
+        if not self.restart_pending:
+            return False
+
+        state = self.player.get_state()
+        if state == vlc.State.Playing:
+            self.complete_restart()
+            return False
+        if state in (vlc.State.Stopped, vlc.State.Ended, vlc.State.Error):
+            # The play request was dropped while libVLC was still resetting
+            self.player.play()
+
+    def complete_restart(self):
+        """Apply the queued seek and pause after a restart."""
+        self.cancel_restart()
+
+        if self.pending_seek_ms is not None:
+            self.player.set_time(self.pending_seek_ms)
+            self.pending_seek_ms = None
+
+        if self.resume_after_restart:
+            self.state = 'playing'
+        else:
+            self.player.set_pause(1)
+            self.state = 'paused'
+
+    def cancel_restart(self):
+        """Drop the restart bookkeeping and its fallback poll."""
+        self.restart_pending = False
+        if self.restart_poll:
+            self.restart_poll.cancel()
+            self.restart_poll = None
+
+    def set_next(self, filepath, title=""):
+        """Queue the track that should play straight after the current one.
+
+        The next track is pre-armed on the standby player `gapless_lead`
+        seconds before the end and started without a gap when the current
+        one ends, or faded in over `crossfade` seconds. Pass None to clear.
+        """
+        if filepath == self.next_file:
+            # Recordings can share a stored file; keep the title current
+            self.next_title = title
+            return
+
+        self.clear_next()
+        self.next_file = filepath
+        self.next_title = title
+
+    def clear_next(self):
+        """Forget the queued next track and release the standby player."""
+        if self.next_state and self.standby_player:
+            self.standby_player.stop()
+
+        self.next_file = None
+        self.next_state = None
+
+    def configure_gapless(self, lead=None, crossfade=None):
+        """Set how early the next track is prepared and how long tracks crossfade."""
+        if lead is not None:
+            self.gapless_lead = max(0.0, float(lead))
+        if crossfade is not None:
+            self.crossfade = max(0.0, float(crossfade))
+
+    def check_gapless(self):
+        """Prepare or fade in the next track as the current one nears its end."""
+        if not self.next_file or not self.is_playing or self.fading_player or self.duration <= 0:
+            return
+
+        remaining = self.duration - self.current_pos
+
+        if self.next_state is None and remaining <= max(self.gapless_lead, self.crossfade + 1):
+            self.prepare_next()
+        elif self.next_state == 'ready' and self.crossfade > 0 and remaining <= self.crossfade:
+            self.switch_to_next(fade=True)
+
+    def prepare_next(self):
+        """Open the next track muted on the standby player.
+
+        handle_playing pauses it at the start as soon as libVLC reports it
+        playing, so the switch only has to unpause an already open stream.
+        """
+        try:
+            media = self.vlc_instance.media_new(self.next_file)
+            self.standby_player.set_media(media)
+            self.standby_player.audio_set_volume(0)
+            self.standby_player.play()
+            self.next_state = 'preparing'
+            print(f"Preparing next track: {self.next_file}")
+        except Exception as e:
+            print(f"Error preparing next track: {e}")
+            self.next_file = None
+            self.next_state = None
+
+    def switch_to_next(self, fade=False):
+        """Make the standby player the active one and start the next track."""
+        if self.next_state is None:
+            # Too late to pre-arm (e.g. a very short track): start it right away
+            self.prepare_next()
+            if self.next_state is None:
+                return
+
+        outgoing = self.player
+        filepath = self.next_file
+        title = self.next_title
+        self.player, self.standby_player = self.standby_player, outgoing
+        self.next_file = None
+        self.next_state = None
+
+        target_volume = int(self.volume * 100)
+        if fade:
+            # Both players run for the fade; update_crossfade ramps the volumes
+            self.player.audio_set_volume(0)
+            self.player.set_pause(0)
+            self.fading_player = outgoing
+            self.fade_started = Clock.get_boottime()
+            self.fade_event = Clock.schedule_interval(self.update_crossfade, 0.05)
+        else:
+            self.player.audio_set_volume(target_volume)
+            self.player.set_pause(0)
+            outgoing.stop()
+
+        self.current_file = filepath
+        self.current_title = title
+        self.current_pos = 0
+        length_ms = self.player.get_length()
+        if length_ms > 0:
+            self.duration = length_ms / 1000.0
+        else:
+            self.duration = metadata_cache.lookup_duration(filepath) or 0
+
+        self._track_finished = False
+        self.is_playing = True
+        self.state = 'playing'
+        print(f"Switched to next track without a gap: {filepath}")
+        self.dispatch('on_track_advanced', filepath)
+
+    def update_crossfade(self, dt):
+        """Ramp the incoming track up and the outgoing one down."""
+        progress = min(1.0, (Clock.get_boottime() - self.fade_started) / self.crossfade)
+        target_volume = int(self.volume * 100)
+
+        self.player.audio_set_volume(int(target_volume * progress))
+        if self.fading_player:
+            self.fading_player.audio_set_volume(int(target_volume * (1 - progress)))
+
+        if progress >= 1.0:
+            self.finish_crossfade()
+            return False
+
+    def finish_crossfade(self):
+        """Stop the outgoing track of a crossfade, if one is running."""
+        if self.fade_event:
+            self.fade_event.cancel()
+            self.fade_event = None
+
+        if self.fading_player:
+            self.fading_player.stop()
+            self.fading_player = None
+            self.player.audio_set_volume(int(self.volume * 100))
+
     def set_volume(self, volume):
         """Set playback volume (0.0 to 1.0)."""
         if not self.vlc_instance or not self.player:
+            # Applied when libVLC is created
+            self.volume = volume
             return
 
         try:
@@ -269,40 +613,39 @@ class AudioPlayer(EventDispatcher):
             print(f"Error setting volume: {e}")
 
     def update_position(self, dt):
-        """Update the current position property."""
-        if not self.vlc_instance or not self.player:
+        """Update the current position property.
+
+        End of track is detected by the MediaPlayerEndReached event; the
+        PlayerStatePublisher calls this once per tick while playing, only to
+        smooth the position between libVLC's time-changed events.
+        """
+        if not self.vlc_instance or not self.player or self.state != 'playing':
             return
 
-        try:
-            # Get current time in milliseconds and convert to seconds
-            time_ms = self.player.get_time()
-            if time_ms >= 0:
-                self.current_pos = time_ms / 1000.0
-
-            # Check if we've reached the end
-            state = self.player.get_state()
-
-            # Check for end state directly from VLC state
-            if state == vlc.State.Ended:
-                # Only dispatch event if we haven't already marked this track as finished
-                if not self._track_finished:
-                    print("Track finished")
-                    self.is_playing = False
-                    # Do NOT reset current_pos here, keep at the end so we know
-                    # self._track_finished = True
-                    self.dispatch('on_track_finished')
-                    # Mark track as finished, but don't reset position
-                    self._track_finished = True
-            elif state != vlc.State.Ended and self._track_finished:
-                # Reset finished state if track is no longer at the end
-                self._track_finished = False
-        except Exception as e:
-            print(f"Error updating position: {e}")
+        # Extrapolate from the last known position instead of asking libVLC;
+        # its next time-changed event corrects any drift
+        position, anchored_at = self.position_anchor
+        estimate = position + (Clock.get_boottime() - anchored_at)
+        if self.duration > 0:
+            estimate = min(estimate, self.duration)
+        self.current_pos = estimate
+
+    def on_current_pos(self, instance, value):
+        """Remember when the position was last set, for update_position."""
+        self.position_anchor = (value, Clock.get_boottime())
+
+    def on_is_playing(self, instance, value):
+        """Restart extrapolation from here when playback starts or stops."""
+        self.position_anchor = (self.current_pos, Clock.get_boottime())
 
     def on_track_finished(self, *args):
         """Event handler for track completion."""
         pass
 
+    def on_track_advanced(self, filepath):
+        """Event handler for a gapless switch to the queued next track."""
+        pass
+
 
 # Create singleton
 player = AudioPlayer()
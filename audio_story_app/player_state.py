@@ -0,0 +1,125 @@
+from collections import namedtuple
+from kivy.clock import Clock
+import os
+
+from animation_governor import governor
+
+
+# Tick interval while the app is hidden and audio plays: keeps the snapshot
+# (and a polled backend's position) roughly current for when it's shown again
+BACKGROUND_TICK_INTERVAL = 5.0
+
+# Immutable snapshot of the player, taken once per tick and shared by every subscriber
+PlayerState = namedtuple('PlayerState', ['loaded', 'file', 'title', 'position', 'duration', 'is_playing'])
+
+EMPTY_STATE = PlayerState(False, "", "", 0.0, 0.0, False)
+
+
+class PlayerStateSubscription:
+    """A subscriber's callback, rate and fields; returned by PlayerStatePublisher.subscribe."""
+
+    def __init__(self, publisher, callback, interval, fields):
+        self.publisher = publisher
+        self.callback = callback
+        self.interval = interval
+        self.fields = fields
+        self.last_state = None
+        self.next_due = 0
+
+    def deliver(self, state):
+        """Call back with the fields that changed since the last delivery, if any."""
+        if self.last_state is None:
+            changed = set(self.fields)
+        else:
+            changed = {field for field in self.fields
+                       if getattr(state, field) != getattr(self.last_state, field)}
+        self.last_state = state
+
+        if changed:
+            self.callback(state, changed)
+
+    def cancel(self):
+        """Stop receiving updates."""
+        self.publisher.unsubscribe(self)
+
+
+class PlayerStatePublisher:
+    """Samples the audio player once per tick and publishes PlayerState snapshots.
+
+    Widgets subscribe with their own interval instead of each running a
+    timer that polls the player. One governed timer runs at the fastest
+    interval anyone asked for; each tick that a subscriber is due, the
+    backend is queried once, and subscribers are called back only with
+    the fields that changed for them. While the app is hidden the tick
+    stops, or slows to BACKGROUND_TICK_INTERVAL if audio is playing.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self.subscriptions = []
+        self.state = EMPTY_STATE
+        self.timer = None
+        self.tick_interval = None
+
+    def subscribe(self, callback, interval, fields=PlayerState._fields):
+        """Call `callback(state, changed_fields)` at most every `interval` seconds.
+
+        The callback runs right away with the current state, then whenever
+        one of `fields` changes. Returns a subscription to cancel().
+        """
+        subscription = PlayerStateSubscription(self, callback, interval, tuple(fields))
+        self.subscriptions.append(subscription)
+        self.update_timer()
+
+        self.state = self.sample()
+        subscription.next_due = Clock.get_boottime() + interval
+        subscription.deliver(self.state)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription; the timer slows or stops to match who's left."""
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self.update_timer()
+
+    def update_timer(self):
+        """Run the tick at the fastest subscriber's interval, or not at all."""
+        interval = min((s.interval for s in self.subscriptions), default=None)
+        if interval == self.tick_interval:
+            return
+
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        if interval is not None:
+            self.timer = governor.schedule(self.tick, interval,
+                                           background_interval=max(interval, BACKGROUND_TICK_INTERVAL))
+        self.tick_interval = interval
+
+    def sample(self):
+        """Read the player into a new snapshot."""
+        player = self.player
+        if player.is_playing:
+            # The one backend query per tick; events keep it current otherwise
+            player.update_position(0)
+
+        filepath = player.current_file
+        # Stored files are named by content hash, so the title comes from the recording
+        title = getattr(player, 'current_title', "")
+        if not title and filepath:
+            title = self.state.title if filepath == self.state.file else os.path.basename(filepath)
+        return PlayerState(bool(player.sound), filepath, title,
+                           player.current_pos, player.duration, player.is_playing)
+
+    def tick(self, dt):
+        """Sample once and notify the subscribers that are due."""
+        now = Clock.get_boottime()
+        # Half a tick of slack, so a 0.5 s subscriber on a 0.1 s tick isn't skipped by jitter
+        due = [s for s in self.subscriptions if now >= s.next_due - self.tick_interval / 2]
+        if not due:
+            return
+
+        self.state = self.sample()
+        for subscription in due:
+            subscription.next_due = now + subscription.interval
+            subscription.deliver(self.state)
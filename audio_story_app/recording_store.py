@@ -0,0 +1,110 @@
+import hashlib
+import os
+import shutil
+import uuid
+
+from file_copy import copy_file, hash_file
+
+
+# Bytes of BLAKE2b digest used to name blobs (40 hex characters)
+DIGEST_SIZE = 20
+
+
+class RecordingStore:
+    """Content-addressed storage for imported audio files.
+
+    Each distinct file is stored once, named after the BLAKE2b hash of its
+    bytes and sharded by hash prefix: root/ab/cd/abcd....mp3. The source is
+    hashed before it is copied, so a duplicate is never copied at all, and a
+    new file can be linked or cloned by copy_file instead of passing through
+    Python. Which recordings use a blob is tracked by the database's blobs
+    table; see Database.delete_recording.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.staging_dir = os.path.join(root, '.staging')
+
+        # Anything left in staging is from an import that never finished
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    def shard_dir(self, content_hash):
+        """Directory holding the blob for a hash."""
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4])
+
+    def find_blob(self, content_hash):
+        """Path of the stored blob for a hash, or None if it isn't stored."""
+        shard = self.shard_dir(content_hash)
+        try:
+            for name in os.listdir(shard):
+                if name.startswith(content_hash + '.') or name == content_hash:
+                    return os.path.join(shard, name)
+        except FileNotFoundError:
+            pass
+        return None
+
+    def ingest(self, source, progress=None):
+        """Copy a file into the store, reusing an identical blob if there is one.
+
+        Hashing and copying each make up half of the `progress(done, total)`
+        reports. The source is assumed not to change while it's imported.
+        Safe to call from worker threads. Returns (path, content_hash, reused).
+        """
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        hash_file(source, hasher, progress and (lambda hashed, total: progress(hashed, total * 2)))
+        content_hash = hasher.hexdigest()
+
+        existing = self.find_blob(content_hash)
+        if existing:
+            if progress:
+                progress(1, 1)
+            return existing, content_hash, True
+
+        staging_path = os.path.join(self.staging_dir, uuid.uuid4().hex)
+        try:
+            # No hasher, so copy_file is free to link, clone or copy in the kernel
+            copy_file(source, staging_path,
+                      progress and (lambda copied, total: progress(total + copied, total * 2)))
+
+            ext = os.path.splitext(source)[1].lower()
+            os.makedirs(self.shard_dir(content_hash), exist_ok=True)
+            path = os.path.join(self.shard_dir(content_hash), content_hash + ext)
+            os.replace(staging_path, path)
+            return path, content_hash, False
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+    def remove_blob(self, path):
+        """Delete a blob file that is no longer referenced, pruning empty shards."""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+
+            # Drop the two shard levels if this was their last file
+            shard = os.path.dirname(path)
+            for _ in range(2):
+                if os.path.abspath(shard) == os.path.abspath(self.root) or os.listdir(shard):
+                    break
+                os.rmdir(shard)
+                shard = os.path.dirname(shard)
+        except Exception as e:
+            print(f"Error deleting file: {e}")
+
+    def iter_files(self):
+        """Yield the path of every stored file, including pre-store recordings."""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d != '.staging']
+            for filename in filenames:
+                yield os.path.join(dirpath, filename)
+
+    def clear(self):
+        """Delete every stored file."""
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+        os.makedirs(self.staging_dir, exist_ok=True)
@@ -1,14 +1,15 @@
 from kivy.uix.screenmanager import Screen
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
 from kivy.app import App
 from kivy.core.window import Window
+from kivy.properties import NumericProperty, StringProperty, BooleanProperty
 from datetime import datetime
-import os
 import theme
 
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.card import MDCard
-from kivymd.uix.list import MDList
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.button import MDFlatButton, MDRaisedButton, MDIconButton
 from kivymd.uix.label import MDLabel
@@ -16,14 +17,173 @@ from kivymd.uix.textfield import MDTextField
 from kivymd.uix.scrollview import MDScrollView
 
 
+def get_file_list_screen():
+    """Return the file list screen that owns the recording rows."""
+    app = App.get_running_app()
+    return app.root_layout.get_screen('file_list')
+
+
+class RecordingRow(MDCard):
+    """Recycled list row for a recording.
+
+    The RecycleView reuses a small pool of these and only rebinds the
+    properties below from plain data dicts as rows scroll into view.
+    """
+
+    recording_id = NumericProperty(0)
+    title = StringProperty("")
+    duration_text = StringProperty("")
+    description_text = StringProperty("")
+    date_text = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super(RecordingRow, self).__init__(**kwargs)
+        self.orientation = "vertical"
+        self.size_hint_y = None
+        self.height = dp(130)
+        self.padding = dp(16)
+        self.spacing = dp(8)
+        self.radius = dp(10)
+        self.elevation = 1
+        self.ripple_behavior = True
+        self.md_bg_color = theme.CARD_COLOR
+
+        # Title and duration row
+        header_row = MDBoxLayout(
+            size_hint_y=None,
+            height=dp(30)
+        )
+
+        self.title_label = MDLabel(
+            font_style="H6",
+            theme_text_color="Custom",
+            text_color=theme.TEXT_COLOR,
+            size_hint_x=0.8
+        )
+        header_row.add_widget(self.title_label)
+
+        self.duration_label = MDLabel(
+            theme_text_color="Custom",
+            text_color=theme.SECONDARY_TEXT_COLOR,
+            size_hint_x=0.2,
+            halign="right"
+        )
+        header_row.add_widget(self.duration_label)
+
+        self.add_widget(header_row)
+
+        self.desc_label = MDLabel(
+            theme_text_color="Custom",
+            text_color=theme.SECONDARY_TEXT_COLOR,
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        self.add_widget(self.desc_label)
+
+        self.date_label = MDLabel(
+            theme_text_color="Custom",
+            text_color=theme.SECONDARY_TEXT_COLOR,
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(20)
+        )
+        self.add_widget(self.date_label)
+
+        # Action buttons
+        buttons_row = MDBoxLayout(
+            size_hint_y=None,
+            height=dp(40),
+            spacing=dp(12)  # Increased spacing
+        )
+
+        play_btn = MDIconButton(
+            icon="play",
+            theme_text_color="Custom",
+            text_color=theme.FLAX,  # Use gold color from theme
+            icon_size=dp(24),
+            on_release=lambda x: get_file_list_screen().play_recording(self.recording_id)
+        )
+        buttons_row.add_widget(play_btn)
+
+        add_to_playlist_btn = MDIconButton(
+            icon="playlist-plus",
+            theme_text_color="Custom",
+            text_color=theme.SUCCESS_COLOR,
+            icon_size=dp(24),
+            on_release=lambda x: get_file_list_screen().show_playlist_options(self.recording_id)
+        )
+        buttons_row.add_widget(add_to_playlist_btn)
+
+        delete_btn = MDIconButton(
+            icon="delete",
+            theme_text_color="Custom",
+            text_color=theme.ERROR_COLOR,
+            icon_size=dp(24),
+            on_release=lambda x: get_file_list_screen().confirm_delete(self.recording_id)
+        )
+        buttons_row.add_widget(delete_btn)
+
+        self.add_widget(buttons_row)
+
+        # Keep the labels in sync with the recycled data
+        self.bind(
+            title=self.title_label.setter('text'),
+            duration_text=self.duration_label.setter('text'),
+            description_text=self.desc_label.setter('text'),
+            date_text=self.date_label.setter('text')
+        )
+
+    def on_release(self, *args):
+        """Make the whole card clickable to play the recording."""
+        get_file_list_screen().play_recording(self.recording_id)
+
+
+class StatusRow(MDCard):
+    """List row used for the empty and error messages."""
+
+    text = StringProperty("")
+    is_error = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super(StatusRow, self).__init__(**kwargs)
+        self.orientation = "vertical"
+        self.size_hint_y = None
+        self.height = dp(100)
+        self.radius = dp(10)
+        self.elevation = 1
+        self.padding = dp(16)
+        self.md_bg_color = theme.CARD_COLOR
+
+        self.label = MDLabel(
+            halign="center",
+            theme_text_color="Custom",
+            text_color=theme.TEXT_COLOR
+        )
+        self.add_widget(self.label)
+
+        self.bind(text=self.label.setter('text'))
+
+    def on_is_error(self, instance, value):
+        """Use the error color for error messages."""
+        self.label.text_color = theme.ERROR_COLOR if value else theme.TEXT_COLOR
+
+
 class FileListScreen(Screen):
     """Screen for displaying and managing all audio recordings."""
 
+    PAGE_SIZE = 30  # Recordings fetched per page while scrolling
+    LOAD_MORE_THRESHOLD = 0.1  # Fetch the next page when this close to the bottom
+
     def __init__(self, **kwargs):
         super(FileListScreen, self).__init__(**kwargs)
-        self.recordings_list = None
+        self.recordings_view = None
+        self.recordings_layout = None
         self.search_input = None
         self.dialog = None
+        self.next_page_cursor = None
+        self.load_request = None  # Background query for the list currently loading
+        self.page_request = None  # Background query for the next page
 
         # Bind to window resize to ensure proper layout
         Window.bind(on_resize=self.on_window_resize)
@@ -35,8 +195,11 @@ class FileListScreen(Screen):
             self.main_scroll.size = (width, height)
 
     def on_enter(self):
-        """Build the UI when the screen is entered."""
-        self.build_ui()
+        """Build the UI once, then refresh the recordings on every visit."""
+        if not self.recordings_view:
+            self.build_ui()
+        else:
+            self.search_recordings()
 
     def build_ui(self):
         """Build the UI for the file list screen."""
@@ -124,21 +287,29 @@ class FileListScreen(Screen):
         )
         list_card.md_bg_color = theme.SURFACE_COLOR
 
-        # Create scrollable list for recordings
-        recordings_scroll = MDScrollView(
+        # Virtualized list: only the visible rows exist as widgets. Each data
+        # item names its row class, so status messages get a StatusRow
+        self.recordings_view = RecycleView(
             do_scroll_x=False,
-            do_scroll_y=True
+            do_scroll_y=True,
+            viewclass=RecordingRow,
+            key_viewclass='viewclass'
         )
+        # Load more recordings as the user nears the bottom of the list
+        self.recordings_view.bind(scroll_y=self.on_recordings_scroll)
 
-        self.recordings_list = MDList(
+        self.recordings_layout = RecycleBoxLayout(
+            orientation='vertical',
             spacing=dp(8),
             padding=[dp(4), dp(4)],
+            default_size=(None, dp(130)),
+            default_size_hint=(1, None),
             size_hint_y=None
         )
-        self.recordings_list.bind(minimum_height=self.recordings_list.setter('height'))
+        self.recordings_layout.bind(minimum_height=self.recordings_layout.setter('height'))
 
-        recordings_scroll.add_widget(self.recordings_list)
-        list_card.add_widget(recordings_scroll)
+        self.recordings_view.add_widget(self.recordings_layout)
+        list_card.add_widget(self.recordings_view)
 
         main_layout.add_widget(list_card)
 
@@ -190,186 +361,145 @@ class FileListScreen(Screen):
             self.search_input.focus = True
 
     def load_recordings(self, search_term=None):
-        """Load recordings from the database and display them."""
+        """Load recordings from the database and display them.
+
+        Without a search term only the first page is loaded; further pages
+        are fetched by load_next_page as the list is scrolled. The query
+        runs in the background while a placeholder row is shown.
+        """
         app = App.get_running_app()
+        self.next_page_cursor = None
+        self.page_request = None
 
-        # Clear existing recordings list
-        self.recordings_list.clear_widgets()
+        self.show_status_row("Loading recordings...")
 
-        try:
-            # Get recordings based on search term or get all
-            if search_term:
-                recordings = app.database.search_recordings(search_term)
-            else:
-                recordings = app.database.get_all_recordings()
-
-            if not recordings:
-                empty_card = MDCard(
-                    orientation="vertical",
-                    size_hint_y=None,
-                    height=dp(100),
-                    radius=dp(10),
-                    elevation=1,
-                    padding=dp(16)
-                )
-                empty_card.md_bg_color = theme.CARD_COLOR
-
-                empty_label = MDLabel(
-                    text="No recordings found" if search_term else "No recordings yet. Import some!",
-                    halign="center",
-                    theme_text_color="Custom",
-                    text_color=theme.TEXT_COLOR
-                )
-                empty_card.add_widget(empty_label)
-
-                self.recordings_list.add_widget(empty_card)
-                return
-
-            # Add each recording to the list
-            for recording in recordings:
-                recording_id, title, description, filepath, duration, date_created, cover_art = recording
-
-                # Format duration as MM:SS
-                duration_text = "??:??"
-                if duration:
-                    minutes = int(duration) // 60
-                    seconds = int(duration) % 60
-                    duration_text = f"{minutes:02d}:{seconds:02d}"
-
-                # Create a custom list item for each recording
-                recording_card = MDCard(
-                    orientation="vertical",
-                    size_hint_y=None,
-                    height=dp(130),  # Increased height
-                    padding=dp(16),
-                    spacing=dp(8),
-                    radius=dp(10),
-                    elevation=1,
-                    ripple_behavior=True
-                )
-                recording_card.md_bg_color = theme.CARD_COLOR
-
-                # Title and duration row
-                header_row = MDBoxLayout(
-                    size_hint_y=None,
-                    height=dp(30)
-                )
-
-                title_label = MDLabel(
-                    text=title if title else "Untitled",
-                    font_style="H6",
-                    theme_text_color="Custom",
-                    text_color=theme.TEXT_COLOR,
-                    size_hint_x=0.8
-                )
-                header_row.add_widget(title_label)
+        # Get recordings based on search term or get the first page
+        if search_term:
+            request = app.async_database.call(
+                'search_recordings', search_term,
+                callback=lambda recordings: self.on_recordings_loaded(request, recordings, None, search_term),
+                error_callback=lambda e: self.on_recordings_failed(request, e))
+        else:
+            request = app.async_database.call(
+                'get_recordings_page', self.PAGE_SIZE,
+                callback=lambda page: self.on_recordings_loaded(request, page[0], page[1], search_term),
+                error_callback=lambda e: self.on_recordings_failed(request, e))
+        self.load_request = request
+
+    def on_recordings_loaded(self, request, recordings, next_cursor, search_term):
+        """Show the result of load_recordings, unless a newer load replaced it."""
+        if request is not self.load_request:
+            return
+        self.load_request = None
+        self.next_page_cursor = next_cursor
 
-                duration_label = MDLabel(
-                    text=duration_text,
-                    theme_text_color="Custom",
-                    text_color=theme.SECONDARY_TEXT_COLOR,
-                    size_hint_x=0.2,
-                    halign="right"
-                )
-                header_row.add_widget(duration_label)
-
-                recording_card.add_widget(header_row)
-
-                # Description if available
-                if description:
-                    desc_label = MDLabel(
-                        text=description[:50] + ("..." if len(description) > 50 else ""),
-                        theme_text_color="Custom",
-                        text_color=theme.SECONDARY_TEXT_COLOR,
-                        font_style="Caption",
-                        size_hint_y=None,
-                        height=dp(20)
-                    )
-                    recording_card.add_widget(desc_label)
-
-                # Format date nicely
-                date_text = "Unknown date"
-                try:
-                    if date_created:
-                        dt = datetime.fromisoformat(date_created)
-                        date_text = dt.strftime("%b %d, %Y %H:%M")
-                except Exception as e:
-                    print(f"Error formatting date: {e}")
-
-                date_label = MDLabel(
-                    text=date_text,
-                    theme_text_color="Custom",
-                    text_color=theme.SECONDARY_TEXT_COLOR,
-                    font_style="Caption",
-                    size_hint_y=None,
-                    height=dp(20)
-                )
-                recording_card.add_widget(date_label)
-
-                # Action buttons
-                buttons_row = MDBoxLayout(
-                    size_hint_y=None,
-                    height=dp(40),
-                    spacing=dp(12)  # Increased spacing
-                )
-
-                play_btn = MDIconButton(
-                    icon="play",
-                    theme_text_color="Custom",
-                    text_color=theme.FLAX,  # Use gold color from theme
-                    icon_size=dp(24),
-                    on_release=lambda x, rec_id=recording_id: self.play_recording(rec_id)
-                )
-                buttons_row.add_widget(play_btn)
-
-                add_to_playlist_btn = MDIconButton(
-                    icon="playlist-plus",
-                    theme_text_color="Custom",
-                    text_color=theme.SUCCESS_COLOR,
-                    icon_size=dp(24),
-                    on_release=lambda x, rec_id=recording_id: self.show_playlist_options(rec_id)
-                )
-                buttons_row.add_widget(add_to_playlist_btn)
-
-                delete_btn = MDIconButton(
-                    icon="delete",
-                    theme_text_color="Custom",
-                    text_color=theme.ERROR_COLOR,
-                    icon_size=dp(24),
-                    on_release=lambda x, rec_id=recording_id: self.confirm_delete(rec_id)
-                )
-                buttons_row.add_widget(delete_btn)
+        if not recordings:
+            self.show_status_row("No recordings found" if search_term else "No recordings yet. Import some!")
+            return
 
-                recording_card.add_widget(buttons_row)
+        self.recordings_view.data = [self.recording_to_data(recording) for recording in recordings]
+        self.recordings_view.scroll_y = 1
 
-                # Make the whole card clickable to play the recording
-                recording_card.rec_id = recording_id
-                recording_card.bind(on_release=lambda x: self.play_recording(x.rec_id))
+    def on_recordings_failed(self, request, error):
+        """Show a load_recordings error, unless a newer load replaced it."""
+        if request is not self.load_request:
+            return
+        self.load_request = None
 
-                # Add the card to the list
-                self.recordings_list.add_widget(recording_card)
+        self.show_status_row(f"Error loading recordings: {str(error)}", is_error=True)
+        print(f"Exception in load_recordings: {error}")
 
+    def load_next_page(self):
+        """Append the next page of recordings to the list, if there is one."""
+        if self.next_page_cursor is None or self.page_request is not None:
+            return
+
+        app = App.get_running_app()
+        request = app.async_database.call(
+            'get_recordings_page', self.PAGE_SIZE, after=self.next_page_cursor,
+            callback=lambda page: self.on_next_page_loaded(request, page),
+            error_callback=lambda e: self.on_next_page_failed(request, e))
+        self.page_request = request
+
+    def on_next_page_loaded(self, request, page):
+        """Append a page fetched by load_next_page."""
+        if request is not self.page_request:
+            return
+        self.page_request = None
+
+        recordings, self.next_page_cursor = page
+        if recordings:
+            self.keep_scroll_offset()
+            self.recordings_view.data.extend(self.recording_to_data(recording) for recording in recordings)
+
+    def on_next_page_failed(self, request, error):
+        """Stop paging after an error in load_next_page."""
+        if request is not self.page_request:
+            return
+        self.page_request = None
+        self.next_page_cursor = None
+        print(f"Error loading more recordings: {error}")
+
+    def on_recordings_scroll(self, instance, scroll_y):
+        """Fetch the next page when the list is scrolled near the bottom."""
+        if scroll_y <= self.LOAD_MORE_THRESHOLD:
+            self.load_next_page()
+
+    def keep_scroll_offset(self):
+        """Keep the visible rows in place when the list grows below them."""
+        view = self.recordings_view
+        layout = self.recordings_layout
+        offset_from_top = (1 - view.scroll_y) * max(layout.height - view.height, 0)
+
+        def restore(instance, height):
+            layout.unbind(height=restore)
+            scrollable = height - view.height
+            if scrollable > 0:
+                view.scroll_y = max(0, 1 - offset_from_top / scrollable)
+
+        layout.bind(height=restore)
+
+    def show_status_row(self, text, is_error=False):
+        """Replace the list contents with a single message row."""
+        self.recordings_view.data = [{
+            'viewclass': 'StatusRow',
+            'text': text,
+            'is_error': is_error,
+            'height': dp(100)
+        }]
+
+    def recording_to_data(self, recording):
+        """Convert a recording row into the data dict for a RecordingRow."""
+        recording_id, title, description, filepath, duration, date_created, cover_art = recording
+
+        # Format duration as MM:SS
+        duration_text = "??:??"
+        if duration:
+            minutes = int(duration) // 60
+            seconds = int(duration) % 60
+            duration_text = f"{minutes:02d}:{seconds:02d}"
+
+        # Format date nicely
+        date_text = "Unknown date"
+        try:
+            if date_created:
+                dt = datetime.fromisoformat(date_created)
+                date_text = dt.strftime("%b %d, %Y %H:%M")
         except Exception as e:
-            error_card = MDCard(
-                orientation="vertical",
-                size_hint_y=None,
-                height=dp(100),
-                radius=dp(10),
-                elevation=1,
-                padding=dp(16)
-            )
-            error_card.md_bg_color = theme.CARD_COLOR
+            print(f"Error formatting date: {e}")
 
-            error_label = MDLabel(
-                text=f"Error loading recordings: {str(e)}",
-                theme_text_color="Custom",
-                text_color=theme.ERROR_COLOR,
-                halign="center"
-            )
-            error_card.add_widget(error_label)
+        description_text = ""
+        if description:
+            description_text = description[:50] + ("..." if len(description) > 50 else "")
 
-            self.recordings_list.add_widget(error_card)
-            print(f"Exception in load_recordings: {e}")
+        return {
+            'viewclass': 'RecordingRow',
+            'recording_id': recording_id,
+            'title': title if title else "Untitled",
+            'duration_text': duration_text,
+            'description_text': description_text,
+            'date_text': date_text
+        }
 
     def search_recordings(self, instance=None):
         """Search recordings based on text input."""
@@ -383,7 +513,7 @@ class FileListScreen(Screen):
 
         if recording:
             # Load the recording into the player
-            if app.player.load(recording[3]):  # filepath is at index 3
+            if app.player.load(recording[3], title=recording[1]):  # filepath is at index 3
                 # Switch to the playback screen
                 app.root_layout.current = 'playback'
                 # Access the playback screen and update it with current recording info
@@ -391,13 +521,15 @@ class FileListScreen(Screen):
 
                 # Set the source screen to 'file_list' so back button works properly
                 playback_screen.source_screen = 'file_list'
+                app.queue.load([recording])
 
                 playback_screen.update_playback_info(recording)
                 # Start playback
                 app.player.play()
             else:
                 print(f"Failed to load recording: {recording[1]}")
-                self.show_error(f"Failed to load audio file: {os.path.basename(recording[3])}")
+                # Stored files are named by content hash, so show the recording's title
+                self.show_error(f"Failed to load audio file: {recording[1]}")
         else:
             print(f"Recording not found: ID {recording_id}")
             self.show_error("Recording not found")
@@ -582,24 +714,21 @@ class FileListScreen(Screen):
         recording = app.database.get_recording(recording_id)
 
         if recording:
-            # Get filepath before deleting from database
-            filepath = recording[3]
-
-            # Delete from database
-            app.database.delete_recording(recording_id)
+            # Delete from database; the file goes only once no recording uses it
+            unused_path = app.database.delete_recording(recording_id)
 
-            # Delete physical file if it exists
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except Exception as e:
-                print(f"Error deleting file: {e}")
+            if unused_path:
+                app.recording_store.remove_blob(unused_path)
 
         if self.dialog:
             self.dialog.dismiss()
 
-        # Reload the recordings list
-        self.load_recordings()
+        # Drop the row from the list without reloading it
+        remaining = [row for row in self.recordings_view.data if row.get('recording_id') != recording_id]
+        if remaining:
+            self.recordings_view.data = remaining
+        else:
+            self.load_recordings()
 
     def go_back(self, instance):
         """Navigate back to the home screen."""
@@ -393,8 +393,8 @@ class HomeScreen(Screen):
         """Get the most recently added recordings."""
         if database:
             try:
-                all_recordings = database.get_all_recordings()
-                return all_recordings[:limit] if all_recordings else []
+                recordings, _ = database.get_recordings_page(limit)
+                return recordings
             except Exception as e:
                 print(f"Error fetching recordings: {e}")
         return []
@@ -417,7 +417,7 @@ class HomeScreen(Screen):
             recording = app.database.get_recording(recording_id)
 
             if recording and app.player:
-                if app.player.load(recording[3]):  # filepath at index 3
+                if app.player.load(recording[3], title=recording[1]):  # filepath at index 3
                     # Navigate to playback screen
                     app.root_layout.current = 'playback'
 
@@ -425,6 +425,7 @@ class HomeScreen(Screen):
                     playback_screen = app.root_layout.get_screen('playback')
                     if playback_screen:
                         playback_screen.source_screen = 'home'
+                        app.queue.load([recording])
                         playback_screen.update_playback_info(recording)
 
                         # Start playback with slight delay
@@ -3,8 +3,8 @@ from kivy.metrics import dp
 from kivy.app import App
 from kivy.clock import Clock
 import os
-import shutil
 import theme
+from import_jobs import ImportJob, make_import_items
 
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDRaisedButton, MDFlatButton
@@ -13,6 +13,7 @@ from kivymd.uix.filemanager import MDFileManager
 from kivymd.uix.label import MDLabel
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.card import MDCard
+from kivymd.uix.progressbar import MDProgressBar
 from kivymd.toast import toast
 
 
@@ -26,6 +27,10 @@ class ImportScreen(Screen):
         self.dialog = None
         self.title_input = None
         self.desc_input = None
+        self.folder_manager = None
+        self.multi_manager = None
+        self.import_job = None
+        self.current_job_file = None
 
         # Build UI during initialization
         self.build_ui()
@@ -84,7 +89,7 @@ class ImportScreen(Screen):
         instruction_card.md_bg_color = theme.SURFACE_COLOR
 
         instructions = MDLabel(
-            text="Select an audio file to import.\nSupported formats: MP3, WAV, OGG",
+            text="Select an audio file, several files or a whole folder to import.\nSupported formats: MP3, WAV, OGG, M4A",
             theme_text_color="Custom",
             text_color=theme.TEXT_COLOR,
             halign="center"
@@ -167,18 +172,94 @@ class ImportScreen(Screen):
         )
         main_layout.add_widget(import_btn)
 
+        # Bulk import buttons
+        bulk_box = MDBoxLayout(
+            size_hint_y=None,
+            height=dp(48),
+            spacing=dp(16),
+            size_hint_x=0.8,
+            pos_hint={"center_x": 0.5}
+        )
+        bulk_box.add_widget(MDRaisedButton(
+            text="Import Files",
+            on_release=self.show_multi_manager,
+            md_bg_color=theme.PRIMARY_COLOR,
+            text_color=theme.TEXT_COLOR,
+            size_hint_x=0.5
+        ))
+        bulk_box.add_widget(MDRaisedButton(
+            text="Import Folder",
+            on_release=self.show_folder_manager,
+            md_bg_color=theme.PRIMARY_COLOR,
+            text_color=theme.TEXT_COLOR,
+            size_hint_x=0.5
+        ))
+        main_layout.add_widget(bulk_box)
+
+        # Progress card, shown while an import job runs
+        self.progress_card = MDCard(
+            orientation="vertical",
+            size_hint_y=None,
+            height=dp(110),
+            padding=dp(16),
+            spacing=dp(8),
+            radius=dp(10),
+            elevation=2,
+            opacity=0,
+            disabled=True
+        )
+        self.progress_card.md_bg_color = theme.SURFACE_COLOR
+
+        self.progress_label = MDLabel(
+            text="",
+            theme_text_color="Custom",
+            text_color=theme.TEXT_COLOR,
+            halign="center",
+            shorten=True
+        )
+        self.progress_card.add_widget(self.progress_label)
+
+        self.progress_bar = MDProgressBar(
+            max=100,
+            value=0,
+            color=theme.ACCENT_COLOR
+        )
+        self.progress_card.add_widget(self.progress_bar)
+
+        self.cancel_btn = MDFlatButton(
+            text="CANCEL",
+            theme_text_color="Custom",
+            text_color=theme.ERROR_COLOR,
+            pos_hint={"center_x": 0.5},
+            on_release=self.cancel_import
+        )
+        self.progress_card.add_widget(self.cancel_btn)
+
+        main_layout.add_widget(self.progress_card)
+
         # Add a spacer at the bottom
         main_layout.add_widget(MDBoxLayout(size_hint_y=0.1))
 
         self.add_widget(main_layout)
 
-        # Initialize the file manager
+        # Initialize the file managers
         self.file_manager = MDFileManager(
             exit_manager=self.exit_file_manager,
             select_path=self.select_path,
             preview=True,
             ext=['.mp3', '.wav', '.ogg', '.m4a']
         )
+        self.multi_manager = MDFileManager(
+            exit_manager=self.exit_file_manager,
+            select_path=self.select_paths,
+            selector='multi',
+            ext=['.mp3', '.wav', '.ogg', '.m4a']
+        )
+        self.folder_manager = MDFileManager(
+            exit_manager=self.exit_file_manager,
+            select_path=self.select_paths,
+            selector='folder'
+        )
 
     def show_file_manager(self, instance):
         """Show the file manager to select an audio file."""
@@ -190,9 +271,41 @@ class ImportScreen(Screen):
             print(f"Error showing file manager: {e}")
             self.show_error(f"Error opening file browser: {str(e)}")
 
+    def show_multi_manager(self, instance):
+        """Show a file manager for picking several audio files."""
+        try:
+            self.multi_manager.show(self.get_default_path())
+        except Exception as e:
+            print(f"Error showing file manager: {e}")
+            self.show_error(f"Error opening file browser: {str(e)}")
+
+    def show_folder_manager(self, instance):
+        """Show a file manager for picking a folder to import."""
+        try:
+            self.folder_manager.show(self.get_default_path())
+        except Exception as e:
+            print(f"Error showing file manager: {e}")
+            self.show_error(f"Error opening file browser: {str(e)}")
+
     def exit_file_manager(self, *args):
-        """Close the file manager."""
-        self.file_manager.close()
+        """Close whichever file manager is open."""
+        for manager in (self.file_manager, self.multi_manager, self.folder_manager):
+            if manager and manager._window_manager_open:
+                manager.close()
+
+    def select_paths(self, paths):
+        """Import the files, or every audio file in the folders, that were picked."""
+        self.exit_file_manager()
+
+        if isinstance(paths, str):
+            paths = [paths]
+
+        items = make_import_items(paths)
+        if not items:
+            self.show_error("No audio files found in the selection.")
+            return
+
+        self.start_import(items)
 
     def select_path(self, path):
         """Handle file selection from the file manager."""
@@ -239,69 +352,89 @@ class ImportScreen(Screen):
 
         description = self.desc_input.text.strip()
 
-        # Get file info
-        try:
-            # Try to get duration from a sound
-            from kivy.core.audio import SoundLoader
-            sound = SoundLoader.load(self.selected_file)
-            duration = sound.length if sound else 0
-            if sound:
-                sound.unload()
-
-            # If we couldn't get duration, use a placeholder
-            if not duration or duration <= 0:
-                print("Could not detect audio duration, using placeholder")
-                duration = 0  # Database will handle this
-
-            # Copy the file to the app's data directory
-            app = App.get_running_app()
-
-            # Make sure the destination directory exists
-            dest_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'recordings')
-            try:
-                os.makedirs(dest_dir, exist_ok=True)
-            except Exception as e:
-                print(f"Error creating recordings directory: {e}")
-                # Try an alternative path
-                dest_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recordings')
-                os.makedirs(dest_dir, exist_ok=True)
+        self.start_import([{
+            'source': self.selected_file,
+            'title': title,
+            'description': description
+        }])
 
-            filename = os.path.basename(self.selected_file)
-            dest_path = os.path.join(dest_dir, filename)
-
-            # If file with same name exists, append a number
-            base, ext = os.path.splitext(filename)
-            counter = 1
-            while os.path.exists(dest_path):
-                dest_path = os.path.join(dest_dir, f"{base}_{counter}{ext}")
-                counter += 1
-
-            # Copy the file
-            print(f"Copying file from {self.selected_file} to {dest_path}")
-            with open(self.selected_file, 'rb') as src_file:
-                with open(dest_path, 'wb') as dest_file:
-                    dest_file.write(src_file.read())
-
-            # Add to database
-            app.database.add_recording(
-                title=title,
-                description=description,
-                filepath=dest_path,
-                duration=duration
-            )
-
-            # Show success message
-            self.show_success(f"Successfully imported '{title}'")
-
-            # Clear inputs for next import
-            self.title_input.text = ""
-            self.desc_input.text = ""
-            self.selected_file = None
-            self.selected_file_label.text = "No file selected"
+        # Clear inputs for next import
+        self.title_input.text = ""
+        self.desc_input.text = ""
+        self.selected_file = None
+        self.selected_file_label.text = "No file selected"
+
+    def start_import(self, items):
+        """Start a background import job for a list of import items."""
+        if self.import_job and self.import_job.running:
+            self.show_error("An import is already in progress.")
+            return
 
+        app = App.get_running_app()
+        try:
+            self.import_job = ImportJob(app.database, items, app.recording_store)
         except Exception as e:
             self.show_error(f"Error importing file: {str(e)}")
             print(f"Error importing file: {e}")
+            return
+
+        self.import_job.bind(
+            on_file_progress=self.on_import_file_progress,
+            on_progress=self.on_import_progress,
+            on_complete=self.on_import_complete
+        )
+
+        self.current_job_file = None
+        self.progress_bar.value = 0
+        self.progress_label.text = f"Importing {len(items)} file(s)..."
+        self.progress_card.opacity = 1
+        self.progress_card.disabled = False
+        self.cancel_btn.disabled = False
+
+        print(f"Starting import of {len(items)} file(s)")
+        self.import_job.start()
+
+    def on_import_file_progress(self, job, index, source, fraction):
+        """Show which file is being copied and how far along it is."""
+        self.current_job_file = os.path.basename(source)
+        finished = job.finished
+        self.progress_label.text = (f"{finished} of {len(job.items)} done - "
+                                    f"{self.current_job_file} ({int(fraction * 100)}%)")
+
+    def on_import_progress(self, job, finished, total):
+        """Update the overall progress bar."""
+        self.progress_bar.value = 100 * finished / total if total else 100
+        if self.current_job_file is None:
+            self.progress_label.text = f"{finished} of {total} done"
+
+    def on_import_complete(self, job, imported, failed, cancelled):
+        """Hide the progress card and report the result."""
+        self.progress_card.opacity = 0
+        self.progress_card.disabled = True
+        self.import_job = None
+
+        if cancelled:
+            message = f"Import cancelled. {imported} file(s) were imported."
+        elif len(job.items) == 1 and imported == 1:
+            message = f"Successfully imported '{job.items[0]['title']}'"
+        else:
+            message = f"Imported {imported} of {len(job.items)} file(s)."
+
+        if imported:
+            if failed:
+                message += f" {failed} file(s) could not be imported."
+            self.show_success(message)
+        elif cancelled:
+            toast(message)
+        else:
+            self.show_error("Error importing file(s). See the log for details.")
+
+    def cancel_import(self, instance):
+        """Cancel the running import job."""
+        if self.import_job:
+            self.cancel_btn.disabled = True
+            self.progress_label.text = "Cancelling..."
+            self.import_job.cancel()
 
     def show_error(self, message):
         """Show an error dialog."""
@@ -32,29 +32,32 @@ class PlaybackScreen(Screen):
         self.is_slider_being_dragged = False
         self.description_label = None
         self.date_label = None
-        self.repeat_enabled = False
         self.repeat_btn = None
+        self.shuffle_btn = None
         self._handling_track_finish = False
-        self.current_playlist_id = None
+        self.armed_index = None  # Queue item pre-armed on the player
         self.source_screen = None  # Track which screen we came from
 
         # Build UI during initialization
         self.build_ui()
 
+        # Keep the queue moving even while this screen isn't shown
+        app = App.get_running_app()
+        if getattr(app, 'player', None):
+            app.player.bind(on_track_finished=self.on_track_finished)
+            app.player.bind(on_track_advanced=self.on_track_advanced)
+
     def on_enter(self):
         """Called when the screen is entered."""
-        # Start the UI update timer
-        if not self.update_event:
-            self.update_event = Clock.schedule_interval(self.update_ui, 0.1)
+        # Follow the player's position smoothly while this screen is shown
+        app = App.get_running_app()
+        if not self.update_event and getattr(app, 'player_state', None):
+            self.update_event = app.player_state.subscribe(
+                self.update_ui, 0.1, fields=('loaded', 'position', 'duration', 'is_playing'))
 
         # Update the UI based on current playback state
         self.update_play_pause_button()
 
-        # Register for track finished event
-        app = App.get_running_app()
-        if app.player:
-            app.player.bind(on_track_finished=self.on_track_finished)
-
     def build_ui(self):
         """Build the UI for the playback screen with strict vertical layout."""
         self.clear_widgets()
@@ -232,6 +235,16 @@ class PlaybackScreen(Screen):
             padding=[0, dp(8)]
         )
 
+        # Previous track button
+        previous_btn = MDIconButton(
+            icon="skip-previous",
+            theme_text_color="Custom",
+            text_color=theme.FLAX,
+            icon_size=dp(32),
+            on_release=self.play_previous_in_queue
+        )
+        controls_box.add_widget(previous_btn)
+
         # Rewind button
         rewind_btn = MDIconButton(
             icon="rewind-10",
@@ -262,6 +275,16 @@ class PlaybackScreen(Screen):
         )
         controls_box.add_widget(forward_btn)
 
+        # Next track button
+        next_btn = MDIconButton(
+            icon="skip-next",
+            theme_text_color="Custom",
+            text_color=theme.FLAX,
+            icon_size=dp(32),
+            on_release=lambda x: self.play_next_in_playlist(auto=False)
+        )
+        controls_box.add_widget(next_btn)
+
         controls_card.add_widget(controls_box)
 
         # Extra controls (repeat and playlist)
@@ -287,6 +310,22 @@ class PlaybackScreen(Screen):
         left_box.add_widget(self.repeat_btn)
         extra_controls.add_widget(left_box)
 
+        # Middle - Shuffle button
+        middle_box = MDBoxLayout(
+            size_hint_x=0.5,
+            orientation='horizontal'
+        )
+        self.shuffle_btn = MDIconButton(
+            icon="shuffle-variant",
+            theme_text_color="Custom",
+            text_color=theme.DUTCH_WHITE,
+            icon_size=dp(28),
+            pos_hint={"center_x": 0.5, "center_y": 0.5},
+            on_release=self.toggle_shuffle
+        )
+        middle_box.add_widget(self.shuffle_btn)
+        extra_controls.add_widget(middle_box)
+
         # Right side - Playlist button
         right_box = MDBoxLayout(
             size_hint_x=0.5,
@@ -363,7 +402,8 @@ class PlaybackScreen(Screen):
         self.current_recording = recording
 
         try:
-            recording_id, title, description, filepath, duration, date_created, cover_art = recording
+            # Playlist rows carry an extra position column
+            recording_id, title, description, filepath, duration, date_created, cover_art = recording[:7]
 
             # Update title
             if title and isinstance(title, str):
@@ -405,24 +445,29 @@ class PlaybackScreen(Screen):
             # Update play/pause button
             self.update_play_pause_button()
 
+            # Let the player prepare the next playlist item ahead of time
+            self.arm_next_track()
+
         except Exception as e:
             print(f"Error updating playback info: {e}")
 
-    def update_ui(self, dt):
-        """Update UI based on playback state."""
-        app = App.get_running_app()
-
-        if not app.player or not app.player.sound:
+    def update_ui(self, state, changed):
+        """Update UI from a player_state.PlayerState snapshot."""
+        if not state.loaded:
             return
 
         try:
             # Update position slider if not being dragged
             if not self.is_slider_being_dragged:
-                self.position_slider.value = app.player.current_pos
+                self.position_slider.value = state.position
 
             # Update time label
-            current_pos = app.player.current_pos
-            duration = app.player.duration
+            current_pos = state.position
+            duration = state.duration
+
+            # The duration of an unknown file arrives after loading, from libVLC's parse
+            if 'duration' in changed and duration > 0:
+                self.position_slider.max = duration
 
             # Format time as MM:SS / MM:SS
             current_min = int(current_pos) // 60
@@ -433,7 +478,8 @@ class PlaybackScreen(Screen):
             self.time_label.text = f"{current_min:02d}:{current_sec:02d} / {total_min:02d}:{total_sec:02d}"
 
             # Update play/pause button
-            self.update_play_pause_button()
+            if 'is_playing' in changed:
+                self.update_play_pause_button()
 
         except Exception as e:
             print(f"Error updating UI: {e}")
@@ -472,21 +518,33 @@ class PlaybackScreen(Screen):
             print(f"Error toggling play/pause: {e}")
 
     def toggle_repeat(self, instance):
-        """Toggle repeat mode."""
-        # Ensure the attribute exists
-        if not hasattr(self, 'repeat_enabled'):
-            self.repeat_enabled = False
+        """Cycle the queue's repeat mode: off, all, one."""
+        app = App.get_running_app()
+        queue = app.queue
 
-        # Toggle the repeat mode
-        self.repeat_enabled = not self.repeat_enabled
+        next_mode = {'off': 'all', 'all': 'one', 'one': 'off'}
+        queue.repeat_mode = next_mode[queue.repeat_mode]
 
         # Update button appearance
-        if self.repeat_enabled:
-            self.repeat_btn.text_color = theme.FLAX  # Gold when active
-            print("Repeat mode enabled")
-        else:
+        self.repeat_btn.icon = "repeat-once" if queue.repeat_mode == 'one' else "repeat"
+        if queue.repeat_mode == 'off':
             self.repeat_btn.text_color = theme.DUTCH_WHITE  # Normal when inactive
-            print("Repeat mode disabled")
+        else:
+            self.repeat_btn.text_color = theme.FLAX  # Gold when active
+        print(f"Repeat mode: {queue.repeat_mode}")
+
+        # The track that follows depends on the repeat mode
+        self.arm_next_track()
+
+    def toggle_shuffle(self, instance):
+        """Toggle shuffled play order for the queue."""
+        app = App.get_running_app()
+        app.queue.shuffle = not app.queue.shuffle
+
+        self.shuffle_btn.text_color = theme.FLAX if app.queue.shuffle else theme.DUTCH_WHITE
+        print(f"Shuffle {'enabled' if app.queue.shuffle else 'disabled'}")
+
+        self.arm_next_track()
 
     def rewind(self, instance):
         """Rewind by 10 seconds."""
@@ -577,79 +635,93 @@ class PlaybackScreen(Screen):
         """Handle track completion event."""
         try:
             print("Track finished event received in playback screen")
+            app = App.get_running_app()
 
-            # First check if repeat mode is enabled
-            if hasattr(self, 'repeat_enabled') and self.repeat_enabled:
+            # First check if the current track should repeat
+            if app.queue.repeat_mode == 'one':
                 print("Repeat enabled, restarting track")
-                app = App.get_running_app()
                 if app.player and app.player.sound:
                     # Schedule the restart for the next frame to avoid VLC issues
                     Clock.schedule_once(lambda dt: app.player.play(), 0.1)
 
-            # If not repeating, try to play next track in playlist
-            elif hasattr(self, 'current_playlist_id') and self.current_playlist_id:
-                success = self.play_next_in_playlist()
-                if not success:
-                    print("No next track available or error playing next track")
-            else:
-                print("Repeat not enabled and not in playlist, track will remain stopped")
+            # If not repeating, try to play the next track in the queue
+            elif not self.play_next_in_playlist():
+                print("No next track in the queue, track will remain stopped")
 
         except Exception as e:
             print(f"Error handling track finished: {e}")
 
-    def play_next_in_playlist(self):
-        """Play the next track in the current playlist if available."""
+    def arm_next_track(self):
+        """Hand the next queue item to the player for gapless playback."""
+        app = App.get_running_app()
+        if not app.player or not hasattr(app.player, 'set_next'):
+            return
+
+        self.armed_index = app.queue.peek_next(auto=True)
+        app.player.set_next(app.queue.path_at(self.armed_index),
+                            app.queue.title_at(self.armed_index) or "")
+
+    def on_track_advanced(self, player, filepath):
+        """Follow the player once it has switched to the armed queue item."""
         app = App.get_running_app()
+        if self.armed_index is None or app.queue.path_at(self.armed_index) != filepath:
+            return
 
-        # Check if we're in a playlist
-        if not hasattr(self, 'current_playlist_id') or not self.current_playlist_id:
-            print("Not in a playlist - can't play next track")
+        app.queue.jump(self.armed_index)
+        recording = app.database.get_recording(app.queue.current_id)
+        if recording:
+            print(f"Now playing next track: {recording[1]}")
+            self.update_playback_info(recording)
+
+    def play_next_in_playlist(self, auto=True):
+        """Play the next track in the queue if available."""
+        app = App.get_running_app()
+        index = app.queue.peek_next(auto)
+        if index is None:
+            print("End of queue reached")
             return False
+        return self.play_queue_item(index)
 
-        try:
-            # Get all recordings in the current playlist
-            playlist_recordings = app.database.get_playlist_recordings(self.current_playlist_id)
+    def play_previous_in_queue(self, instance=None):
+        """Play the previous track in the queue, or restart the current one."""
+        app = App.get_running_app()
 
-            if not playlist_recordings or len(playlist_recordings) <= 1:
-                print("Playlist empty or has only one item")
-                return False
+        # Like most players: a few seconds in, "previous" restarts the track
+        if app.player and app.player.sound and app.player.current_pos > 3:
+            app.player.seek(0)
+            return True
 
-            # Find current recording's position in playlist
-            current_position = None
-            for i, rec in enumerate(playlist_recordings):
-                if rec[0] == self.current_recording[0]:  # Compare recording IDs
-                    current_position = i
-                    break
+        index = app.queue.peek_previous()
+        if index is None:
+            if app.player and app.player.sound:
+                app.player.seek(0)
+            return False
+        return self.play_queue_item(index)
 
-            if current_position is None:
-                print("Current recording not found in playlist")
-                return False
+    def play_queue_item(self, index):
+        """Load and play queue item `index`, making it the current track."""
+        app = App.get_running_app()
 
-            # Check if there's a next track
-            if current_position < len(playlist_recordings) - 1:
-                next_recording = playlist_recordings[current_position + 1]
-                print(f"Playing next track: {next_recording[1]}")  # Title is at index 1
+        try:
+            recording = app.database.get_recording(app.queue.id_at(index))
+            if not recording:
+                print("Queued recording no longer exists")
+                return False
 
-                # Get playback screen
-                playback_screen = app.root_layout.get_screen('playback')
-                if playback_screen:
-                    # Play the next recording
-                    filepath = next_recording[3]  # filepath is at index 3
+            print(f"Playing queued track: {recording[1]}")  # Title is at index 1
 
-                    if app.player.load(filepath):
-                        # Update playback info
-                        self.current_recording = next_recording
-                        self.update_playback_info(next_recording)
+            if app.player.load(recording[3], title=recording[1]):  # filepath is at index 3
+                app.queue.jump(index)
+                self.update_playback_info(recording)
 
-                        # Start playback
-                        app.player.play()
-                        return True
+                # Start playback
+                app.player.play()
+                return True
 
-            print("End of playlist reached")
             return False
 
         except Exception as e:
-            print(f"Error playing next track: {e}")
+            print(f"Error playing queued track: {e}")
             return False
 
     def go_back(self, instance=None):
@@ -665,12 +737,7 @@ class PlaybackScreen(Screen):
 
     def on_leave(self):
         """Called when the screen is exited."""
-        # Stop the UI update timer
+        # Stop following the player
         if self.update_event:
             self.update_event.cancel()
             self.update_event = None
-
-        # Unbind from track finished event
-        app = App.get_running_app()
-        if app.player:
-            app.player.unbind(on_track_finished=self.on_track_finished)
@@ -20,6 +20,8 @@ class PlaylistScreen(Screen):
         self.current_playlist_id = None
         self.current_playlist_layout = None
         self.is_playlist_detail_view = False
+        self.playlists_request = None  # Background query for the playlists overview
+        self.recordings_request = None  # Background query for the playlist detail view
 
     def on_enter(self):
         """Build the UI when the screen is entered."""
@@ -213,14 +215,34 @@ class PlaylistScreen(Screen):
         self.load_playlist_recordings(playlist_id)
 
     def load_playlists(self):
-        """Load playlists from the database and display them."""
+        """Load playlists from the database in the background and display them."""
         app = App.get_running_app()
 
+        # Show a placeholder until the query finishes
+        self.playlists_layout.clear_widgets()
+        self.playlists_layout.add_widget(Label(
+            text="Loading playlists...",
+            size_hint_y=None,
+            height=dp(50)
+        ))
+
+        request = app.async_database.call(
+            'get_all_playlists',
+            callback=lambda playlists: self.show_playlists(request, playlists),
+            error_callback=lambda e: self.show_playlists(request, None, e))
+        self.playlists_request = request
+
+    def show_playlists(self, request, playlists, error=None):
+        """Display the playlists fetched by load_playlists, unless a newer load replaced it."""
+        if request is not self.playlists_request:
+            return
+
         # Clear existing playlists list
         self.playlists_layout.clear_widgets()
 
         try:
-            playlists = app.database.get_all_playlists()
+            if error is not None:
+                raise error
 
             if not playlists:
                 # Show message when no playlists found
@@ -234,7 +256,7 @@ class PlaylistScreen(Screen):
 
             # Add each playlist to the list
             for playlist in playlists:
-                playlist_id, name, description, date_created, recording_count = playlist
+                playlist_id, name, description, date_created, recording_count, total_duration = playlist
 
                 # Create a layout for each playlist item
                 item = BoxLayout(
@@ -258,7 +280,7 @@ class PlaylistScreen(Screen):
                 header_row.add_widget(name_label)
 
                 count_label = Label(
-                    text=f"{recording_count} items",
+                    text=f"{recording_count} items · {self.format_runtime(total_duration)}",
                     font_size=dp(16),
                     size_hint_x=0.3,
                     halign='right'
@@ -315,15 +337,43 @@ class PlaylistScreen(Screen):
             )
             self.playlists_layout.add_widget(error_label)
 
+    def format_runtime(self, seconds):
+        """Format a total listening time like 1h 05m or 12m."""
+        minutes = int(seconds or 0) // 60
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours}h {minutes:02d}m"
+        return f"{minutes}m"
+
     def load_playlist_recordings(self, playlist_id):
-        """Load and display recordings in a specific playlist."""
+        """Load recordings in a specific playlist in the background and display them."""
         app = App.get_running_app()
 
+        # Show a placeholder until the query finishes
+        self.current_playlist_layout.clear_widgets()
+        self.current_playlist_layout.add_widget(Label(
+            text="Loading recordings...",
+            size_hint_y=None,
+            height=dp(50)
+        ))
+
+        request = app.async_database.call(
+            'get_playlist_recordings', playlist_id,
+            callback=lambda recordings: self.show_playlist_recordings(request, playlist_id, recordings),
+            error_callback=lambda e: self.show_playlist_recordings(request, playlist_id, None, e))
+        self.recordings_request = request
+
+    def show_playlist_recordings(self, request, playlist_id, recordings, error=None):
+        """Display recordings fetched by load_playlist_recordings, unless a newer load replaced it."""
+        if request is not self.recordings_request:
+            return
+
         # Clear existing recordings list
         self.current_playlist_layout.clear_widgets()
 
         try:
-            recordings = app.database.get_playlist_recordings(playlist_id)
+            if error is not None:
+                raise error
 
             if not recordings:
                 # Show message when no recordings found
@@ -395,7 +445,7 @@ class PlaylistScreen(Screen):
                     text="Play",
                     background_normal='',
                     background_color=(0.2, 0.7, 0.9, 1),
-                    on_release=lambda x, rec_id=recording_id: self.play_recording(rec_id)
+                    on_release=lambda x, rec_id=recording_id: self.play_recording(rec_id, playlist_id)
                 )
                 buttons_row.add_widget(play_btn)
 
@@ -435,20 +485,27 @@ class PlaylistScreen(Screen):
             self.show_message("Playlist is empty")
             return
 
-        # Play the first recording
+        # Play the first recording, queueing up the rest of the playlist
         first_recording = recordings[0]
-        self.play_recording(first_recording[0])  # recording_id is at index 0
+        self.play_recording(first_recording[0], playlist_id)  # recording_id is at index 0
 
-        # TODO: Queue up the rest of the playlist
-
-    def play_recording(self, recording_id):
-        """Play a specific recording."""
+    def play_recording(self, recording_id, playlist_id=None):
+        """Play a specific recording, continuing through `playlist_id` if given."""
         app = App.get_running_app()
         recording = app.database.get_recording(recording_id)
 
         if recording:
+            # Queue the whole playlist starting at this recording, or just the recording
+            if playlist_id is not None:
+                queued = app.database.get_playlist_recordings(playlist_id)
+                ids = [rec[0] for rec in queued]
+                start_index = ids.index(recording_id) if recording_id in ids else 0
+                app.queue.load(queued, start_index, playlist_id)
+            else:
+                app.queue.load([recording])
+
             # Load the recording into the player
-            if app.player.load(recording[3]):  # filepath is at index 3
+            if app.player.load(recording[3], title=recording[1]):  # filepath is at index 3
                 # Switch to the playback screen
                 app.root.current = 'playback'
                 # Access the playback screen and update it with current recording info
@@ -793,9 +850,11 @@ class PlaylistScreen(Screen):
         app = App.get_running_app()
         success_count = 0
 
-        for recording_id in recording_ids:
-            if app.database.add_recording_to_playlist(playlist_id, recording_id):
-                success_count += 1
+        # One transaction for the whole selection
+        try:
+            success_count = app.database.add_recordings_to_playlist_bulk(playlist_id, recording_ids)
+        except Exception as e:
+            print(f"Error adding recordings to playlist: {e}")
 
         popup.dismiss()
 
@@ -9,6 +9,8 @@ from kivy.app import App
 import os
 import shutil
 
+from metadata_cache import metadata_cache
+
 
 class SettingsScreen(Screen):
     """Screen for app settings and preferences."""
@@ -17,6 +19,7 @@ class SettingsScreen(Screen):
         super(SettingsScreen, self).__init__(**kwargs)
         self.background_switch = None
         self.default_volume_slider = None
+        self.crossfade_slider = None
 
     def on_enter(self):
         """Build the UI when the screen is entered."""
@@ -67,7 +70,7 @@ class SettingsScreen(Screen):
         bg_layout.add_widget(bg_label)
 
         app = App.get_running_app()
-        bg_value = app.database.get_setting('background_playback', 'True') == 'True'
+        bg_value = app.settings_store.get_bool('background_playback', True)
 
         self.background_switch = Switch(
             active=bg_value,
@@ -107,7 +110,7 @@ class SettingsScreen(Screen):
         )
         vol_slider_layout.add_widget(vol_min_label)
 
-        vol_value = float(app.database.get_setting('default_volume', '0.8'))
+        vol_value = app.settings_store.get_float('default_volume', 0.8)
 
         self.default_volume_slider = Slider(
             min=0,
@@ -128,6 +131,51 @@ class SettingsScreen(Screen):
 
         main_layout.add_widget(volume_layout)
 
+        # Crossfade between playlist items
+        crossfade_layout = BoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            height=dp(80),
+            spacing=dp(5)
+        )
+
+        crossfade_label = Label(
+            text="Crossfade Between Stories",
+            halign='left',
+            size_hint_y=None,
+            height=dp(30),
+            text_size=(dp(300), dp(30))
+        )
+        crossfade_layout.add_widget(crossfade_label)
+
+        crossfade_slider_layout = BoxLayout(
+            size_hint_y=None,
+            height=dp(50),
+            spacing=dp(10)
+        )
+
+        crossfade_value = app.settings_store.get_float('crossfade_seconds', 0.0)
+
+        self.crossfade_slider = Slider(
+            min=0,
+            max=10,
+            step=1,
+            value=crossfade_value,
+            size_hint_x=0.8
+        )
+        self.crossfade_slider.bind(value=self.on_crossfade_slider)
+        crossfade_slider_layout.add_widget(self.crossfade_slider)
+
+        self.crossfade_value_label = Label(
+            text=f"{int(crossfade_value)}s",
+            size_hint_x=0.2
+        )
+        crossfade_slider_layout.add_widget(self.crossfade_value_label)
+
+        crossfade_layout.add_widget(crossfade_slider_layout)
+
+        main_layout.add_widget(crossfade_layout)
+
         # Storage management section
         storage_layout = BoxLayout(
             orientation='vertical',
@@ -204,12 +252,12 @@ class SettingsScreen(Screen):
     def on_background_switch(self, instance, value):
         """Save the background playback setting."""
         app = App.get_running_app()
-        app.database.set_setting('background_playback', str(value))
+        app.settings_store.set('background_playback', value)
 
     def on_volume_slider(self, instance, value):
         """Save the default volume setting."""
         app = App.get_running_app()
-        app.database.set_setting('default_volume', str(value))
+        app.settings_store.set('default_volume', value)
 
         # Update the label
         self.vol_value_label.text = f"{int(value * 100)}%"
@@ -218,21 +266,28 @@ class SettingsScreen(Screen):
         if app.player:
             app.player.set_volume(value)
 
+    def on_crossfade_slider(self, instance, value):
+        """Save the crossfade length and apply it to the player."""
+        app = App.get_running_app()
+        app.settings_store.set('crossfade_seconds', value)
+
+        self.crossfade_value_label.text = f"{int(value)}s"
+
+        if app.player and hasattr(app.player, 'configure_gapless'):
+            app.player.configure_gapless(crossfade=value)
+
     def get_storage_info(self):
         """Calculate storage usage."""
         app = App.get_running_app()
-        recordings_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recordings')
 
         total_size = 0
         file_count = 0
 
         try:
-            if os.path.exists(recordings_dir):
-                for file in os.listdir(recordings_dir):
-                    file_path = os.path.join(recordings_dir, file)
-                    if os.path.isfile(file_path):
-                        total_size += os.path.getsize(file_path)
-                        file_count += 1
+            # Stored files are sharded into subdirectories
+            for file_path in app.recording_store.iter_files():
+                total_size += os.path.getsize(file_path)
+                file_count += 1
         except Exception as e:
             print(f"Error calculating storage: {e}")
 
@@ -301,16 +356,16 @@ class SettingsScreen(Screen):
             app.database.cursor.execute("DROP TABLE IF EXISTS recordings")
             app.database.cursor.execute("DROP TABLE IF EXISTS playlists")
             app.database.cursor.execute("DROP TABLE IF EXISTS playlist_items")
+            app.database.cursor.execute("DROP TABLE IF EXISTS recordings_fts")
+            app.database.cursor.execute("DROP TABLE IF EXISTS blobs")
+            app.database.cursor.execute("DROP TABLE IF EXISTS media_metadata")
+            app.database.cursor.execute("PRAGMA user_version = 0")  # Indexes went with the tables
             app.database.conn.commit()
             app.database.create_tables()
 
             # Delete all recording files
-            recordings_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recordings')
-            if os.path.exists(recordings_dir):
-                for file in os.listdir(recordings_dir):
-                    file_path = os.path.join(recordings_dir, file)
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
+            app.recording_store.clear()
+            metadata_cache.invalidate()
 
             popup.dismiss()
 
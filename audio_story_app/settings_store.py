@@ -0,0 +1,62 @@
+from kivy.clock import Clock
+
+
+class SettingsStore:
+    """Typed access to the app's settings with debounced writes.
+
+    Reads are served from memory (the database caches the settings table).
+    Writes land in memory at once and are saved together in one
+    transaction after WRITE_DELAY seconds without further changes, so
+    dragging a slider costs one database write instead of dozens.
+    """
+
+    WRITE_DELAY = 0.5
+
+    def __init__(self, database):
+        self.database = database
+        self.pending = {}  # Changes not yet written to the database
+        self.flush_trigger = Clock.create_trigger(self.flush, self.WRITE_DELAY)
+
+    def get(self, key, default=None):
+        """Get a setting as the string it is stored as."""
+        if key in self.pending:
+            return self.pending[key]
+        return self.database.get_setting(key, default)
+
+    def get_bool(self, key, default=False):
+        """Get a setting stored as 'True' or 'False'."""
+        value = self.get(key)
+        return default if value is None else value == 'True'
+
+    def get_float(self, key, default=0.0):
+        """Get a numeric setting, falling back to default if it can't be parsed."""
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_int(self, key, default=0):
+        """Get an integer setting, falling back to default if it can't be parsed."""
+        try:
+            return int(float(self.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+
+    def set(self, key, value):
+        """Change a setting; it is saved shortly after the last change."""
+        self.pending[key] = str(value)
+
+        # Restarting the trigger pushes the write back until changes stop
+        self.flush_trigger.cancel()
+        self.flush_trigger()
+
+    def flush(self, *args):
+        """Write pending changes to the database now."""
+        if not self.pending:
+            return
+
+        pending, self.pending = self.pending, {}
+        try:
+            self.database.set_settings(pending)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
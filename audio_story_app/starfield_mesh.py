@@ -0,0 +1,114 @@
+from array import array
+from kivy.graphics import Mesh, RenderContext
+
+try:
+    import numpy
+except ImportError:  # Optional; alphas are written in plain Python without it
+    numpy = None
+
+
+# Each star is a quad of 4 vertices: x, y, corner u, v (-1..1), r, g, b, a
+VERTEX_FORMAT = [
+    (b'vPosition', 2, 'float'),
+    (b'vTexCoords0', 2, 'float'),
+    (b'vColor', 4, 'float'),
+]
+FLOATS_PER_VERTEX = 8
+FLOATS_PER_STAR = FLOATS_PER_VERTEX * 4
+ALPHA_OFFSET = 7  # Index of a within a vertex
+
+CORNERS = ((-1.0, -1.0), (1.0, -1.0), (1.0, 1.0), (-1.0, 1.0))
+
+# Plain GLSL 1.00 so it also compiles on software renderers (Mesa llvmpipe)
+VERTEX_SHADER = '''
+$HEADER$
+attribute vec4 vColor;
+
+void main(void) {
+    frag_color = vec4(vColor.rgb, vColor.a * opacity);
+    tex_coord0 = vTexCoords0;
+    gl_Position = projection_mat * modelview_mat * vec4(vPosition, 0.0, 1.0);
+}
+'''
+
+FRAGMENT_SHADER = '''
+$HEADER$
+
+void main(void) {
+    // Round star with a soft edge, cut out of its quad
+    float edge = 1.0 - smoothstep(0.6, 1.0, length(tex_coord0));
+    gl_FragColor = vec4(frag_color.rgb, frag_color.a * edge);
+}
+'''
+
+
+class StarMesh:
+    """Draws a whole star field as one Mesh, in a single draw call.
+
+    Stars are given as (center_x, center_y, size, (r, g, b), alpha)
+    tuples. Colours live in the vertex data, so twinkling only rewrites
+    the alpha slots of the compact float array and re-submits it.
+    Use create_star_mesh, which falls back to None if the shader can't
+    be compiled.
+    """
+
+    def __init__(self, stars):
+        self.count = len(stars)
+        self.vertices = array('f')
+        indices = []
+
+        for star_index, (x, y, size, rgb, alpha) in enumerate(stars):
+            radius = size / 2
+            r, g, b = rgb[:3]
+            for u, v in CORNERS:
+                self.vertices.extend((x + u * radius, y + v * radius, u, v, r, g, b, alpha))
+
+            first = star_index * 4
+            indices.extend((first, first + 1, first + 2, first + 2, first + 3, first))
+
+        self.context = RenderContext(use_parent_projection=True, use_parent_modelview=True)
+        self.context.shader.vs = VERTEX_SHADER
+        self.context.shader.fs = FRAGMENT_SHADER
+        if not self.context.shader.success:
+            raise RuntimeError("Star shader failed to compile")
+        self.context['opacity'] = 1.0
+
+        with self.context:
+            self.mesh = Mesh(vertices=self.vertices, indices=array('H', indices),
+                             fmt=VERTEX_FORMAT, mode='triangles')
+
+        # Every vertex's alpha slot, grouped per star, without copying
+        self.alpha_slots = None
+        if numpy is not None:
+            self.alpha_slots = numpy.frombuffer(self.vertices, dtype=numpy.float32).reshape(
+                self.count, 4, FLOATS_PER_VERTEX)[:, :, ALPHA_OFFSET]
+
+    def set_alphas(self, alphas, first=0):
+        """Set the alpha of stars first, first + 1, ... and upload the change."""
+        if self.alpha_slots is not None:
+            self.alpha_slots[first:first + len(alphas)] = numpy.asarray(alphas)[:, None]
+        else:
+            vertices = self.vertices
+            for star_index, alpha in enumerate(alphas, first):
+                slot = star_index * FLOATS_PER_STAR + ALPHA_OFFSET
+                vertices[slot] = alpha
+                vertices[slot + FLOATS_PER_VERTEX] = alpha
+                vertices[slot + FLOATS_PER_VERTEX * 2] = alpha
+                vertices[slot + FLOATS_PER_VERTEX * 3] = alpha
+
+        self.mesh.vertices = self.vertices
+
+
+def create_star_mesh(canvas, stars):
+    """Add a StarMesh for the stars to a canvas, or return None if it can't be used.
+
+    Callers then draw the stars as separate Ellipses instead.
+    """
+    try:
+        star_mesh = StarMesh(stars)
+    except Exception as e:
+        print(f"Error creating star mesh, drawing stars separately: {e}")
+        return None
+
+    canvas.add(star_mesh.context)
+    return star_mesh
@@ -0,0 +1,4 @@
+import time
+
+# Imported first by main.py, so this is as close to launch as Python code gets
+STARTED = time.perf_counter()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Keep Kivy from parsing pytest's command line
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+# The app uses flat imports (from database import Database), so put its directory on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
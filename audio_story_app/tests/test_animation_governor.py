@@ -0,0 +1,113 @@
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy.event import EventDispatcher  # noqa: E402
+from kivy.properties import BooleanProperty, NumericProperty, StringProperty  # noqa: E402
+
+from animation_governor import AnimationGovernor  # noqa: E402
+import player_state  # noqa: E402
+from player_state import PlayerStatePublisher  # noqa: E402
+
+
+class FakePlayer(EventDispatcher):
+    """Just the properties PlayerStatePublisher reads."""
+
+    is_playing = BooleanProperty(False)
+    current_pos = NumericProperty(0)
+    duration = NumericProperty(60)
+    current_file = StringProperty("")
+    current_title = StringProperty("")
+    sound = None
+
+    def update_position(self, dt):
+        pass
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    """A fresh governor, also used by the player state publisher."""
+    governor = AnimationGovernor()
+    monkeypatch.setattr(player_state, 'governor', governor)
+    yield governor
+    for timer in list(governor.timers):
+        timer.cancel()
+
+
+def test_timers_stop_while_hidden(governor):
+    timer = governor.schedule(lambda dt: None, 1 / 15)
+    assert timer.running_interval == 1 / 15
+
+    governor.set_visible(False)
+    assert timer.running_interval is None
+    assert timer.event is None
+
+    # Decorative timers stay stopped even while audio plays
+    governor.set_playing(True)
+    assert timer.running_interval is None
+
+    governor.set_visible(True)
+    assert timer.running_interval == 1 / 15
+
+
+def test_background_interval_runs_only_while_playing(governor):
+    timer = governor.schedule(lambda dt: None, 0.1, background_interval=5.0)
+
+    governor.set_visible(False)
+    assert timer.running_interval is None
+
+    governor.set_playing(True)
+    assert timer.running_interval == 5.0
+    assert timer.event is not None
+
+    governor.set_playing(False)
+    assert timer.running_interval is None
+
+    governor.set_playing(True)
+    governor.set_visible(True)
+    assert timer.running_interval == 0.1
+
+
+def test_attach_follows_the_player(governor):
+    class FakeWindow(EventDispatcher):
+        __events__ = ('on_minimize', 'on_hide', 'on_restore', 'on_show')
+
+        def on_minimize(self):
+            pass
+
+        def on_hide(self):
+            pass
+
+        def on_restore(self):
+            pass
+
+        def on_show(self):
+            pass
+
+    window = FakeWindow()
+    player = FakePlayer()
+    governor.attach(window, player)
+
+    player.is_playing = True
+    assert governor.playing
+
+    window.dispatch('on_minimize')
+    assert not governor.visible
+    window.dispatch('on_restore')
+    assert governor.visible
+
+
+def test_player_state_tick_slows_in_the_background(governor):
+    publisher = PlayerStatePublisher(FakePlayer())
+    subscription = publisher.subscribe(lambda state, changed: None, 0.1)
+    assert publisher.timer.running_interval == 0.1
+
+    governor.set_visible(False)
+    governor.set_playing(True)
+    assert publisher.timer.running_interval == player_state.BACKGROUND_TICK_INTERVAL
+
+    governor.set_playing(False)
+    assert publisher.timer.running_interval is None
+
+    subscription.cancel()
+    assert publisher.timer is None
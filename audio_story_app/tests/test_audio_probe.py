@@ -0,0 +1,249 @@
+import struct
+import wave
+
+import pytest
+
+from audio_probe import probe, probe_duration
+
+# MPEG 1 Layer III, 44.1 kHz, stereo, no padding; the bitrate index goes in the high nibble
+MPEG1_L3_128K = b'\xFF\xFB\x90\x00'
+MPEG1_L3_160K = b'\xFF\xFB\xA0\x00'
+MPEG1_FRAME_SAMPLES = 1152
+
+# MPEG 2 Layer III, 22.05 kHz, stereo, no padding, at 64 and 80 kbps
+MPEG2_L3_64K = b'\xFF\xF3\x80\x00'
+MPEG2_L3_80K = b'\xFF\xF3\x90\x00'
+MPEG2_FRAME_SAMPLES = 576
+
+
+def mpeg_frame(header, bitrate, sample_rate, samples, body=b''):
+    """One padding-free frame: the header, `body`, then zeros up to the frame length."""
+    length = samples // 8 * bitrate // sample_rate
+    frame = header + body
+    return frame + bytes(length - len(frame))
+
+
+def id3v2_tag(size=300):
+    """An ID3v2.3 tag with `size` bytes of payload (syncsafe size)."""
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b'ID3\x03\x00\x00' + syncsafe + bytes(size)
+
+
+def write_wav(path, seconds, sample_rate=44100, channels=1):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(int(seconds * sample_rate) * channels * 2))
+
+
+def ogg_page(serial, granule, packet, header_type=0, sequence=0):
+    """An Ogg page holding one packet of under 255 bytes (the CRC isn't checked)."""
+    assert len(packet) < 255
+    return (b'OggS' + struct.pack('<BBqIII', 0, header_type, granule, serial, sequence, 0)
+            + bytes([1, len(packet)]) + packet)
+
+
+def mp4_atom(atom_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), atom_type) + payload
+
+
+def write_mp4(path, timescale, duration, channels=2, sample_rate=44100, version=0):
+    if version == 1:
+        mvhd = struct.pack('>I', 1 << 24) + bytes(16) + struct.pack('>IQ', timescale, duration)
+    else:
+        mvhd = struct.pack('>I', 0) + bytes(8) + struct.pack('>II', timescale, duration)
+    mvhd += bytes(80)
+
+    entry = (b'mp4a' + bytes(6) + struct.pack('>H', 1) + bytes(8)
+             + struct.pack('>HHHHI', channels, 16, 0, 0, sample_rate << 16))
+    stsd = struct.pack('>II', 0, 1) + struct.pack('>I', 4 + len(entry)) + entry
+    stbl = mp4_atom(b'stbl', mp4_atom(b'stsd', stsd))
+    trak = mp4_atom(b'trak', mp4_atom(b'mdia', mp4_atom(b'minf', stbl)))
+    moov = mp4_atom(b'moov', mp4_atom(b'mvhd', mvhd) + trak)
+
+    path.write_bytes(mp4_atom(b'ftyp', b'M4A \x00\x00\x00\x00') + moov + mp4_atom(b'mdat', bytes(4000)))
+
+
+# WAV
+
+def test_wav(tmp_path):
+    path = tmp_path / 'story.wav'
+    write_wav(path, 2.5, channels=2)
+
+    info = probe(str(path))
+    assert info['codec'] == 'pcm'
+    assert info['duration'] == pytest.approx(2.5)
+    assert info['channels'] == 2
+    assert info['sample_rate'] == 44100
+    assert info['bitrate'] == 44100 * 2 * 16
+
+
+def test_wav_skips_other_chunks_and_fixes_a_bogus_data_size(tmp_path):
+    path = tmp_path / 'streamed.wav'
+    write_wav(path, 1.0)
+    data = bytearray(path.read_bytes())
+
+    # An odd-sized LIST chunk (padded to even) before data, and a "streaming" data size
+    list_chunk = b'LIST' + struct.pack('<I', 5) + b'INFO\x00\x00'
+    data_at = data.index(b'data')
+    data[data_at + 4:data_at + 8] = struct.pack('<I', 0xFFFFFFFF)
+    data[data_at:data_at] = list_chunk
+    path.write_bytes(bytes(data))
+
+    assert probe(str(path))['duration'] == pytest.approx(1.0)
+
+
+# MP3
+
+def test_cbr_mp3_duration_comes_from_size_and_bitrate(tmp_path):
+    frames = 1000
+    frame = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES)
+    assert len(frame) == 417
+
+    path = tmp_path / 'cbr.mp3'
+    path.write_bytes(id3v2_tag() + frame * frames + b'TAG' + bytes(125))
+
+    info = probe(str(path))
+    assert info['codec'] == 'mp3'
+    assert info['bitrate'] == 128000
+    assert info['channels'] == 2
+    assert info['sample_rate'] == 44100
+
+    # Tags excluded; bytes / bitrate ignores the fractional frame length, so
+    # padding-free frames come out a little short of their 26.12 s
+    assert info['duration'] == pytest.approx(frames * 417 * 8 / 128000)
+    assert info['duration'] == pytest.approx(26.06, abs=0.005)
+    assert info['duration'] == pytest.approx(frames * MPEG1_FRAME_SAMPLES / 44100, rel=0.005)
+
+
+def test_xing_header_gives_the_exact_frame_count(tmp_path):
+    frames, stream_bytes = 5000, 2000000
+    # Stereo MPEG 1: 32 bytes of side information before the Xing tag
+    xing = bytes(32) + b'Xing' + struct.pack('>III', 0x03, frames, stream_bytes)
+    first = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES, xing)
+    rest = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES) * 10
+
+    path = tmp_path / 'vbr.mp3'
+    path.write_bytes(first + rest)
+
+    info = probe(str(path))
+    duration = frames * MPEG1_FRAME_SAMPLES / 44100
+    assert info['duration'] == pytest.approx(duration)
+    assert info['bitrate'] == int(stream_bytes * 8 / duration)
+
+
+def test_info_header_without_byte_count(tmp_path):
+    xing = bytes(32) + b'Info' + struct.pack('>II', 0x01, 300)
+    first = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES, xing)
+    path = tmp_path / 'info.mp3'
+    path.write_bytes(first + mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES) * 3)
+
+    info = probe(str(path))
+    assert info['duration'] == pytest.approx(300 * MPEG1_FRAME_SAMPLES / 44100)
+    # Filled in from the file size when the header doesn't say
+    assert info['bitrate'] == int(path.stat().st_size * 8 / info['duration'])
+
+
+def test_vbri_header(tmp_path):
+    frames, stream_bytes = 1200, 500000
+    vbri = bytes(32) + b'VBRI' + bytes(6) + struct.pack('>II', stream_bytes, frames)
+    first = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES, vbri)
+    path = tmp_path / 'vbri.mp3'
+    path.write_bytes(first + mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES) * 3)
+
+    assert probe(str(path))['duration'] == pytest.approx(frames * MPEG1_FRAME_SAMPLES / 44100)
+
+
+def test_vbr_without_header_counts_every_frame(tmp_path):
+    low = mpeg_frame(MPEG1_L3_128K, 128000, 44100, MPEG1_FRAME_SAMPLES)
+    high = mpeg_frame(MPEG1_L3_160K, 160000, 44100, MPEG1_FRAME_SAMPLES)
+    frames = [low, high, high, low] * 100
+
+    path = tmp_path / 'vbr_no_header.mp3'
+    path.write_bytes(b''.join(frames) + b'TAG' + bytes(125))
+
+    assert probe(str(path))['duration'] == pytest.approx(len(frames) * MPEG1_FRAME_SAMPLES / 44100)
+
+
+def test_mpeg2_frames_hold_576_samples(tmp_path):
+    low = mpeg_frame(MPEG2_L3_64K, 64000, 22050, MPEG2_FRAME_SAMPLES)
+    high = mpeg_frame(MPEG2_L3_80K, 80000, 22050, MPEG2_FRAME_SAMPLES)
+    frames = [low, high] * 150
+
+    path = tmp_path / 'mpeg2.mp3'
+    path.write_bytes(b''.join(frames))
+
+    info = probe(str(path))
+    assert info['sample_rate'] == 22050
+    assert info['duration'] == pytest.approx(len(frames) * MPEG2_FRAME_SAMPLES / 22050)
+
+
+def test_unrecognised_file(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_bytes(b'not audio at all' * 100)
+
+    assert probe(str(path)) is None
+    assert probe_duration(str(path)) == 0
+
+
+# Ogg
+
+def test_ogg_vorbis_uses_the_last_granule_of_its_stream(tmp_path):
+    serial = 0x1234
+    ident = (b'\x01vorbis' + struct.pack('<IBIiii', 0, 2, 44100, 0, 96000, 0) + b'\xB8\x01')
+    pages = [
+        ogg_page(serial, 0, ident, header_type=2),
+        ogg_page(serial, 44100 * 4, bytes(200), sequence=1),
+        ogg_page(serial, 44100 * 10, bytes(100), header_type=4, sequence=2),
+        # A later page of another logical stream must not count
+        ogg_page(0x9999, 44100 * 99, bytes(50)),
+    ]
+    path = tmp_path / 'story.ogg'
+    path.write_bytes(b''.join(pages))
+
+    info = probe(str(path))
+    assert info['codec'] == 'vorbis'
+    assert info['duration'] == pytest.approx(10.0)
+    assert info['channels'] == 2
+    assert info['sample_rate'] == 44100
+    assert info['bitrate'] == 96000
+
+
+def test_ogg_opus_counts_48khz_granules_after_pre_skip(tmp_path):
+    serial = 7
+    head = b'OpusHead' + struct.pack('<BBHIhB', 1, 1, 312, 16000, 0, 0)
+    pages = [
+        ogg_page(serial, 0, head, header_type=2),
+        ogg_page(serial, 48000 * 5 + 312, bytes(80), header_type=4, sequence=1),
+    ]
+    path = tmp_path / 'story.opus'
+    path.write_bytes(b''.join(pages))
+
+    info = probe(str(path))
+    assert info['codec'] == 'opus'
+    assert info['duration'] == pytest.approx(5.0)
+    assert info['channels'] == 1
+    assert info['sample_rate'] == 16000
+
+
+# MP4
+
+@pytest.mark.parametrize('version', [0, 1])
+def test_mp4_duration_from_mvhd(tmp_path, version):
+    path = tmp_path / 'story.m4a'
+    write_mp4(path, timescale=600, duration=600 * 42 + 300, version=version)
+
+    info = probe(str(path))
+    assert info['codec'] == 'aac'
+    assert info['duration'] == pytest.approx(42.5)
+    assert info['channels'] == 2
+    assert info['sample_rate'] == 44100
+    assert info['bitrate'] == int(path.stat().st_size * 8 / 42.5)
+
+
+def test_mp4_without_moov(tmp_path):
+    path = tmp_path / 'broken.m4a'
+    path.write_bytes(mp4_atom(b'ftyp', b'M4A \x00\x00\x00\x00') + mp4_atom(b'mdat', bytes(100)))
+
+    assert probe(str(path)) is None
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy.clock import Clock  # noqa: E402
+
+import background_screen  # noqa: E402
+from background_screen import BackgroundScreen  # noqa: E402
+
+
+# Three hours of ticks at the screen's 1/3 s twinkle interval
+TICK = 1 / 3
+HOURS = 3
+TICKS = int(HOURS * 3600 / TICK)
+
+
+@pytest.fixture
+def boot_time(monkeypatch):
+    """Replace the clock's boot time with a value the test moves forward."""
+    now = [1000.0]
+    monkeypatch.setattr(Clock, 'get_boottime', lambda: now[0])
+    return now
+
+
+def run_ticks(screen, boot_time):
+    """Tick the twinkle for simulated hours, returning each twinkling star's distinct opacities."""
+    seen = [set() for _ in screen.twinkling_stars]
+    for _ in range(TICKS):
+        boot_time[0] += TICK
+        screen._twinkle_stars(TICK)
+        for star, values in zip(screen.twinkling_stars, seen):
+            values.add(round(star['opacity'], 3))
+    return seen
+
+
+def test_ellipse_fallback_keeps_a_fixed_instruction_set(monkeypatch, boot_time):
+    monkeypatch.setattr(background_screen, 'create_star_mesh', lambda canvas, stars: None)
+    screen = BackgroundScreen()
+    instructions = list(screen.canvas.children)
+    colors = [star['color'] for star in screen.twinkling_stars]
+
+    seen = run_ticks(screen, boot_time)
+
+    # Same instruction objects, not just the same number of them
+    assert len(screen.canvas.children) == len(instructions)
+    assert all(a is b for a, b in zip(screen.canvas.children, instructions))
+    assert [star['color'] for star in screen.twinkling_stars] == colors
+
+    for star, values in zip(screen.twinkling_stars, seen):
+        # The twinkle varies over time and stays within 70%-100% of the base opacity
+        assert len(values) > 10
+        assert star['base_opacity'] * 0.7 - 1e-6 <= star['color'].a <= star['base_opacity'] + 1e-6
+
+
+def test_mesh_keeps_a_fixed_vertex_buffer(boot_time):
+    screen = BackgroundScreen()
+    if screen.star_mesh is None:
+        pytest.skip("Star shader is not available with this GL driver")
+
+    instruction_count = len(screen.canvas.children)
+    vertex_count = len(screen.star_mesh.vertices)
+
+    seen = run_ticks(screen, boot_time)
+
+    assert len(screen.canvas.children) == instruction_count
+    assert len(screen.star_mesh.vertices) == vertex_count
+    assert all(len(values) > 10 for values in seen)
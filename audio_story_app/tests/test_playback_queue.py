@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from playback_queue import PlaybackQueue  # noqa: E402
+
+
+def recordings(count):
+    """Rows shaped like the recordings table: id, title, description, filepath."""
+    return [(100 + i, f"Story {i}", "", f"/audio/{i}.mp3") for i in range(count)]
+
+
+@pytest.fixture
+def queue():
+    queue = PlaybackQueue()
+    queue.load(recordings(5), start_index=2)
+    return queue
+
+
+def assert_inverse(queue):
+    assert sorted(queue.order) == list(range(len(queue)))
+    for position, index in enumerate(queue.order):
+        assert queue.order_pos[index] == position
+    assert queue.order[queue.cursor] == queue.current_index
+
+
+def test_load_builds_identity_order(queue):
+    assert list(queue.order) == [0, 1, 2, 3, 4]
+    assert queue.current_index == 2
+    assert queue.current_id == 102
+    assert queue.current_path == "/audio/2.mp3"
+    assert queue.title_at(4) == "Story 4"
+    assert queue.index_of(103) == 3
+    assert queue.index_of(999) is None
+    assert_inverse(queue)
+
+
+def test_load_clamps_start_and_handles_empty():
+    queue = PlaybackQueue()
+    queue.load(recordings(3), start_index=10)
+    assert queue.current_index == 2
+
+    queue.load([])
+    assert len(queue) == 0
+    assert queue.current_index == -1
+    assert queue.peek_next() is None
+    assert queue.peek_previous() is None
+    assert queue.next() is None
+
+
+def test_repeat_off_stops_at_the_ends(queue):
+    queue.jump(4)
+    assert queue.peek_next() is None
+    assert queue.next() is None
+    assert queue.current_index == 4
+
+    queue.jump(0)
+    assert queue.peek_previous() is None
+    assert queue.peek_next() == 1
+
+
+def test_repeat_all_wraps(queue):
+    queue.repeat_mode = 'all'
+    queue.jump(4)
+    assert queue.next() == 0
+    assert queue.previous() == 4
+    assert queue.current_index == 4
+
+
+def test_repeat_one_replays_only_when_a_track_ends(queue):
+    queue.repeat_mode = 'one'
+    assert queue.peek_next() == 2
+    assert queue.peek_next(auto=False) == 3
+    assert queue.peek_previous() == 1
+
+    queue.jump(4)
+    assert queue.peek_next(auto=False) is None
+
+
+def test_jump_out_of_range_keeps_the_current_track(queue):
+    assert queue.jump(5) is None
+    assert queue.jump(-1) is None
+    assert queue.current_index == 2
+    assert queue.cursor == 2
+
+
+def test_shuffle_keeps_the_current_track_first(queue):
+    random.seed(7)
+    queue.shuffle = True
+
+    assert queue.order[0] == 2
+    assert queue.cursor == 0
+    assert queue.current_index == 2
+    assert_inverse(queue)
+
+    # Every track is visited once before the end
+    visited = [queue.current_index]
+    while queue.next() is not None:
+        visited.append(queue.current_index)
+        assert_inverse(queue)
+    assert sorted(visited) == [0, 1, 2, 3, 4]
+
+
+def test_jump_while_shuffled_follows_the_order(queue):
+    random.seed(3)
+    queue.shuffle = True
+
+    target = queue.order[3]
+    queue.jump(target)
+    assert queue.cursor == 3
+    assert queue.peek_next() == queue.order[4]
+    assert queue.peek_previous() == queue.order[2]
+
+
+def test_unshuffle_returns_to_list_order_at_the_current_track(queue):
+    random.seed(11)
+    queue.shuffle = True
+    queue.next()
+    current = queue.current_index
+
+    queue.shuffle = False
+    assert list(queue.order) == [0, 1, 2, 3, 4]
+    assert queue.cursor == current
+    assert queue.peek_next() == (current + 1 if current < 4 else None)
+    assert_inverse(queue)
+
+
+def test_clear_resets_everything(queue):
+    queue.clear()
+    assert len(queue) == 0
+    assert queue.cursor == -1
+    assert queue.current_id is None
+    assert queue.playlist_id is None
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from database import POSITION_GAP, Database
+
+RECORDINGS = 60
+
+
+@pytest.fixture
+def database():
+    database = Database(':memory:')
+    for index in range(RECORDINGS):
+        database.add_recording(f"Story {index}", f"/audio/{index}.mp3", duration=60)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def playlist_id(database):
+    return database.create_playlist("Bedtime")
+
+
+def playlist_order(database, playlist_id):
+    return [row[0] for row in database.get_playlist_recordings(playlist_id)]
+
+
+def position_keys(database, playlist_id):
+    database.cursor.execute('''
+    SELECT position FROM playlist_items
+    WHERE playlist_id = ?
+    ORDER BY position, id
+    ''', (playlist_id,))
+    return [row[0] for row in database.cursor.fetchall()]
+
+
+def test_appends_are_spaced_by_the_gap(database, playlist_id):
+    for recording_id in (1, 2, 3):
+        database.add_recording_to_playlist(playlist_id, recording_id)
+
+    assert playlist_order(database, playlist_id) == [1, 2, 3]
+    assert position_keys(database, playlist_id) == [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP]
+
+
+def test_inserts_at_the_front_go_negative(database, playlist_id):
+    database.add_recording_to_playlist(playlist_id, 1)
+    for recording_id in range(2, 12):
+        database.add_recording_to_playlist(playlist_id, recording_id, position=0)
+
+    assert playlist_order(database, playlist_id) == list(range(11, 0, -1))
+    keys = position_keys(database, playlist_id)
+    assert keys[0] < 0
+    assert keys == sorted(set(keys))
+
+
+def test_exhausted_gap_rebalances(database, playlist_id, monkeypatch):
+    rebalances = []
+    rebalance_playlist = database.rebalance_playlist
+
+    def counting_rebalance(*args, **kwargs):
+        rebalances.append(args)
+        rebalance_playlist(*args, **kwargs)
+    monkeypatch.setattr(database, 'rebalance_playlist', counting_rebalance)
+
+    database.add_recording_to_playlist(playlist_id, 1)
+    database.add_recording_to_playlist(playlist_id, 2)
+
+    # Each insert at index 1 halves the room left before recording 2
+    expected = [1, 2]
+    for recording_id in range(3, 3 + 15):
+        database.add_recording_to_playlist(playlist_id, recording_id, position=1)
+        expected.insert(1, recording_id)
+        assert playlist_order(database, playlist_id) == expected
+
+    # 1024 only halves 10 times, so the playlist was respaced along the way
+    assert rebalances
+    keys = position_keys(database, playlist_id)
+    assert keys == sorted(set(keys))
+    assert min(b - a for a, b in zip(keys, keys[1:])) > 1
+
+
+def test_rebalance_keeps_order_and_respaces(database, playlist_id):
+    for recording_id in (1, 2, 3, 4):
+        database.add_recording_to_playlist(playlist_id, recording_id)
+    database.reorder_playlist(playlist_id, 4, 0)
+    database.reorder_playlist(playlist_id, 3, 1)
+
+    database.rebalance_playlist(playlist_id)
+
+    assert playlist_order(database, playlist_id) == [4, 3, 1, 2]
+    assert position_keys(database, playlist_id) == [POSITION_GAP * n for n in range(1, 5)]
+
+
+def test_moving_an_item_keeps_it_once(database, playlist_id):
+    for recording_id in (1, 2, 3):
+        database.add_recording_to_playlist(playlist_id, recording_id)
+
+    database.add_recording_to_playlist(playlist_id, 3, position=0)
+    database.reorder_playlist(playlist_id, 1, 99)
+
+    assert playlist_order(database, playlist_id) == [3, 2, 1]
+
+
+def test_random_operations_match_a_list(database, playlist_id):
+    rng = random.Random(2024)
+    expected = []
+
+    for step in range(3000):
+        operation = rng.random()
+        recording_id = rng.randint(1, RECORDINGS)
+        index = rng.choice([0, 1, len(expected) // 2, len(expected), rng.randint(0, len(expected) + 2)])
+
+        if operation < 0.3:
+            database.add_recording_to_playlist(playlist_id, recording_id)
+            if recording_id in expected:
+                expected.remove(recording_id)
+            expected.append(recording_id)
+        elif operation < 0.6:
+            # Adding a recording already in the playlist moves it
+            database.add_recording_to_playlist(playlist_id, recording_id, position=index)
+            if recording_id in expected:
+                expected.remove(recording_id)
+            expected.insert(index, recording_id)
+        elif operation < 0.85 and expected:
+            recording_id = rng.choice(expected)
+            database.reorder_playlist(playlist_id, recording_id, index)
+            expected.remove(recording_id)
+            expected.insert(index, recording_id)
+        elif expected:
+            recording_id = rng.choice(expected)
+            database.remove_recording_from_playlist(playlist_id, recording_id)
+            expected.remove(recording_id)
+
+        assert playlist_order(database, playlist_id) == expected, f"diverged at step {step}"
+
+    keys = position_keys(database, playlist_id)
+    assert len(keys) == len(set(keys))
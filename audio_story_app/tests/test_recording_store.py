@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import file_copy
+from recording_store import RecordingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RecordingStore(str(tmp_path / 'store'))
+
+
+def write_source(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_new_file_takes_the_fast_copy_path(store, tmp_path, monkeypatch):
+    data = os.urandom(3 * file_copy.COPY_CHUNK + 123)
+    source = write_source(tmp_path, 'story.MP3', data)
+
+    # Hashing already happened, so the copy must not go through Python
+    def no_chunked_copy(*args, **kwargs):
+        raise AssertionError("chunked copy used for an import")
+    monkeypatch.setattr(file_copy, 'chunked_copy', no_chunked_copy)
+
+    path, content_hash, reused = store.ingest(source)
+
+    assert not reused
+    assert path == os.path.join(store.shard_dir(content_hash), content_hash + '.mp3')
+    with open(path, 'rb') as stored:
+        assert stored.read() == data
+    assert os.listdir(store.staging_dir) == []
+
+
+def test_duplicate_is_reused_without_copying(store, tmp_path, monkeypatch):
+    data = os.urandom(4096)
+    first = store.ingest(write_source(tmp_path, 'a.mp3', data))
+
+    def no_copy(*args, **kwargs):
+        raise AssertionError("duplicate was copied")
+    monkeypatch.setattr('recording_store.copy_file', no_copy)
+
+    path, content_hash, reused = store.ingest(write_source(tmp_path, 'b.mp3', data))
+    assert reused
+    assert (path, content_hash) == first[:2]
+
+
+def test_progress_covers_hashing_and_copying(store, tmp_path):
+    source = write_source(tmp_path, 'long.ogg', os.urandom(2 * file_copy.COPY_CHUNK + 1))
+    fractions = []
+    store.ingest(source, lambda done, total: fractions.append(done / total))
+
+    assert fractions == sorted(fractions)
+    assert 0.5 in fractions  # The end of hashing
+    assert fractions[-1] == 1.0
+
+
+def test_progress_exception_aborts_and_cleans_up(store, tmp_path):
+    source = write_source(tmp_path, 'cancel.mp3', os.urandom(2 * file_copy.COPY_CHUNK))
+
+    class Cancelled(Exception):
+        pass
+
+    def cancel_while_copying(done, total):
+        if done > total / 2:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        store.ingest(source, cancel_while_copying)
+    assert list(store.iter_files()) == []
@@ -8,6 +8,14 @@ from kivy.app import App
 import random
 import math
 
+from animation_governor import governor
+from starfield_mesh import create_star_mesh
+
+try:
+    import numpy
+except ImportError:  # Optional; StarField twinkles in plain Python without it
+    numpy = None
+
 # Keep all existing color names that might be used in KV files
 # Original colors (from your existing theme)
 PRIMARY_COLOR = get_color_from_hex('#5B6EAD')  # Keep original
@@ -64,22 +72,32 @@ CARD_COLOR = PRUSSIAN_BLUE_3
 
 
 class StarField(Widget):
-    """Widget that displays animated stars in the background"""
+    """Widget that displays animated stars in the background
+
+    The canvas is built once, when the stars are generated: a single
+    StarMesh where shaders are available, otherwise a Color and Ellipse
+    per star. Each frame only changes the stars' alphas, so twinkling
+    allocates no new instructions.
+    """
+
+    STAR_COUNT = 80
 
     def __init__(self, **kwargs):
         super(StarField, self).__init__(**kwargs)
         self.stars = []
+        self.star_mesh = None
+        self.star_colors = []  # Color instruction of each star, when not using the mesh
         self.size_hint = (1, 1)  # Take full screen size
         self.pos_hint = {'center_x': 0.5, 'center_y': 0.5}
 
         # Generate stars
-        self.generate_stars(80)
+        self.generate_stars(self.STAR_COUNT)
 
-        # Update at a gentle pace for calming effect
-        Clock.schedule_interval(self.update_stars, 1 / 15)
+        # Update at a gentle pace for calming effect, only while the app is visible
+        self.update_event = governor.schedule(self.update_stars, 1 / 15)
 
     def generate_stars(self, count):
-        """Generate random stars"""
+        """Generate random stars and draw them"""
         self.stars = []
 
         # Get actual widget size or use window size as fallback
@@ -117,43 +135,87 @@ class StarField(Widget):
                 'twinkle_offset': twinkle_offset
             })
 
-    def update_stars(self, dt):
-        """Update star animation with gentle twinkling"""
+        self.twinkle = TwinkleKernel(self.stars)
+        self.build_canvas()
+
+    def build_canvas(self):
+        """Create the background and star instructions, keeping what twinkling updates"""
         self.canvas.clear()
+        self.star_colors = []
+
         with self.canvas:
             # First draw a full-screen background rectangle
             Color(*BACKGROUND_COLOR)
-            Rectangle(pos=(0, 0), size=(Window.width, Window.height))
+            self.background = Rectangle(pos=(0, 0), size=(Window.width, Window.height))
 
-            # Then draw each star
-            for star in self.stars:
-                # Calculate gentle twinkle effect
-                time_factor = Clock.get_boottime() * star['twinkle_speed']
-                # Use simple sin function if math is not imported
-                twinkle = 0.5 * (1 + math.sin(time_factor + star['twinkle_offset']))
-                alpha = star['base_alpha'] * (0.7 + 0.3 * twinkle)
-
-                # Unpack color - handle both tuples and lists
-                if isinstance(star['color'], (list, tuple)):
-                    if len(star['color']) == 4:
-                        r, g, b, _ = star['color']
-                    else:
-                        r, g, b = star['color']
-
-                    Color(r, g, b, alpha)
-                else:
-                    # Fallback to white if color is not properly formatted
-                    Color(1, 1, 1, alpha)
+        # Then all the stars in one draw call, if the GL driver allows it
+        self.star_mesh = create_star_mesh(self.canvas, [
+            (star['x'], star['y'], star['size'], star['color'], star['alpha'])
+            for star in self.stars
+        ])
+        if self.star_mesh:
+            return
 
+        with self.canvas:
+            # Or draw each star separately
+            for star in self.stars:
+                r, g, b = star['color'][:3]
+                self.star_colors.append(Color(r, g, b, star['alpha']))
                 Ellipse(
                     pos=(star['x'] - star['size'] / 2, star['y'] - star['size'] / 2),
                     size=(star['size'], star['size'])
                 )
 
+    def update_stars(self, dt):
+        """Update star animation with gentle twinkling"""
+        alphas = self.twinkle.alphas(Clock.get_boottime())
+        if self.star_mesh:
+            self.star_mesh.set_alphas(alphas)
+            return
+
+        for color, alpha in zip(self.star_colors, alphas):
+            color.a = alpha
+
     def on_size(self, *args):
         """Handle resize - redistribute stars when window size changes"""
         if self.width > 0 and self.height > 0:
-            self.generate_stars(80)
+            self.generate_stars(self.STAR_COUNT)
+
+
+class TwinkleKernel:
+    """Computes every star's twinkling alpha for a moment in one pass.
+
+    Uses NumPy when it is installed, and plain Python otherwise.
+    """
+
+    def __init__(self, stars):
+        base_alphas = [star['base_alpha'] for star in stars]
+        speeds = [star['twinkle_speed'] for star in stars]
+        offsets = [star['twinkle_offset'] for star in stars]
+
+        if numpy is not None:
+            self.base_alphas = numpy.array(base_alphas)
+            self.speeds = numpy.array(speeds)
+            self.offsets = numpy.array(offsets)
+            self.phases = numpy.empty(len(stars))  # Reused every frame
+        else:
+            self.stars = list(zip(base_alphas, speeds, offsets))
+
+    def alphas(self, time):
+        """Alpha of each star at `time` seconds: its base brightness, dimmed by up to 30%"""
+        if numpy is not None:
+            phases = self.phases
+            numpy.multiply(self.speeds, time, out=phases)
+            phases += self.offsets
+            numpy.sin(phases, out=phases)
+            # base * (0.7 + 0.3 * twinkle), where twinkle = (1 + sin) / 2
+            phases *= 0.15
+            phases += 0.85
+            phases *= self.base_alphas
+            return phases.tolist()
+
+        return [base * (0.85 + 0.15 * math.sin(time * speed + offset))
+                for base, speed, offset in self.stars]
 
 
 def apply_theme(app):
@@ -178,6 +240,7 @@ def apply_theme(app):
             # Remove any existing starfields to prevent duplication
             for child in list(app.root_layout.children):
                 if isinstance(child, StarField):
+                    child.update_event.cancel()
                     app.root_layout.remove_widget(child)
 
             # Create and add a new starfield at the bottom layer